@@ -900,6 +900,7 @@ struct KVStoreStats {
 
   /* --- Storage (read from B-tree at kvstore_stats() call time) --- */
   uint64_t nDbPages;      /* Total pages in database (sqlite3BtreeLastPage) */
+  uint64_t nFreePages;    /* Pages on the freelist, reclaimable by vacuum */
 };
 
 /*
@@ -998,6 +999,128 @@ int kvstore_checkpoint(KVStore *pKV, int mode, int *pnLog, int *pnCkpt);
 
 /* ========== BULK OPERATIONS ========== */
 
+/*
+** Insert or update nPairs key-value pairs in the default column family.
+**
+** Pair i is (apKey[i], anKey[i]) -> (apValue[i], anValue[i]); the same
+** key/value limits as kvstore_put() apply to every pair.  Later pairs win
+** when a key appears more than once.
+**
+** Outside a write transaction the batch runs in a single write transaction
+** (one WAL commit for all pairs) and is all-or-nothing. If the caller already
+** holds an explicit write transaction (kvstore_begin with wrflag=1), the
+** pairs join it without a nested commit; on error the pairs written so far
+** stay in the caller's transaction until it commits or rolls back.
+**
+** nPairs == 0 is a no-op that returns KVSTORE_OK.
+**
+** Returns:
+**   KVSTORE_OK on success, otherwise the error code of the first failed put.
+*/
+int kvstore_write_batch(
+  KVStore *pKV,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue
+);
+
+/*
+** Insert or update nPairs key-value pairs in a specific column family.
+** Equivalent to kvstore_write_batch() but operates on an explicit CF handle.
+*/
+int kvstore_cf_write_batch(
+  KVColumnFamily *pCF,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue
+);
+
+/*
+** kvstore_write_batch() with a per-pair expiry.
+**
+** aExpireMs may be NULL (equivalent to kvstore_write_batch).  Otherwise
+** aExpireMs[i] > 0 is the absolute expiry in ms for pair i (as for
+** kvstore_put_ttl) and 0 writes pair i with no TTL, clearing any existing one.
+** Same transaction semantics as kvstore_write_batch().
+*/
+int kvstore_write_batch_ttl(
+  KVStore *pKV,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue,
+  const int64_t *aExpireMs
+);
+
+/*
+** kvstore_write_batch_ttl() on an explicit CF handle.
+*/
+int kvstore_cf_write_batch_ttl(
+  KVColumnFamily *pCF,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue,
+  const int64_t *aExpireMs
+);
+
+/*
+** Look up nKeys keys in the default column family in one call.
+**
+** apValue / anValue are caller-provided arrays of nKeys entries.  For a key
+** that is found, apValue[i] / anValue[i] receive its value and the caller
+** must snkv_free(apValue[i]).  Missing or expired keys give apValue[i] = NULL
+** and anValue[i] = -1 (an empty value has anValue[i] == 0).
+**
+** Returns:
+**   KVSTORE_OK if every key was either found or missing.
+**   Otherwise the first error; no values are returned (all apValue[i] NULL).
+*/
+int kvstore_get_batch(
+  KVStore *pKV,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  void **apValue, int *anValue
+);
+
+/*
+** Look up nKeys keys in a specific column family in one call.
+** Equivalent to kvstore_get_batch() but operates on an explicit CF handle.
+*/
+int kvstore_cf_get_batch(
+  KVColumnFamily *pCF,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  void **apValue, int *anValue
+);
+
+/*
+** Delete nKeys keys from the default column family in one call.
+**
+** Keys that do not exist are skipped; if pnDeleted is not NULL it receives
+** the number of keys actually removed.  TTL entries for deleted keys are
+** removed too.  Same transaction semantics as kvstore_write_batch().
+**
+** Returns:
+**   KVSTORE_OK on success (including when some or all keys were missing),
+**   otherwise the error code of the first failed delete.
+*/
+int kvstore_delete_batch(
+  KVStore *pKV,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  int *pnDeleted
+);
+
+/*
+** Delete nKeys keys from a specific column family in one call.
+** Equivalent to kvstore_delete_batch() but operates on an explicit CF handle.
+*/
+int kvstore_cf_delete_batch(
+  KVColumnFamily *pCF,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  int *pnDeleted
+);
+
 /*
 ** Remove all key-value pairs from the default column family.
 **
@@ -1169,6 +1292,49 @@ int kvstore_cf_ttl_remaining(
 */
 int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted);
 
+/*
+** Fixed-window counter with expiry (rate limiting).
+**
+** Atomically reads the ASCII decimal counter stored at key, compares it
+** with limit and, if below, increments it — all in one write transaction:
+**
+**   absent or expired — counter becomes 1, expiring at now + window_ms.
+**   count <  limit    — counter becomes count+1; the key's existing expiry
+**                       is kept (now + window_ms if it has none).
+**   count >= limit    — store unchanged.
+**
+**   *pAllowed (may be NULL) — 1 if the counter was incremented, else 0.
+**   *pnCount  (may be NULL) — counter value after the call.
+**
+** window_ms must be > 0. If the caller holds an explicit write transaction
+** the operation joins it without committing.
+**
+** Returns:
+**   KVSTORE_OK on success (whether or not the increment was allowed).
+**   KVSTORE_ERROR if the stored value is not a decimal integer.
+*/
+int kvstore_incr_ttl(
+  KVStore *pKV,
+  const void *pKey, int nKey,
+  int64_t limit,
+  int64_t window_ms,
+  int64_t *pnCount,
+  int *pAllowed
+);
+
+/*
+** Fixed-window counter in a specific column family.
+** Equivalent to kvstore_incr_ttl() but operates on an explicit CF handle.
+*/
+int kvstore_cf_incr_ttl(
+  KVColumnFamily *pCF,
+  const void *pKey, int nKey,
+  int64_t limit,
+  int64_t window_ms,
+  int64_t *pnCount,
+  int *pAllowed
+);
+
 
 /* =========================================================================
 ** Encryption API — password-based authenticated encryption (XChaCha20-Poly1305)
@@ -5,6 +5,8 @@ pytest configuration: add the python/ directory to sys.path so that
 without needing PYTHONPATH=.
 """
 import sys
-import os
+from pathlib import Path
 
-sys.path.insert(0, os.path.dirname(__file__))
+_here = str(Path(__file__).resolve().parent)
+if _here not in sys.path:
+    sys.path.insert(0, _here)
@@ -7,7 +7,7 @@ Run:
     python examples/basic.py
 """
 
-import os
+from pathlib import Path
 import snkv
 from snkv import KVStore, NotFoundError
 
@@ -114,8 +114,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] basic.py complete")
@@ -7,7 +7,7 @@ Run:
     python examples/checkpoint.py
 """
 
-import os
+from pathlib import Path
 from snkv import (
     KVStore,
     JOURNAL_WAL,
@@ -27,7 +27,7 @@ def manual_passive_checkpoint():
     # May not checkpoint all frames if readers are active.
     with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
         for i in range(50):
-            db[f"k{i:03d}"] = f"v{i}"
+            db[b"k%03d" % i] = b"v%d" % i
 
         nlog, nckpt = db.checkpoint(CHECKPOINT_PASSIVE)
         print(f"  PASSIVE: nLog={nlog}, nCkpt={nckpt}")
@@ -39,7 +39,7 @@ def manual_full_checkpoint():
     # FULL: waits for all readers to finish, then copies all WAL frames.
     with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
         for i in range(50):
-            db[f"full:{i:03d}"] = f"v{i}"
+            db[b"full:%03d" % i] = b"v%d" % i
 
         nlog, nckpt = db.checkpoint(CHECKPOINT_FULL)
         print(f"  FULL: nLog={nlog}, nCkpt={nckpt}")
@@ -51,7 +51,7 @@ def truncate_checkpoint():
     # Most aggressive; best for reclaiming disk space.
     with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
         for i in range(100):
-            db[f"trunc:{i:04d}"] = f"v{i}"
+            db[b"trunc:%04d" % i] = b"v%d" % i
 
         nlog, nckpt = db.checkpoint(CHECKPOINT_TRUNCATE)
         print(f"  TRUNCATE: nLog={nlog}, nCkpt={nckpt}")
@@ -65,7 +65,7 @@ def auto_checkpoint_via_wal_size_limit():
     # Keeps the WAL from growing without bound.
     with KVStore(DB_FILE, journal_mode=JOURNAL_WAL, wal_size_limit=50) as db:
         for i in range(200):
-            db[f"auto:{i:05d}"] = str(i)
+            db[b"auto:%05d" % i] = b"%d" % i
 
         print(f"  Wrote 200 keys; auto-checkpoints fired at 50-write intervals")
 
@@ -91,8 +91,9 @@ def checkpoint_modes_summary():
     print("  TRUNCATE - like RESTART + truncate file; WAL shrinks to 0 bytes on disk")
 
     with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
+        prefix = b"mode:"
         for i in range(30):
-            db[f"mode:{i}"] = str(i)
+            db[prefix + b"%d" % i] = b"%d" % i
 
         for mode, name in (
             (CHECKPOINT_PASSIVE,  "PASSIVE"),
@@ -102,7 +103,7 @@ def checkpoint_modes_summary():
         ):
             # Re-write some data so each checkpoint has work to do
             for j in range(10):
-                db[f"mode:{j}"] = f"new_{j}"
+                db[prefix + b"%d" % j] = b"new_%d" % j
 
             nlog, nckpt = db.checkpoint(mode)
             print(f"  {name:<10} nLog={nlog:3d}, nCkpt={nckpt:3d}")
@@ -118,8 +119,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] checkpoint.py complete")
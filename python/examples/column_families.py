@@ -8,7 +8,7 @@ Run:
     python examples/column_families.py
 """
 
-import os
+from pathlib import Path
 from snkv import KVStore, NotFoundError
 
 DB_FILE = "cf_example.db"
@@ -122,8 +122,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] column_families.py complete")
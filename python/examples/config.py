@@ -8,7 +8,7 @@ Run:
     python examples/config.py
 """
 
-import os
+from pathlib import Path
 from snkv import (
     KVStore,
     ReadOnlyError,
@@ -23,21 +23,21 @@ DB_FILE  = "config_example.db"
 DB_FILE2 = "config_example2.db"
 
 
-def default_config():
+def default_config(db):
     print("--- Default Config (WAL, SYNC_NORMAL, 8 MB cache) ---")
-    with KVStore(DB_FILE) as db:
-        db["key"] = "value"
-        print(f"  value = {db['value' if False else 'key'].decode()}")
+    db["key"] = "value"
+    print(f"  value = {db['key'].decode()}")
 
 
-def wal_mode():
+def wal_mode(db):
     print("\n--- WAL Mode (default, recommended) ---")
     # WAL allows concurrent readers + one writer
-    # .db-wal and .db-shm sidecar files are created
-    with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
-        db["wal_key"] = "wal_value"
-        print(f"  wal_key = {db['wal_key'].decode()}")
-    print("  WAL database closed (checkpoint runs on close)")
+    # .db-wal and .db-shm sidecar files are created.
+    # JOURNAL_WAL is the default, so the default-config handle is reused
+    # here rather than reopening the file with identical options.
+    db["wal_key"] = "wal_value"
+    print(f"  wal_key = {db['wal_key'].decode()}")
+    print("  (checkpoint runs when the handle is closed)")
 
 
 def delete_mode():
@@ -76,7 +76,7 @@ def custom_cache_and_page_size():
                page_size=4096      # new databases only
                ) as db:
         for i in range(100):
-            db[f"k{i:03d}"] = str(i)
+            db[b"k%03d" % i] = b"%d" % i
         print(f"  100 keys written with 16 MB cache")
         print(f"  k050 = {db['k050'].decode()}")
 
@@ -113,7 +113,7 @@ def wal_size_limit():
     # write transactions. Keeps the WAL file from growing unbounded.
     with KVStore(DB_FILE, wal_size_limit=50) as db:
         for i in range(200):
-            db[f"auto:{i:05d}"] = str(i)
+            db[b"auto:%05d" % i] = b"%d" % i
         print("  200 writes done; auto-checkpoints fired at 50-write intervals")
 
         nlog, nckpt = db.checkpoint()
@@ -200,8 +200,11 @@ def open_v2_full_example():
 
 
 if __name__ == "__main__":
-    default_config()
-    wal_mode()
+    # Options are fixed at open time, so only demos that use the defaults
+    # share a handle; the rest reopen with the options they demonstrate.
+    with KVStore(DB_FILE, journal_mode=JOURNAL_WAL) as db:
+        default_config(db)
+        wal_mode(db)
     delete_mode()
     sync_levels()
     custom_cache_and_page_size()
@@ -215,8 +218,5 @@ if __name__ == "__main__":
     # Cleanup
     for db_file in (DB_FILE, DB_FILE2):
         for ext in ("", "-wal", "-shm"):
-            try:
-                os.remove(db_file + ext)
-            except FileNotFoundError:
-                pass
+            Path(db_file + ext).unlink(missing_ok=True)
     print("\n[OK] config.py complete")
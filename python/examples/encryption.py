@@ -18,7 +18,7 @@ Sections:
     8. Real-world: encrypted session store
 """
 
-import os
+from pathlib import Path
 
 from snkv import KVStore, AuthError
 
@@ -27,10 +27,7 @@ DB_FILE = "encryption_example.db"
 
 def _cleanup(path: str) -> None:
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(path + ext)
-        except FileNotFoundError:
-            pass
+        Path(path + ext).unlink(missing_ok=True)
 
 
 # ---------------------------------------------------------------------------
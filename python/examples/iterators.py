@@ -8,7 +8,7 @@ Run:
     python examples/iterators.py
 """
 
-import os
+from pathlib import Path
 from snkv import KVStore
 
 DB_FILE = "iterators_example.db"
@@ -22,7 +22,7 @@ def full_scan():
 
         # Simplest: iterate directly over the store
         for key, value in db:
-            print(f"  {key.decode()} -> {value.decode()}")
+            print(f"  {key.decode('ascii')} -> {value.decode('ascii')}")
 
 
 def prefix_scan():
@@ -36,11 +36,11 @@ def prefix_scan():
 
         print("  Keys starting with 'user:':")
         for key, value in db.prefix_iterator(b"user:"):
-            print(f"    {key.decode()} -> {value.decode()}")
+            print(f"    {key.decode('ascii')} -> {value.decode('ascii')}")
 
         print("  Keys starting with 'post:':")
         for key, value in db.prefix_iterator(b"post:"):
-            print(f"    {key.decode()} -> {value.decode()}")
+            print(f"    {key.decode('ascii')} -> {value.decode('ascii')}")
 
 
 def iterator_context_manager():
@@ -65,8 +65,8 @@ def manual_iterator_control():
         it.first()
         count = 0
         while not it.eof:
-            key   = it.key.decode()
-            value = it.value.decode()
+            key   = it.key.decode("ascii")
+            value = it.value.decode("ascii")
             print(f"  [{count}] {key} -> {value}")
             count += 1
             it.next()
@@ -84,11 +84,11 @@ def cf_iterator():
 
             print("  Fruits CF:")
             for key, value in cf.iterator():
-                print(f"    {key.decode()} -> {value.decode()}")
+                print(f"    {key.decode('ascii')} -> {value.decode('ascii')}")
 
             print("  CF prefix 'b':")
             for key, value in cf.prefix_iterator(b"b"):
-                print(f"    {key.decode()} -> {value.decode()}")
+                print(f"    {key.decode('ascii')} -> {value.decode('ascii')}")
 
 
 def collect_all_keys():
@@ -97,8 +97,12 @@ def collect_all_keys():
         for i in range(10):
             db[f"item:{i:02d}"] = str(i * i)
 
-        keys = [k for k, _ in db.iterator()]
-        print(f"  {len(keys)} keys: {[k.decode() for k in keys[:5]]} ...")
+        # Drain in batches: one extension call per 1024 rows, not per row
+        keys = []
+        with db.iterator() as it:
+            while batch := it.fetch_many(1024):
+                keys.extend(k for k, _ in batch)
+        print(f"  {len(keys)} keys: {[k.decode('ascii') for k in keys[:5]]} ...")
 
 
 def statistics():
@@ -130,8 +134,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] iterators.py complete")
@@ -10,7 +10,7 @@ Run:
     python examples/multiprocess.py
 """
 
-import os
+from pathlib import Path
 import time
 import multiprocessing
 from snkv import KVStore
@@ -146,10 +146,7 @@ def main():
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
@@ -12,7 +12,7 @@ Run:
     python examples/new_apis.py
 """
 
-import os
+from pathlib import Path
 import time
 
 from snkv import KVStore, NotFoundError
@@ -346,9 +346,6 @@ if __name__ == "__main__":
     main()
 
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
 
     print("\n[OK] new_apis.py example complete.")
@@ -4,96 +4,218 @@ Session KVStore Example
 Demonstrates: Real-world web session management with create/get/cleanup
 
 This example simulates how SNKV could back a web session store.
-Sessions are stored as JSON blobs keyed by session ID.
+Sessions are stored as JSON blobs keyed by session ID, prefixed with an
+8-byte creation timestamp so expiry checks never have to parse the JSON.
 A "sessions:" column family keeps sessions separate from other data.
+orjson is used for (de)serialization when installed; otherwise the
+stdlib json module is used.
 
 Run:
     python examples/session_store.py
 """
 
 import json
-import os
+from pathlib import Path
+import secrets
+import struct
 import time
-import uuid
-from snkv import KVStore, NotFoundError
+from typing import NamedTuple
+from snkv import (
+    KVStore,
+    NotFoundError,
+    BusyError,
+    JOURNAL_WAL,
+    SYNC_NORMAL,
+    CHECKPOINT_PASSIVE,
+    CHECKPOINT_TRUNCATE,
+)
+
+try:
+    import orjson
+    _dumps = orjson.dumps      # returns bytes directly
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
 
 DB_FILE = "session_store_example.db"
 
 # Prefix for session keys: allows efficient prefix scans for cleanup
 SESSION_PREFIX = b"sess:"
+# Raw session ID length in bytes (hex IDs are twice as long)
+SESSION_ID_BYTES = 16
 # Time-to-live in seconds (for demo, 5 seconds)
 SESSION_TTL = 5
+SESSION_TTL_NS = SESSION_TTL * 1_000_000_000
+# Minimum seconds between PASSIVE checkpoints issued by cleanup_expired()
+CHECKPOINT_INTERVAL = 60
+# Value header: created_at as little-endian uint64 nanoseconds since epoch
+_HDR = struct.Struct("<Q")
+
+
+class Session(NamedTuple):
+    """Handle returned by create(): public hex ID plus the pre-built key."""
+    id: str
+    key: bytes
+
+
+def _session_key(session_id) -> bytes | None:
+    """
+    Resolve a Session, a session storage key, or a hex session ID to the
+    key.  Returns None for anything else (malformed ID, or bytes that are
+    not a session key), which callers treat as missing.
+    """
+    if isinstance(session_id, Session):
+        return session_id.key
+    if isinstance(session_id, bytes):
+        if (len(session_id) == len(SESSION_PREFIX) + SESSION_ID_BYTES
+                and session_id.startswith(SESSION_PREFIX)):
+            return session_id
+        return None
+    try:
+        raw_id = bytes.fromhex(session_id)
+    except ValueError:
+        return None
+    if len(raw_id) != SESSION_ID_BYTES:
+        return None
+    return SESSION_PREFIX + raw_id
 
 
 class SessionStore:
     """Minimal web session store backed by SNKV."""
 
+    __slots__ = ("_db", "_cf", "_put", "_get", "_delete", "_last_ckpt")
+
     def __init__(self, db_path: str) -> None:
-        self._db = KVStore(db_path, wal_size_limit=100)
+        # WAL + NORMAL sync: commits don't fsync, and wal_size_limit bounds
+        # WAL growth with an auto-checkpoint every 1000 commits.
+        self._db = KVStore(
+            db_path,
+            journal_mode=JOURNAL_WAL,
+            sync_level=SYNC_NORMAL,
+            wal_size_limit=1000,
+            busy_timeout=5000,
+        )
+        self._last_ckpt = time.monotonic()
         # Use a dedicated column family to isolate sessions
-        try:
+        if "sessions" in self._db.list_column_families():
             self._cf = self._db.open_column_family("sessions")
-        except Exception:
+        else:
             self._cf = self._db.create_column_family("sessions")
+        # Pre-bound CF methods for the per-request paths
+        self._put    = self._cf.put
+        self._get    = self._cf.get
+        self._delete = self._cf.delete
 
-    def create(self, user_id: str, **data) -> str:
-        """Create a new session. Returns the session ID."""
-        session_id = str(uuid.uuid4())
-        payload = json.dumps({
-            "user_id":   user_id,
-            "created_at": time.time(),
-            "data":      data,
+    def create(self, user_id: str, **data) -> Session:
+        """
+        Create a new session.  Returns a Session whose .id is the hex ID to
+        hand to clients and whose .key can be passed straight back to
+        get()/delete() without rebuilding the storage key.
+        """
+        raw_id = secrets.token_bytes(SESSION_ID_BYTES)
+        key = SESSION_PREFIX + raw_id
+        body = _dumps({
+            "user_id": user_id,
+            "data":    data,
         })
-        key = SESSION_PREFIX + session_id.encode()
-        self._cf.put(key, payload.encode())
-        return session_id
-
-    def get(self, session_id: str) -> dict | None:
-        """Return session data, or None if expired/missing."""
-        key = SESSION_PREFIX + session_id.encode()
-        raw = self._cf.get(key)
+        self._put(key, _HDR.pack(time.time_ns()) + body)
+        return Session(raw_id.hex(), key)
+
+    def create_many(self, users) -> list:
+        """
+        Create one session per (user_id, data) pair in a single write
+        transaction.  Returns the Sessions in input order.
+        """
+        self._db.begin(write=True)
+        try:
+            sessions = [self.create(user_id, **data) for user_id, data in users]
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        return sessions
+
+    def get(self, session_id: Session | str | bytes) -> dict | None:
+        """
+        Return session data, or None if expired/missing.  session_id may be
+        a Session, its hex .id, or its .key; anything else counts as missing.
+        """
+        key = _session_key(session_id)
+        if key is None:
+            return None
+        raw = self._get(key)
         if raw is None:
             return None
-        payload = json.loads(raw)
+        created_ns = _HDR.unpack_from(raw)[0]
         # Expire old sessions
-        if time.time() - payload["created_at"] > SESSION_TTL:
-            self._cf.delete(key)
+        if created_ns < time.time_ns() - SESSION_TTL_NS:
+            self._delete(key)
             return None
+        payload = _loads(raw[_HDR.size:])
+        payload["created_at"] = created_ns / 1e9
         return payload
 
-    def delete(self, session_id: str) -> None:
-        """Explicitly invalidate a session (logout)."""
-        key = SESSION_PREFIX + session_id.encode()
+    def delete(self, session_id: Session | str | bytes) -> None:
+        """
+        Explicitly invalidate a session (logout).  Accepts the same forms
+        as get(); anything else is a no-op.
+        """
+        key = _session_key(session_id)
+        if key is None:
+            return
         try:
-            self._cf.delete(key)
+            self._delete(key)
         except NotFoundError:
             pass
 
-    def cleanup_expired(self) -> int:
-        """Remove all expired sessions. Returns count of sessions removed."""
-        now = time.time()
-        to_delete = []
-        for key, value in self._cf.prefix_iterator(SESSION_PREFIX):
-            try:
-                payload = json.loads(value)
-                if now - payload["created_at"] > SESSION_TTL:
-                    to_delete.append(key)
-            except (json.JSONDecodeError, KeyError):
-                to_delete.append(key)  # corrupt entry - clean up
-
-        for key in to_delete:
-            try:
-                self._cf.delete(key)
-            except NotFoundError:
-                pass
-        return len(to_delete)
+    def cleanup_expired(self) -> tuple[int, int]:
+        """
+        Remove all expired sessions.  Returns (removed, remaining), both
+        counted during the same scan.
+        """
+        deadline = time.time_ns() - SESSION_TTL_NS
+        unpack = _HDR.unpack_from
+        delete = self._delete
+        removed = remaining = 0
+        # Single pass: iterate and delete inside one write transaction, so
+        # all deletes land in a single WAL commit.
+        self._db.begin(write=True)
+        try:
+            with self._cf.prefix_iterator(SESSION_PREFIX) as it:
+                for key, value in it:
+                    try:
+                        expired = unpack(value)[0] < deadline
+                    except struct.error:
+                        expired = True  # corrupt entry - clean up
+                    if expired:
+                        delete(key)
+                        removed += 1
+                    else:
+                        remaining += 1
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        # Long-lived stores: fold the WAL back periodically.  PASSIVE never
+        # waits on readers, unlike FULL/RESTART.
+        if time.monotonic() - self._last_ckpt >= CHECKPOINT_INTERVAL:
+            self._db.checkpoint(CHECKPOINT_PASSIVE)
+            self._last_ckpt = time.monotonic()
+        return removed, remaining
 
     def active_count(self) -> int:
         """Return number of currently stored sessions (includes expired)."""
-        return sum(1 for _ in self._cf.prefix_iterator(SESSION_PREFIX))
+        return self._cf.count_prefix(SESSION_PREFIX)
 
     def close(self) -> None:
         self._cf.close()
+        # Truncate the WAL to zero bytes so the next open starts clean.
+        try:
+            self._db.checkpoint(CHECKPOINT_TRUNCATE)
+        except BusyError:
+            pass  # another connection is still reading; leave the WAL as is
         self._db.close()
 
     def __enter__(self):
@@ -107,12 +229,14 @@ def demo():
     with SessionStore(DB_FILE) as store:
         # --- Create sessions ---
         print("--- Creating Sessions ---")
-        sid1 = store.create("alice", role="admin",  ip="10.0.0.1")
-        sid2 = store.create("bob",   role="viewer", ip="10.0.0.2")
-        sid3 = store.create("carol", role="editor", ip="10.0.0.3")
-        print(f"  Created session for alice:  {sid1[:8]}...")
-        print(f"  Created session for bob:    {sid2[:8]}...")
-        print(f"  Created session for carol:  {sid3[:8]}...")
+        sid1, sid2, sid3 = store.create_many([
+            ("alice", {"role": "admin",  "ip": "10.0.0.1"}),
+            ("bob",   {"role": "viewer", "ip": "10.0.0.2"}),
+            ("carol", {"role": "editor", "ip": "10.0.0.3"}),
+        ])
+        print(f"  Created session for alice:  {sid1.id[:8]}...")
+        print(f"  Created session for bob:    {sid2.id[:8]}...")
+        print(f"  Created session for carol:  {sid3.id[:8]}...")
         print(f"  Active sessions: {store.active_count()}")
 
         # --- Retrieve sessions ---
@@ -141,9 +265,9 @@ def demo():
         s = store.get(sid1)
         print(f"  alice session after TTL: {s}  (expired)")
 
-        removed = store.cleanup_expired()
+        removed, remaining = store.cleanup_expired()
         print(f"  Cleanup removed {removed} expired session(s)")
-        print(f"  Active sessions after cleanup: {store.active_count()}")
+        print(f"  Active sessions after cleanup: {remaining}")
 
         # --- Stats ---
         print("\n--- Stats ---")
@@ -156,8 +280,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] session_store.py complete")
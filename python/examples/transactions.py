@@ -7,7 +7,7 @@ Run:
     python examples/transactions.py
 """
 
-import os
+from pathlib import Path
 import snkv
 from snkv import KVStore
 
@@ -24,12 +24,12 @@ def atomic_batch_write():
         # With an explicit write transaction: all writes commit atomically
         db.begin(write=True)
         for i in range(5):
-            db[f"batch:{i}"] = f"value_{i}"
+            db[b"batch:%d" % i] = b"value_%d" % i
         db.commit()
 
         # Verify
         for i in range(5):
-            assert db.get(f"batch:{i}") == f"value_{i}".encode()
+            assert db.get(b"batch:%d" % i) == b"value_%d" % i
         print("Batch of 5 committed atomically")
 
 
@@ -85,14 +85,14 @@ def read_only_transaction():
 
 
 def large_batch_performance():
-    print("\n--- Large Batch (1000 writes in one transaction) ---")
+    print("\n--- Large Batch (1000 writes in one write_batch call) ---")
     import time
     with KVStore(DB_FILE) as db:
         t0 = time.perf_counter()
-        db.begin(write=True)
-        for i in range(1000):
-            db[f"item:{i:05d}"] = f"value_{i}"
-        db.commit()
+        # write_batch opens, fills and commits one transaction in a single call
+        db.write_batch(
+            (b"item:%05d" % i, b"value_%d" % i) for i in range(1000)
+        )
         elapsed = time.perf_counter() - t0
 
         count = sum(1 for _ in db.iterator())
@@ -109,8 +109,5 @@ if __name__ == "__main__":
 
     # Cleanup
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
     print("\n[OK] transactions.py complete")
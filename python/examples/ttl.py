@@ -15,12 +15,19 @@ Sections:
     6. Real-world: rate limiter backed by SNKV TTL
 """
 
-import os
+from pathlib import Path
+import sys
+import tempfile
 import time
 
 from snkv import KVStore, NotFoundError, NO_TTL
 
-DB_FILE = "ttl_example.db"
+# Short-lived scratch data: keep it in RAM (/dev/shm) on Linux so repeated
+# runs don't pay for disk fsyncs; elsewhere use the system temp directory.
+if sys.platform.startswith("linux") and Path("/dev/shm").is_dir():
+    DB_FILE = "/dev/shm/ttl_example.db"
+else:
+    DB_FILE = str(Path(tempfile.gettempdir()) / "ttl_example.db")
 
 
 # ---------------------------------------------------------------------------
@@ -33,13 +40,9 @@ def section_basic_ttl(db: KVStore) -> None:
     db.put(b"token", b"abc-xyz-789", ttl=5)
     print(f"  put(b'token', ttl=5)")
 
-    # Read it back.
-    val = db.get(b"token")
-    print(f"  get(b'token') = {val}")
-
-    # Inspect remaining TTL.
-    remaining = db.ttl(b"token")
-    print(f"  ttl(b'token') = {remaining:.3f} s remaining")
+    # Read it back together with its remaining TTL in one lookup.
+    val, remaining = db.get_with_ttl(b"token")
+    print(f"  get_with_ttl(b'token') = ({val}, {remaining:.3f} s remaining)")
 
     # Overwrite with a plain put — TTL entry is removed.
     db.put(b"token", b"overwritten")
@@ -55,14 +58,14 @@ def section_lazy_expiry(db: KVStore) -> None:
     db.put(b"flash", b"here today", ttl=0.05)   # 50 ms
     print("  inserted b'flash' (expires in 50 ms)")
 
-    time.sleep(0.1)   # wait past expiry
+    db.wait_expiry(b"flash")   # sleeps until the 50 ms deadline, no polling
 
     val = db.get(b"flash")   # triggers lazy delete
     print(f"  get(b'flash') after expiry = {val!r}  (None = expired)")
 
     # ttl() also performs lazy delete and returns 0.0 for a just-expired key.
     db.put(b"blink", b"gone soon", ttl=0.05)
-    time.sleep(0.1)
+    time.sleep(0.1)   # not wait_expiry(): it would delete the key itself
     remaining = db.ttl(b"blink")
     print(f"  ttl(b'blink') after expiry = {remaining!r}  (0.0 = just expired)")
 
@@ -79,18 +82,20 @@ def section_lazy_expiry(db: KVStore) -> None:
 def section_purge(db: KVStore) -> None:
     print("\n--- 3. purge_expired ---")
 
-    # Insert several short-lived keys and one long-lived key.
-    db.put(b"old1", b"v", ttl=0.001)
-    db.put(b"old2", b"v", ttl=0.001)
-    db.put(b"old3", b"v", ttl=0.001)
-    db.put(b"keep", b"v", ttl=60)
+    # Insert several short-lived keys and one long-lived key in one call.
+    db.mput([
+        (b"old1", b"v", 0.001),
+        (b"old2", b"v", 0.001),
+        (b"old3", b"v", 0.001),
+        (b"keep", b"v", 60),
+    ])
 
-    time.sleep(0.05)   # let the three expire
+    time.sleep(0.05)   # let the three expire (wait_expiry would delete one itself)
 
     deleted = db.purge_expired()
     print(f"  purge_expired() removed {deleted} key(s)")
 
-    print(f"  get(b'keep') = {db.get(b'keep')!r}  (survived)")
+    print(f"  mget(old1, keep) = {db.mget([b'old1', b'keep'])!r}  (keep survived)")
 
 
 # ---------------------------------------------------------------------------
@@ -99,7 +104,9 @@ def section_purge(db: KVStore) -> None:
 def section_named_cf_ttl(db: KVStore) -> None:
     print("\n--- 4. CF-level TTL (named CF) ---")
 
-    with db.create_column_family("rate_limits") as cf:
+    # reclaim_ratio: once purges leave 20% of the file's pages free,
+    # purge_expired() vacuums them back to the filesystem.
+    with db.create_column_family("rate_limits", reclaim_ratio=0.2) as cf:
         # Token expires in 1 second.
         cf.put(b"user:42", b"5", ttl=1)
         print(f"  cf.put(b'user:42', ttl=1 s)")
@@ -117,7 +124,7 @@ def section_named_cf_ttl(db: KVStore) -> None:
 
         # Insert an already-expired key and purge.
         cf.put(b"user:99", b"0", ttl=0.001)
-        time.sleep(0.05)
+        time.sleep(0.05)   # past expiry; purge_expired() does the delete
         n = cf.purge_expired()
         print(f"  cf.purge_expired() removed {n} key(s)")
 
@@ -160,6 +167,8 @@ class RateLimiter:
     If a key is absent (expired or never set), the window resets.
     """
 
+    __slots__ = ("_db", "_limit", "_window", "_cf", "_incr")
+
     def __init__(self, db: KVStore, limit: int, window_s: float) -> None:
         self._db     = db
         self._limit  = limit
@@ -168,25 +177,17 @@ class RateLimiter:
             self._cf = db.open_column_family("rl")
         except NotFoundError:
             self._cf = db.create_column_family("rl")
+        # Bound once here so is_allowed() skips two attribute lookups per call.
+        self._incr = self._cf.incr_with_ttl
 
     def is_allowed(self, user_id: str) -> bool:
-        key = user_id.encode()
-        raw = self._cf.get(key)
-
-        if raw is None:
-            # First request in this window.
-            self._cf.put(key, b"1", ttl=self._window)
-            return True
+        # Read, compare and increment in one atomic call; the first request
+        # of a window sets the expiry, later ones keep it.
+        return self._incr(user_id.encode(), self._limit, self._window)
 
-        count = int(raw)
-        if count >= self._limit:
-            return False
-
-        # Increment within current window — preserve remaining TTL.
-        remaining_s = self._cf.ttl(key)
-        ttl = remaining_s if remaining_s is not None else self._window
-        self._cf.put(key, str(count + 1).encode(), ttl=ttl)
-        return True
+    def wait_reset(self, user_id: str) -> None:
+        """Block until user_id's current window ends."""
+        self._cf.wait_expiry(user_id.encode())
 
     def close(self) -> None:
         self._cf.close()
@@ -202,7 +203,7 @@ def section_rate_limiter(db: KVStore) -> None:
         print(f"  request {i+1}: {'ALLOWED' if allowed else 'BLOCKED'}")
 
     print("  (waiting for window to reset...)")
-    time.sleep(2.1)
+    rl.wait_reset("alice")
 
     allowed = rl.is_allowed("alice")
     print(f"  request after reset: {'ALLOWED' if allowed else 'BLOCKED'}")
@@ -227,9 +228,6 @@ if __name__ == "__main__":
     main()
 
     for ext in ("", "-wal", "-shm"):
-        try:
-            os.remove(DB_FILE + ext)
-        except FileNotFoundError:
-            pass
+        Path(DB_FILE + ext).unlink(missing_ok=True)
 
     print("\n[OK] ttl.py example complete.")
@@ -0,0 +1,69 @@
+"""
+PGO training workload for the snkv extension.
+
+Run against a module built with SNKV_PGO=generate (see setup.py); the
+instrumented build writes its profile to pgo-data/ on exit.  Exercises the
+hot paths: put/get, TTL writes and lazy expiry, purge_expired,
+incr_with_ttl, batch APIs, iteration and transactions.
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from snkv import KVStore, JOURNAL_WAL
+
+N = 20_000
+
+
+def train(path: str) -> None:
+    with KVStore(path, journal_mode=JOURNAL_WAL) as db:
+        keys = [b"key:%06d" % i for i in range(N)]
+
+        db.write_batch((k, b"v" * 64) for k in keys)
+        for k in keys:
+            db.get(k)
+        db.mget(keys[:1000])
+        db.get(b"missing")
+
+        db.begin(write=True)
+        for i, k in enumerate(keys[:5000]):
+            db.put(k, b"w" * (i % 200))
+        db.commit()
+
+        db.mput((b"ttl:%06d" % i, b"t", 0.01) for i in range(N // 4))
+        for i in range(1000):
+            db.put(b"sess:%04d" % i, b"s", ttl=60)
+            db.ttl(b"sess:%04d" % i)
+        time.sleep(0.02)
+        for i in range(1000):
+            db.get(b"ttl:%06d" % i)      # lazy expiry
+        db.purge_expired()
+
+        with db.create_column_family("rl") as cf:
+            for i in range(N):
+                cf.incr_with_ttl(b"user:%03d" % (i % 100), 150, 60)
+
+        for _ in db.iterator():
+            pass
+        for _ in db.prefix_iterator(b"key:01"):
+            pass
+        for _ in db.reverse_iterator():
+            pass
+
+        for k in keys[::2]:
+            db.delete(k)
+        db.checkpoint()
+
+
+if __name__ == "__main__":
+    shm = Path("/dev/shm")
+    base = shm if sys.platform.startswith("linux") and shm.is_dir() else Path(tempfile.gettempdir())
+    db_path = base / "snkv_pgo_train.db"
+    try:
+        train(str(db_path))
+    finally:
+        for ext in ("", "-wal", "-shm"):
+            Path(str(db_path) + ext).unlink(missing_ok=True)
+    print("-- snkv: PGO training run complete")
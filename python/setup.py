@@ -10,8 +10,16 @@ Run from the repo root:
     pip install -e python/
 or from this directory:
     python setup.py build_ext --inplace
+
+Set SNKV_NATIVE=1 to tune the build for the local CPU (-march=native).
+
+Profile-guided build (GCC, used for the Linux wheels):
+    SNKV_PGO=generate python setup.py build_ext --inplace --force
+    python pgo_train.py
+    SNKV_PGO=use python setup.py build_ext --inplace --force
 """
 
+import glob
 import os
 import shutil
 import subprocess
@@ -46,6 +54,13 @@ class BuildExtWithHeader(_build_ext):
         if getattr(self, "_snkv_h_ready", False):
             return
 
+        # snkv.h is a phony make target, so skip make entirely when the copy
+        # here is already newer than every input the generator reads.
+        if self._snkv_header_up_to_date(target):
+            print(f"-- snkv: {target} is up to date")
+            self._snkv_h_ready = True
+            return
+
         # Try `make snkv.h` first (works on Linux, macOS, and Windows MSYS2).
         # If make is not on PATH, fall back to downloading from GitHub — same
         # on all platforms.
@@ -84,6 +99,19 @@ class BuildExtWithHeader(_build_ext):
 
         self._snkv_h_ready = True
 
+    @staticmethod
+    def _snkv_header_up_to_date(target: str) -> bool:
+        """True if target is newer than the sources gen_snkv_header.sh reads."""
+        sources = [os.path.join(REPO_ROOT, "scripts", "gen_snkv_header.sh")]
+        for pattern in ("include/*.h", "include/monocypher/*.h",
+                        "src/*.c", "src/monocypher/*.c"):
+            sources += glob.glob(os.path.join(REPO_ROOT, pattern))
+        # Outside a full checkout (e.g. an sdist) there is nothing to compare.
+        if not os.path.exists(target) or not os.path.exists(sources[0]):
+            return False
+        built = os.path.getmtime(target)
+        return all(os.path.getmtime(src) <= built for src in sources)
+
     def _download_snkv_header(self, target: str) -> None:
         import json
         import tempfile
@@ -178,13 +206,38 @@ class BuildExtWithHeader(_build_ext):
 
 
 # ---------------------------------------------------------------------------
-# Platform-specific linker flags
+# Platform-specific compiler and linker flags
 # ---------------------------------------------------------------------------
 
+extra_compile_args: list = []
 extra_link_args: list = []
 
+if sys.platform != "win32":
+    # Some Python builds default to -O2; the amalgamated B-tree/pager code
+    # benefits from -O3.  MSVC already builds extensions with /Ox.
+    # -pipe keeps the ~3 MB translation unit's intermediates out of /tmp.
+    extra_compile_args = ["-O3", "-pipe"]
+    # Opt-in for local source builds only: binaries built with -march=native
+    # fail with "illegal instruction" on older CPUs, so wheels never use it.
+    if os.environ.get("SNKV_NATIVE") == "1":
+        extra_compile_args.append("-march=native")
+
+    # SNKV_PGO=generate builds an instrumented module that writes profiles
+    # to pgo-data/ when pgo_train.py runs; SNKV_PGO=use rebuilds with them.
+    pgo = os.environ.get("SNKV_PGO")
+    pgo_dir = os.path.join(HERE, "pgo-data")
+    if pgo == "generate":
+        extra_compile_args.append(f"-fprofile-generate={pgo_dir}")
+        extra_link_args.append(f"-fprofile-generate={pgo_dir}")
+    elif pgo == "use":
+        extra_compile_args += [
+            f"-fprofile-use={pgo_dir}",
+            "-fprofile-correction",
+            "-Wno-missing-profile",
+        ]
+
 if sys.platform == "darwin":
-    extra_link_args = ["-lpthread", "-lm"]
+    extra_link_args += ["-lpthread", "-lm"]
 
 # ---------------------------------------------------------------------------
 # C extension
@@ -193,7 +246,9 @@ if sys.platform == "darwin":
 ext = Extension(
     "snkv._snkv",
     sources=["snkv_module.c"],
+    depends=["snkv.h"],      # rebuild when the amalgamation changes
     include_dirs=[HERE],
+    extra_compile_args=extra_compile_args,
     extra_link_args=extra_link_args,
 )
 
@@ -25,6 +25,7 @@ from __future__ import annotations
 import time
 
 from typing import (
+    Iterable,
     Iterator as TypingIterator,
     Optional,
     List,
@@ -65,7 +66,13 @@ _Encodable = Union[str, bytes, bytearray, memoryview]
 
 
 def _enc(v: _Encodable) -> bytes:
-    """Encode str -> bytes (UTF-8). Pass bytes/bytearray/memoryview through."""
+    """Encode str -> bytes (UTF-8). Pass bytes/bytearray/memoryview through.
+
+    Exact bytes are returned as-is (no copy); the hot KVStore/ColumnFamily
+    methods test ``type(x) is bytes`` inline and only call this otherwise.
+    """
+    if type(v) is bytes:
+        return v
     if isinstance(v, str):
         return v.encode("utf-8")
     if isinstance(v, (bytes, bytearray, memoryview)):
@@ -75,6 +82,66 @@ def _enc(v: _Encodable) -> bytes:
     )
 
 
+def _ttl_ms(ttl: float) -> int:
+    """TTL in seconds -> whole ms: exact for int, rounded once for float."""
+    if type(ttl) is int:
+        return ttl * 1000
+    return round(float(ttl) * 1000)
+
+
+def _expire_ms(ttl: float, now_ms: Optional[int] = None) -> int:
+    """Absolute wall-clock expiry in ms for a TTL in seconds.
+
+    Integer arithmetic on time.time_ns() rather than a float epoch.  Single
+    puts skip this and pass _ttl_ms() to put_ttl_rel(), which adds the
+    store's own clock in C.
+    """
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
+    return now_ms + _ttl_ms(ttl)
+
+
+def _ttl_items(items: Iterable[tuple]) -> List[tuple]:
+    """Turn (key, value[, ttl]) items into (key, value, expire_ms) triples."""
+    now_ms = time.time_ns() // 1_000_000
+    out = []
+    for item in items:
+        if len(item) == 3 and item[2] is not None:
+            out.append((item[0], item[1], _expire_ms(item[2], now_ms)))
+        elif len(item) in (2, 3):
+            out.append((item[0], item[1], 0))
+        else:
+            raise ValueError("mput() items must be (key, value) or (key, value, ttl)")
+    return out
+
+
+def _check_ratio(ratio: Optional[float]) -> Optional[float]:
+    if ratio is not None and not 0 < ratio <= 1:
+        raise ValueError("reclaim_ratio must be in (0, 1]")
+    return ratio
+
+
+def _wait_expiry(ttl_remaining, key: bytes, timeout: Optional[float]) -> bool:
+    """Sleep until key's stored expiry passes; see KVStore.wait_expiry()."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            remaining_ms = ttl_remaining(key)
+        except NotFoundError:
+            return True
+        if remaining_ms == _snkv.NO_TTL:
+            return False
+        if remaining_ms == 0:
+            return True
+        delay = remaining_ms / 1000.0
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            delay = min(delay, left)
+        time.sleep(delay)
+
+
 # ---------------------------------------------------------------------------
 # Iterator wrapper
 # ---------------------------------------------------------------------------
@@ -143,6 +210,16 @@ class Iterator:
         self._it.seek(_enc(key))
         return self
 
+    def fetch_many(self, n: int = 1024) -> List[Tuple[bytes, bytes]]:
+        """
+        Return up to n (key, value) pairs, continuing where iteration left off.
+        Returns an empty list once the iterator is exhausted.
+
+            while batch := it.fetch_many(1024):
+                ...
+        """
+        return self._it.fetch_many(n)
+
     # --- Python iterator protocol ---
 
     def __iter__(self) -> TypingIterator[Tuple[bytes, bytes]]:
@@ -154,7 +231,11 @@ class Iterator:
     # --- Lifecycle ---
 
     def close(self) -> None:
-        """Release iterator resources."""
+        """
+        Release iterator resources.
+        Raises RuntimeError if another thread is inside a call on this
+        iterator; close it after that call returns.
+        """
         self._it.close()
 
     def __enter__(self) -> "Iterator":
@@ -183,10 +264,11 @@ class ColumnFamily:
             print("alice" in cf)      # True
     """
 
-    __slots__ = ("_cf",)
+    __slots__ = ("_cf", "_reclaim_ratio")
 
-    def __init__(self, raw: _ColumnFamily) -> None:
+    def __init__(self, raw: _ColumnFamily, reclaim_ratio: Optional[float] = None) -> None:
         self._cf = raw
+        self._reclaim_ratio = reclaim_ratio
 
     # --- Core operations ---
 
@@ -203,10 +285,12 @@ class ColumnFamily:
                Both the data write and the TTL index write are atomic.
         """
         if ttl is None:
-            self._cf.put(_enc(key), _enc(value))
+            self._cf.put(
+                key if type(key) is bytes else _enc(key),
+                value if type(value) is bytes else _enc(value),
+            )
         else:
-            expire_ms = int((time.time() + float(ttl)) * 1000)
-            self._cf.put_ttl(_enc(key), _enc(value), expire_ms)
+            self._cf.put_ttl_rel(_enc(key), _enc(value), _ttl_ms(ttl))
 
     def get(
         self,
@@ -215,11 +299,30 @@ class ColumnFamily:
     ) -> Optional[bytes]:
         """Return value bytes, or default if key not found or expired."""
         try:
-            value, _remaining = self._cf.get_ttl(_enc(key))
-            return value
+            return self._cf.get_checked(
+                key if type(key) is bytes else _enc(key)
+            )
         except NotFoundError:
             return default
 
+    def get_with_ttl(
+        self,
+        key: _Encodable,
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """
+        Return (value, remaining_ttl_seconds) from a single lookup.
+
+        remaining is None if the key has no expiry.
+        Returns (None, None) if the key is not found or expired.
+        """
+        try:
+            value, remaining_ms = self._cf.get_ttl(_enc(key))
+        except NotFoundError:
+            return None, None
+        if remaining_ms == _snkv.NO_TTL:
+            return value, None
+        return value, remaining_ms / 1000.0
+
     def delete(self, key: _Encodable) -> None:
         """Delete key. Raises NotFoundError if key does not exist."""
         self._cf.delete(_enc(key))
@@ -241,8 +344,26 @@ class ColumnFamily:
             return None
         return remaining_ms / 1000.0
 
+    def wait_expiry(self, key: _Encodable, timeout: Optional[float] = None) -> bool:
+        """
+        Block until key's TTL in this CF runs out, or timeout seconds pass.
+
+        Sleeps straight to the stored deadline (re-reading it in case the TTL
+        was changed meanwhile) instead of polling.  The GIL is released while
+        sleeping.  Returns True once the key has expired or does not exist,
+        False if it has no TTL or the timeout elapsed first.
+        """
+        return _wait_expiry(self._cf.ttl_remaining, _enc(key), timeout)
+
     def purge_expired(self) -> int:
-        """Scan and delete all expired keys in this CF. Returns count deleted."""
+        """
+        Scan and delete all expired keys in this CF. Returns count deleted.
+
+        If this handle was opened with reclaim_ratio and the purge leaves at
+        least that fraction of the file's pages free, they are vacuumed.
+        """
+        if self._reclaim_ratio:
+            return self._cf.purge_expired(float(self._reclaim_ratio))
         return self._cf.purge_expired()
 
     def put_if_absent(
@@ -260,9 +381,63 @@ class ColumnFamily:
         if ttl is None:
             expire_ms = 0
         else:
-            expire_ms = int((time.time() + float(ttl)) * 1000)
+            expire_ms = _expire_ms(ttl)
         return self._cf.put_if_absent(_enc(key), _enc(value), expire_ms)
 
+    def write_batch(
+        self,
+        pairs: Iterable[Tuple[_Encodable, _Encodable]],
+    ) -> None:
+        """
+        Insert or update many (key, value) pairs in this column family with one call.
+
+        Outside a transaction the batch is written atomically in a single
+        write transaction (one WAL commit).  Inside begin(write=True) the
+        pairs join the open transaction.  Keys and values may be str or bytes.
+        """
+        self._cf.write_batch(pairs)
+
+    def mput(self, items: Iterable[tuple]) -> None:
+        """
+        Insert or update many keys in this column family in one call.
+
+        items -- iterable of (key, value) or (key, value, ttl) tuples; ttl is
+        seconds (int or float) or None for no expiry.  Written in a single
+        transaction, with the same semantics as write_batch().
+        """
+        self._cf.write_batch_ttl(_ttl_items(items))
+
+    def mget(self, keys: Iterable[_Encodable]) -> List[Optional[bytes]]:
+        """
+        Look up many keys in this column family in one call.
+
+        Returns a list of values in key order; missing or expired keys give None.
+        """
+        return self._cf.get_batch(keys)
+
+    def mdelete(self, keys: Iterable[_Encodable]) -> int:
+        """
+        Delete many keys from this column family in one call.
+
+        Missing keys are skipped.  Returns the number of keys removed.
+        Written in a single transaction, with the same semantics as write_batch().
+        """
+        return self._cf.delete_batch(keys)
+
+    def incr_with_ttl(self, key: _Encodable, limit: int, window: float) -> bool:
+        """
+        Fixed-window counter for rate limiting, done in one atomic call.
+
+        Increments the decimal counter stored at key if it is below limit.
+        A missing or expired counter starts at 1 and expires window seconds
+        from now; later increments keep that expiry.
+        Returns True if the counter was incremented, False if limit was reached.
+        """
+        window_ms = _ttl_ms(window)
+        if window_ms <= 0:
+            raise ValueError("window must be at least 1 ms")
+        return self._cf.incr_ttl(_enc(key), int(limit), window_ms)
+
     def clear(self) -> None:
         """Remove all key-value pairs from this column family (including TTL entries)."""
         self._cf.clear()
@@ -275,6 +450,13 @@ class ColumnFamily:
         """
         return self._cf.count()
 
+    def count_prefix(self, prefix: _Encodable) -> int:
+        """
+        Return the number of live keys in this column family that start with prefix.
+        The scan runs entirely in C; no key or value objects are created.
+        """
+        return self._cf.count_prefix(_enc(prefix))
+
     # --- Iterators ---
 
     def iterator(
@@ -314,17 +496,21 @@ class ColumnFamily:
 
     def __getitem__(self, key: _Encodable) -> bytes:
         # NotFoundError IS-A KeyError — let it propagate directly.
-        # Use get_ttl so expired keys raise KeyError rather than returning stale data.
-        value, _remaining = self._cf.get_ttl(_enc(key))
-        return value
+        # get_checked applies the expiry check, so expired keys raise KeyError
+        # rather than returning stale data.
+        return self._cf.get_checked(
+            key if type(key) is bytes else _enc(key)
+        )
 
     def __setitem__(self, key, value: _Encodable) -> None:
         if isinstance(key, tuple):
             k, ttl = key
-            expire_ms = int((time.time() + ttl) * 1000)
-            self._cf.put_ttl(_enc(k), _enc(value), expire_ms)
+            self._cf.put_ttl_rel(_enc(k), _enc(value), _ttl_ms(ttl))
         else:
-            self._cf.put(_enc(key), _enc(value))
+            self._cf.put(
+                key if type(key) is bytes else _enc(key),
+                value if type(value) is bytes else _enc(value),
+            )
 
     def __delitem__(self, key: _Encodable) -> None:
         # NotFoundError IS-A KeyError — let it propagate directly.
@@ -333,7 +519,9 @@ class ColumnFamily:
     def __contains__(self, key: object) -> bool:
         if not isinstance(key, (str, bytes, bytearray, memoryview)):
             return False
-        return self._cf.exists(_enc(key))  # type: ignore[arg-type]
+        return self._cf.exists(
+            key if type(key) is bytes else _enc(key)  # type: ignore[arg-type]
+        )
 
     def __iter__(self) -> TypingIterator[Tuple[bytes, bytes]]:
         return iter(self.iterator())
@@ -341,7 +529,11 @@ class ColumnFamily:
     # --- Lifecycle ---
 
     def close(self) -> None:
-        """Release column family resources (does not delete data)."""
+        """
+        Release column family resources (does not delete data).
+        Raises RuntimeError if another thread is inside a call on this
+        column family; close it after that call returns.
+        """
         self._cf.close()
 
     def __enter__(self) -> "ColumnFamily":
@@ -420,10 +612,12 @@ class KVStore:
                Both the data write and the TTL index write are atomic.
         """
         if ttl is None:
-            self._db.put(_enc(key), _enc(value))
+            self._db.put(
+                key if type(key) is bytes else _enc(key),
+                value if type(value) is bytes else _enc(value),
+            )
         else:
-            expire_ms = int((time.time() + float(ttl)) * 1000)
-            self._db.put_ttl(_enc(key), _enc(value), expire_ms)
+            self._db.put_ttl_rel(_enc(key), _enc(value), _ttl_ms(ttl))
 
     def get(
         self,
@@ -432,11 +626,30 @@ class KVStore:
     ) -> Optional[bytes]:
         """Return value bytes for key, or default if not found or expired."""
         try:
-            value, _remaining = self._db.get_ttl(_enc(key))
-            return value
+            return self._db.get_checked(
+                key if type(key) is bytes else _enc(key)
+            )
         except NotFoundError:
             return default
 
+    def get_with_ttl(
+        self,
+        key: _Encodable,
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """
+        Return (value, remaining_ttl_seconds) from a single lookup.
+
+        remaining is None if the key has no expiry.
+        Returns (None, None) if the key is not found or expired.
+        """
+        try:
+            value, remaining_ms = self._db.get_ttl(_enc(key))
+        except NotFoundError:
+            return None, None
+        if remaining_ms == _snkv.NO_TTL:
+            return value, None
+        return value, remaining_ms / 1000.0
+
     def delete(self, key: _Encodable) -> None:
         """Delete key. Raises NotFoundError (subclass of KeyError) if not found."""
         self._db.delete(_enc(key))
@@ -458,6 +671,17 @@ class KVStore:
             return None
         return remaining_ms / 1000.0
 
+    def wait_expiry(self, key: _Encodable, timeout: Optional[float] = None) -> bool:
+        """
+        Block until key's TTL in the default CF runs out, or timeout seconds pass.
+
+        Sleeps straight to the stored deadline (re-reading it in case the TTL
+        was changed meanwhile) instead of polling.  The GIL is released while
+        sleeping.  Returns True once the key has expired or does not exist,
+        False if it has no TTL or the timeout elapsed first.
+        """
+        return _wait_expiry(self._db.ttl_remaining, _enc(key), timeout)
+
     def purge_expired(self) -> int:
         """Scan and delete all expired keys. Returns the number of keys deleted."""
         return self._db.purge_expired()
@@ -477,9 +701,63 @@ class KVStore:
         if ttl is None:
             expire_ms = 0
         else:
-            expire_ms = int((time.time() + float(ttl)) * 1000)
+            expire_ms = _expire_ms(ttl)
         return self._db.put_if_absent(_enc(key), _enc(value), expire_ms)
 
+    def write_batch(
+        self,
+        pairs: Iterable[Tuple[_Encodable, _Encodable]],
+    ) -> None:
+        """
+        Insert or update many (key, value) pairs in the default column family with one call.
+
+        Outside a transaction the batch is written atomically in a single
+        write transaction (one WAL commit).  Inside begin(write=True) the
+        pairs join the open transaction.  Keys and values may be str or bytes.
+        """
+        self._db.write_batch(pairs)
+
+    def mput(self, items: Iterable[tuple]) -> None:
+        """
+        Insert or update many keys in the default column family in one call.
+
+        items -- iterable of (key, value) or (key, value, ttl) tuples; ttl is
+        seconds (int or float) or None for no expiry.  Written in a single
+        transaction, with the same semantics as write_batch().
+        """
+        self._db.write_batch_ttl(_ttl_items(items))
+
+    def mget(self, keys: Iterable[_Encodable]) -> List[Optional[bytes]]:
+        """
+        Look up many keys in the default column family in one call.
+
+        Returns a list of values in key order; missing or expired keys give None.
+        """
+        return self._db.get_batch(keys)
+
+    def mdelete(self, keys: Iterable[_Encodable]) -> int:
+        """
+        Delete many keys from the default column family in one call.
+
+        Missing keys are skipped.  Returns the number of keys removed.
+        Written in a single transaction, with the same semantics as write_batch().
+        """
+        return self._db.delete_batch(keys)
+
+    def incr_with_ttl(self, key: _Encodable, limit: int, window: float) -> bool:
+        """
+        Fixed-window counter for rate limiting, done in one atomic call.
+
+        Increments the decimal counter stored at key if it is below limit.
+        A missing or expired counter starts at 1 and expires window seconds
+        from now; later increments keep that expiry.
+        Returns True if the counter was incremented, False if limit was reached.
+        """
+        window_ms = _ttl_ms(window)
+        if window_ms <= 0:
+            raise ValueError("window must be at least 1 ms")
+        return self._db.incr_ttl(_enc(key), int(limit), window_ms)
+
     def clear(self) -> None:
         """Remove all key-value pairs from the default column family (including TTL entries)."""
         self._db.clear()
@@ -492,21 +770,32 @@ class KVStore:
         """
         return self._db.count()
 
+    def count_prefix(self, prefix: _Encodable) -> int:
+        """
+        Return the number of live keys in the default column family that start with prefix.
+        The scan runs entirely in C; no key or value objects are created.
+        """
+        return self._db.count_prefix(_enc(prefix))
+
     # --- dict-like interface ---
 
     def __getitem__(self, key: _Encodable) -> bytes:
         # NotFoundError IS-A KeyError — let it propagate directly.
-        # Use get_ttl so expired keys raise KeyError rather than returning stale data.
-        value, _remaining = self._db.get_ttl(_enc(key))
-        return value
+        # get_checked applies the expiry check, so expired keys raise KeyError
+        # rather than returning stale data.
+        return self._db.get_checked(
+            key if type(key) is bytes else _enc(key)
+        )
 
     def __setitem__(self, key, value: _Encodable) -> None:
         if isinstance(key, tuple):
             k, ttl = key
-            expire_ms = int((time.time() + ttl) * 1000)
-            self._db.put_ttl(_enc(k), _enc(value), expire_ms)
+            self._db.put_ttl_rel(_enc(k), _enc(value), _ttl_ms(ttl))
         else:
-            self._db.put(_enc(key), _enc(value))
+            self._db.put(
+                key if type(key) is bytes else _enc(key),
+                value if type(value) is bytes else _enc(value),
+            )
 
     def __delitem__(self, key: _Encodable) -> None:
         # NotFoundError IS-A KeyError — let it propagate directly.
@@ -515,7 +804,9 @@ class KVStore:
     def __contains__(self, key: object) -> bool:
         if not isinstance(key, (str, bytes, bytearray, memoryview)):
             return False
-        return self._db.exists(_enc(key))  # type: ignore[arg-type]
+        return self._db.exists(
+            key if type(key) is bytes else _enc(key)  # type: ignore[arg-type]
+        )
 
     def __iter__(self) -> TypingIterator[Tuple[bytes, bytes]]:
         """Iterate over all (key, value) pairs in the default column family."""
@@ -537,13 +828,32 @@ class KVStore:
 
     # --- Column families ---
 
-    def create_column_family(self, name: str) -> ColumnFamily:
-        """Create a new column family and return its handle."""
-        return ColumnFamily(self._db.cf_create(name))
+    def create_column_family(
+        self,
+        name: str,
+        reclaim_ratio: Optional[float] = None,
+    ) -> ColumnFamily:
+        """
+        Create a new column family and return its handle.
+
+        reclaim_ratio -- if set (0 < ratio <= 1), purge_expired() on the handle
+        runs an incremental vacuum once free pages reach that fraction of the
+        file.  Useful for CFs holding many short-lived TTL keys.
+        """
+        reclaim_ratio = _check_ratio(reclaim_ratio)
+        return ColumnFamily(self._db.cf_create(name), reclaim_ratio)
 
-    def open_column_family(self, name: str) -> ColumnFamily:
-        """Open an existing column family. Raises NotFoundError if missing."""
-        return ColumnFamily(self._db.cf_open(name))
+    def open_column_family(
+        self,
+        name: str,
+        reclaim_ratio: Optional[float] = None,
+    ) -> ColumnFamily:
+        """
+        Open an existing column family. Raises NotFoundError if missing.
+        reclaim_ratio -- see create_column_family().
+        """
+        reclaim_ratio = _check_ratio(reclaim_ratio)
+        return ColumnFamily(self._db.cf_open(name), reclaim_ratio)
 
     def default_column_family(self) -> ColumnFamily:
         """Return a handle to the default column family."""
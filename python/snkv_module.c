@@ -85,6 +85,219 @@ snkv_raise_from(KVStore *db, int rc)
         PyErr_SetString(SnkvError, "Iterator is closed"); \
         return NULL; } } while (0)
 
+/* A method that uses an iterator or column family handle with the GIL
+** released bumps the object's busy count around that section, so close()
+** from another thread refuses instead of freeing the handle mid-call.
+** dealloc needs no check: an in-flight method holds a reference. */
+#define SNKV_BEGIN_USE(self) (self)->busy++; Py_BEGIN_ALLOW_THREADS
+#define SNKV_END_USE(self)   Py_END_ALLOW_THREADS (self)->busy--;
+
+/* Absolute expiry for a TTL of ttl_ms from now, on the same clock the
+** store compares against.  Never 0, which put_ttl reads as "no expiry".
+** Saturates at INT64_MAX instead of overflowing on a huge ttl_ms. */
+static int64_t
+snkv_rel_expire_ms(long long ttl_ms)
+{
+    int64_t now = kvstore_now_ms();
+    if ((int64_t)ttl_ms > INT64_MAX - now) return INT64_MAX;
+    if ((int64_t)ttl_ms <= -now) return 1;
+    return now + (int64_t)ttl_ms;
+}
+
+/* Walk an already-positioned iterator to eof, counting entries without
+** reading keys or values.  Closes the iterator.  Call without the GIL. */
+static int
+snkv_count_iter(KVIterator *iter, int64_t *pnCount)
+{
+    int64_t n = 0;
+    int rc = KVSTORE_OK;
+    while (!kvstore_iterator_eof(iter)) {
+        n++;
+        rc = kvstore_iterator_next(iter);
+        if (rc != KVSTORE_OK) break;
+    }
+    kvstore_iterator_close(iter);
+    *pnCount = n;
+    return rc;
+}
+
+
+/* ---------------------------------------------------------------------
+** Batch argument marshalling
+**
+** Flattens a Python iterable of keys, (key, value) pairs or
+** (key, value, expire_ms) triples into the parallel pointer/length arrays
+** taken by kvstore_*_batch().  Keys and values may be bytes-like objects or
+** str (UTF-8), so the high-level wrapper can pass the caller's iterable
+** straight through without a per-item encode in Python.
+** All pointers stay valid until snkv_batch_release(); no Python objects are
+** touched in between, so the C call can run without the GIL.
+** --------------------------------------------------------------------- */
+#define SNKV_BATCH_KEYS   1     /* items are keys                     */
+#define SNKV_BATCH_PAIRS  2     /* items are (key, value)             */
+#define SNKV_BATCH_TTL    3     /* items are (key, value, expire_ms)  */
+
+typedef struct {
+    Py_ssize_t   n;        /* number of items                          */
+    PyObject   **apItem;   /* fast sequences for each item (owned)     */
+    Py_buffer   *aBuf;     /* 2*n buffers; .obj == NULL for str items  */
+    const void **apKey;
+    const void **apVal;
+    int         *anKey;
+    int         *anVal;
+    int64_t     *aExpire;  /* SNKV_BATCH_TTL only                      */
+} SnkvBatch;
+
+static void
+snkv_batch_release(SnkvBatch *b)
+{
+    Py_ssize_t i;
+    for (i = 0; i < 2 * b->n; i++) {
+        if (b->aBuf && b->aBuf[i].obj) PyBuffer_Release(&b->aBuf[i]);
+    }
+    for (i = 0; i < b->n; i++) {
+        if (b->apItem) Py_XDECREF(b->apItem[i]);
+    }
+    PyMem_Free(b->apItem);
+    PyMem_Free(b->aBuf);
+    PyMem_Free(b->apKey);
+    PyMem_Free(b->apVal);
+    PyMem_Free(b->anKey);
+    PyMem_Free(b->anVal);
+    PyMem_Free(b->aExpire);
+    memset(b, 0, sizeof(*b));
+}
+
+/* Point (*pp, *pn) at the bytes of obj.  Returns 0 on success. */
+static int
+snkv_batch_item(PyObject *obj, Py_buffer *view, const void **pp, int *pn)
+{
+    Py_ssize_t len;
+    view->obj = NULL;
+    if (PyUnicode_Check(obj)) {
+        const char *z = PyUnicode_AsUTF8AndSize(obj, &len);
+        if (!z) return -1;
+        *pp = z;
+    } else if (PyObject_CheckBuffer(obj)) {
+        if (PyObject_GetBuffer(obj, view, PyBUF_SIMPLE) < 0) return -1;
+        *pp = view->buf;
+        len = view->len;
+    } else {
+        PyErr_Format(PyExc_TypeError,
+                     "keys and values must be str or bytes, not '%.100s'",
+                     Py_TYPE(obj)->tp_name);
+        return -1;
+    }
+    if (len > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "key or value too large");
+        return -1;
+    }
+    *pn = (int)len;
+    return 0;
+}
+
+/* Fill b from an iterable of items shaped according to mode (one of the
+** SNKV_BATCH_* values).  Returns 0 on success; on failure the batch is
+** already released and a Python exception is set. */
+static int
+snkv_batch_collect(PyObject *iterable, SnkvBatch *b, int mode)
+{
+    const char *zShape = mode == SNKV_BATCH_TTL
+        ? "items must be (key, value, expire_ms) triples"
+        : "items must be (key, value) pairs";
+    PyObject *seq;
+    Py_ssize_t i, n;
+
+    memset(b, 0, sizeof(*b));
+    seq = PySequence_Fast(iterable, mode == SNKV_BATCH_KEYS
+                          ? "expected an iterable of keys"
+                          : "expected an iterable of batch items");
+    if (!seq) return -1;
+    n = PySequence_Fast_GET_SIZE(seq);
+    if (n > INT_MAX) {
+        Py_DECREF(seq);
+        PyErr_SetString(PyExc_OverflowError, "too many items in one batch");
+        return -1;
+    }
+
+    b->apItem = PyMem_Calloc(n ? n : 1, sizeof(PyObject *));
+    b->aBuf   = PyMem_Calloc(n ? 2 * n : 1, sizeof(Py_buffer));
+    b->apKey  = PyMem_Calloc(n ? n : 1, sizeof(void *));
+    b->apVal  = PyMem_Calloc(n ? n : 1, sizeof(void *));
+    b->anKey  = PyMem_Calloc(n ? n : 1, sizeof(int));
+    b->anVal  = PyMem_Calloc(n ? n : 1, sizeof(int));
+    if (mode == SNKV_BATCH_TTL)
+        b->aExpire = PyMem_Calloc(n ? n : 1, sizeof(int64_t));
+    b->n      = n;
+    if (!b->apItem || !b->aBuf || !b->apKey || !b->apVal || !b->anKey || !b->anVal
+        || (mode == SNKV_BATCH_TTL && !b->aExpire)) {
+        Py_DECREF(seq);
+        snkv_batch_release(b);
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    for (i = 0; i < n; i++) {
+        PyObject *item = PySequence_Fast_GET_ITEM(seq, i);
+        if (mode == SNKV_BATCH_KEYS) {
+            /* Keep the key alive independently of seq. */
+            Py_INCREF(item);
+            b->apItem[i] = item;
+            if (snkv_batch_item(item, &b->aBuf[2 * i],
+                                &b->apKey[i], &b->anKey[i]) < 0) goto fail;
+            continue;
+        }
+        item = PySequence_Fast(item, zShape);
+        if (!item) goto fail;
+        b->apItem[i] = item;
+        if (PySequence_Fast_GET_SIZE(item) != mode) {
+            PyErr_SetString(PyExc_ValueError, zShape);
+            goto fail;
+        }
+        if (snkv_batch_item(PySequence_Fast_GET_ITEM(item, 0), &b->aBuf[2 * i],
+                            &b->apKey[i], &b->anKey[i]) < 0) goto fail;
+        if (snkv_batch_item(PySequence_Fast_GET_ITEM(item, 1), &b->aBuf[2 * i + 1],
+                            &b->apVal[i], &b->anVal[i]) < 0) goto fail;
+        if (mode == SNKV_BATCH_TTL) {
+            long long expire_ms = PyLong_AsLongLong(PySequence_Fast_GET_ITEM(item, 2));
+            if (expire_ms == -1 && PyErr_Occurred()) goto fail;
+            b->aExpire[i] = (int64_t)expire_ms;
+        }
+    }
+    /* Item references keep every key/value object alive; seq itself can go. */
+    Py_DECREF(seq);
+    return 0;
+
+fail:
+    Py_DECREF(seq);
+    snkv_batch_release(b);
+    return -1;
+}
+
+/* Build a list from kvstore_*_get_batch() results, freeing the values.
+** Missing keys (anValue[i] < 0) become None. */
+static PyObject *
+snkv_batch_values(Py_ssize_t n, void **apValue, const int *anValue)
+{
+    Py_ssize_t i;
+    PyObject *list = PyList_New(n);
+    for (i = 0; i < n; i++) {
+        PyObject *v = NULL;
+        if (list) {
+            if (anValue[i] < 0) {
+                v = Py_None;
+                Py_INCREF(v);
+            } else {
+                v = PyBytes_FromStringAndSize((const char *)apValue[i], anValue[i]);
+            }
+            if (!v) Py_CLEAR(list);
+            else    PyList_SET_ITEM(list, i, v);
+        }
+        if (apValue[i]) snkv_free(apValue[i]);
+    }
+    return list;
+}
+
 
 /* =====================================================================
 ** IteratorObject
@@ -98,8 +311,30 @@ typedef struct {
     int            needs_first; /* 1 = normal iter (call first()/last() on __next__) */
     int            started;     /* 0 = before first read, 1 = in progress    */
     int            reverse;     /* 1 = reverse iter (__next__ uses last/prev) */
+    int            busy;        /* calls using iter with the GIL released */
 } IteratorObject;
 
+/* Close the iterator without the GIL: kvstore_iterator_close takes the
+** store mutex, which a purge or batch in another thread may hold for a
+** while.  The handle is detached first so no other thread can reuse it.
+** Returns -1 with RuntimeError set if another thread is still using it. */
+static int
+snkv_iter_detach_close(IteratorObject *self)
+{
+    KVIterator *iter = self->iter;
+    if (!iter) return 0;
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Iterator is in use by another thread");
+        return -1;
+    }
+    self->iter = NULL;
+    Py_BEGIN_ALLOW_THREADS
+    kvstore_iterator_close(iter);
+    Py_END_ALLOW_THREADS
+    return 0;
+}
+
 static void
 Iterator_dealloc(IteratorObject *self)
 {
@@ -116,9 +351,9 @@ Iterator_first(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 {
     int rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_first(self->iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     self->started = 1;
     self->needs_first = 0;
@@ -130,9 +365,9 @@ Iterator_next_method(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 {
     int rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_next(self->iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     Py_RETURN_NONE;
 }
@@ -142,9 +377,9 @@ Iterator_last(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 {
     int rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_last(self->iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     self->started = 1;
     self->needs_first = 0;
@@ -156,9 +391,9 @@ Iterator_prev(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 {
     int rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_prev(self->iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     Py_RETURN_NONE;
 }
@@ -176,9 +411,9 @@ Iterator_key(IteratorObject *self, PyObject *Py_UNUSED(ignored))
     void *pKey = NULL;
     int   nKey = 0, rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_key(self->iter, &pKey, &nKey);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return PyBytes_FromStringAndSize((const char *)pKey, nKey);
 }
@@ -189,9 +424,9 @@ Iterator_value(IteratorObject *self, PyObject *Py_UNUSED(ignored))
     void *pValue = NULL;
     int   nValue = 0, rc;
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_value(self->iter, &pValue, &nValue);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return PyBytes_FromStringAndSize((const char *)pValue, nValue);
 }
@@ -204,11 +439,11 @@ Iterator_item(IteratorObject *self, PyObject *Py_UNUSED(ignored))
     PyObject *k, *v, *pair;
 
     IT_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_key(self->iter, &pKey, &nKey);
     if (rc == KVSTORE_OK)
         rc = kvstore_iterator_value(self->iter, &pValue, &nValue);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
 
     k = PyBytes_FromStringAndSize((const char *)pKey, nKey);
@@ -224,10 +459,7 @@ Iterator_item(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 static PyObject *
 Iterator_close(IteratorObject *self, PyObject *Py_UNUSED(ignored))
 {
-    if (self->iter) {
-        kvstore_iterator_close(self->iter);
-        self->iter = NULL;
-    }
+    if (snkv_iter_detach_close(self) < 0) return NULL;
     Py_RETURN_NONE;
 }
 
@@ -245,9 +477,9 @@ Iterator_seek(IteratorObject *self, PyObject *args)
     if (!PyArg_ParseTuple(args, "y*", &key_buf))
         return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_iterator_seek(self->iter, key_buf.buf, (int)key_buf.len);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
@@ -268,10 +500,7 @@ static PyObject *
 Iterator_exit(IteratorObject *self, PyObject *args)
 {
     (void)args;
-    if (self->iter) {
-        kvstore_iterator_close(self->iter);
-        self->iter = NULL;
-    }
+    if (snkv_iter_detach_close(self) < 0) return NULL;
     Py_RETURN_FALSE;
 }
 
@@ -302,13 +531,13 @@ Iterator_iternext(IteratorObject *self)
         self->started = 1;
         if (self->needs_first) {
             if (self->reverse) {
-                Py_BEGIN_ALLOW_THREADS
+                SNKV_BEGIN_USE(self)
                 rc = kvstore_iterator_last(self->iter);
-                Py_END_ALLOW_THREADS
+                SNKV_END_USE(self)
             } else {
-                Py_BEGIN_ALLOW_THREADS
+                SNKV_BEGIN_USE(self)
                 rc = kvstore_iterator_first(self->iter);
-                Py_END_ALLOW_THREADS
+                SNKV_END_USE(self)
             }
             if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
         }
@@ -316,13 +545,13 @@ Iterator_iternext(IteratorObject *self)
     } else {
         /* Advance to next position */
         if (self->reverse) {
-            Py_BEGIN_ALLOW_THREADS
+            SNKV_BEGIN_USE(self)
             rc = kvstore_iterator_prev(self->iter);
-            Py_END_ALLOW_THREADS
+            SNKV_END_USE(self)
         } else {
-            Py_BEGIN_ALLOW_THREADS
+            SNKV_BEGIN_USE(self)
             rc = kvstore_iterator_next(self->iter);
-            Py_END_ALLOW_THREADS
+            SNKV_END_USE(self)
         }
         if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     }
@@ -335,6 +564,129 @@ Iterator_iternext(IteratorObject *self)
     return Iterator_item(self, NULL);
 }
 
+/* Rows copied out of the iterator by fetch_many() while the GIL is
+** released: key i is aBuf[aOff[2*i] .. +aLen[2*i]], value i follows. */
+typedef struct {
+    char       *aBuf;
+    Py_ssize_t  nBuf, nAllocBuf;
+    Py_ssize_t *aOff;
+    int        *aLen;
+    Py_ssize_t  nRow, nAllocRow;
+} SnkvRowBuf;
+
+static int
+snkv_rowbuf_add(SnkvRowBuf *b, const void *pKey, int nKey,
+                const void *pVal, int nVal)
+{
+    if (b->nRow == b->nAllocRow) {
+        Py_ssize_t nNew = b->nAllocRow ? b->nAllocRow * 2 : 64;
+        Py_ssize_t *aOff = PyMem_RawRealloc(b->aOff, 2 * nNew * sizeof(Py_ssize_t));
+        if (!aOff) return -1;
+        b->aOff = aOff;
+        int *aLen = PyMem_RawRealloc(b->aLen, 2 * nNew * sizeof(int));
+        if (!aLen) return -1;
+        b->aLen = aLen;
+        b->nAllocRow = nNew;
+    }
+    if (b->nBuf + nKey + nVal > b->nAllocBuf) {
+        Py_ssize_t nNew = b->nAllocBuf ? b->nAllocBuf : 16384;
+        while (nNew < b->nBuf + nKey + nVal) nNew *= 2;
+        char *aBuf = PyMem_RawRealloc(b->aBuf, nNew);
+        if (!aBuf) return -1;
+        b->aBuf = aBuf;
+        b->nAllocBuf = nNew;
+    }
+    b->aOff[2 * b->nRow] = b->nBuf;
+    b->aLen[2 * b->nRow] = nKey;
+    if (nKey) memcpy(b->aBuf + b->nBuf, pKey, nKey);
+    b->nBuf += nKey;
+    b->aOff[2 * b->nRow + 1] = b->nBuf;
+    b->aLen[2 * b->nRow + 1] = nVal;
+    if (nVal) memcpy(b->aBuf + b->nBuf, pVal, nVal);
+    b->nBuf += nVal;
+    b->nRow++;
+    return 0;
+}
+
+/* Iterator.fetch_many(n) -> list[(bytes, bytes)]
+** Return up to n (key, value) pairs, continuing the __next__ sequence.
+** An empty list means the iterator is exhausted.  The rows are stepped
+** and copied under a single GIL release, then turned into bytes objects,
+** so a batch costs one GIL round-trip instead of two per row.
+*/
+static PyObject *
+Iterator_fetch_many(IteratorObject *self, PyObject *args)
+{
+    Py_ssize_t n, i;
+    PyObject *list;
+    SnkvRowBuf rows;
+    KVIterator *iter;
+    int started, rc = KVSTORE_OK, nomem = 0;
+
+    if (!PyArg_ParseTuple(args, "n", &n)) return NULL;
+    if (n < 0) {
+        PyErr_SetString(PyExc_ValueError, "n must be >= 0");
+        return NULL;
+    }
+    if (!self->iter) return PyList_New(0);  /* closed -> exhausted */
+
+    /* Work on local copies while the GIL is released; the busy count keeps
+    ** another thread's close() from freeing iter under us. */
+    iter    = self->iter;
+    started = self->started;
+    memset(&rows, 0, sizeof(rows));
+    SNKV_BEGIN_USE(self)
+    for (i = 0; i < n; i++) {
+        void *pKey = NULL, *pVal = NULL;
+        int   nKey = 0,     nVal = 0;
+
+        /* Same stepping as Iterator_iternext. */
+        if (!started) {
+            started = 1;
+            if (self->needs_first) {
+                rc = self->reverse ? kvstore_iterator_last(iter)
+                                   : kvstore_iterator_first(iter);
+            }
+        } else {
+            rc = self->reverse ? kvstore_iterator_prev(iter)
+                               : kvstore_iterator_next(iter);
+        }
+        if (rc != KVSTORE_OK || kvstore_iterator_eof(iter)) break;
+
+        rc = kvstore_iterator_key(iter, &pKey, &nKey);
+        if (rc == KVSTORE_OK)
+            rc = kvstore_iterator_value(iter, &pVal, &nVal);
+        if (rc != KVSTORE_OK) break;
+        if (snkv_rowbuf_add(&rows, pKey, nKey, pVal, nVal) < 0) {
+            nomem = 1;
+            break;
+        }
+    }
+    SNKV_END_USE(self)
+    self->started = started;
+
+    list = NULL;
+    if (nomem) {
+        PyErr_NoMemory();
+    } else if (rc != KVSTORE_OK) {
+        snkv_raise_from(self->db, rc);
+    } else {
+        list = PyList_New(rows.nRow);
+        for (i = 0; list && i < rows.nRow; i++) {
+            PyObject *pair = Py_BuildValue(
+                "(y#y#)",
+                rows.aBuf + rows.aOff[2 * i],     (Py_ssize_t)rows.aLen[2 * i],
+                rows.aBuf + rows.aOff[2 * i + 1], (Py_ssize_t)rows.aLen[2 * i + 1]);
+            if (!pair) { Py_CLEAR(list); break; }
+            PyList_SET_ITEM(list, i, pair);
+        }
+    }
+    PyMem_RawFree(rows.aBuf);
+    PyMem_RawFree(rows.aOff);
+    PyMem_RawFree(rows.aLen);
+    return list;
+}
+
 static PyMethodDef Iterator_methods[] = {
     {"first",  (PyCFunction)Iterator_first,        METH_NOARGS, "Move to first key (forward iterator)."},
     {"last",   (PyCFunction)Iterator_last,         METH_NOARGS, "Move to last key (reverse iterator)."},
@@ -345,6 +697,7 @@ static PyMethodDef Iterator_methods[] = {
     {"value",  (PyCFunction)Iterator_value,         METH_NOARGS, "Return current value bytes."},
     {"item",   (PyCFunction)Iterator_item,          METH_NOARGS, "Return (key, value) tuple."},
     {"seek",   (PyCFunction)Iterator_seek,           METH_VARARGS, "seek(key) -> None. Position at first key >= key (forward) or last key <= key (reverse)."},
+    {"fetch_many", (PyCFunction)Iterator_fetch_many, METH_VARARGS, "fetch_many(n) -> list of up to n (key, value) tuples; [] when exhausted."},
     {"close",  (PyCFunction)Iterator_close,         METH_NOARGS, "Close the iterator."},
     {"__enter__", (PyCFunction)Iterator_enter,      METH_NOARGS, NULL},
     {"__exit__",  (PyCFunction)Iterator_exit,       METH_VARARGS, NULL},
@@ -373,12 +726,31 @@ typedef struct {
     KVColumnFamily *cf;
     PyObject       *store_ref;  /* KVStoreObject* */
     KVStore        *db;         /* convenience for error messages */
+    int             busy;       /* calls using cf with the GIL released */
 } ColumnFamilyObject;
 
 /* Forward declaration for make_iterator */
 static PyObject *make_iterator(KVIterator *iter, PyObject *store_ref,
                                 KVStore *db, int needs_first, int reverse);
 
+/* Same as snkv_iter_detach_close, for column family handles. */
+static int
+snkv_cf_detach_close(ColumnFamilyObject *self)
+{
+    KVColumnFamily *cf = self->cf;
+    if (!cf) return 0;
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Column family is in use by another thread");
+        return -1;
+    }
+    self->cf = NULL;
+    Py_BEGIN_ALLOW_THREADS
+    kvstore_cf_close(cf);
+    Py_END_ALLOW_THREADS
+    return 0;
+}
+
 static void
 ColumnFamily_dealloc(ColumnFamilyObject *self)
 {
@@ -400,11 +772,11 @@ ColumnFamily_put(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*y*", &key_buf, &val_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_put(self->cf,
                         key_buf.buf, (int)key_buf.len,
                         val_buf.buf, (int)val_buf.len);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
     PyBuffer_Release(&val_buf);
@@ -426,10 +798,10 @@ ColumnFamily_get(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_get(self->cf, key_buf.buf, (int)key_buf.len,
                         &value, &nValue);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
 
@@ -454,9 +826,9 @@ ColumnFamily_delete(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_delete(self->cf, key_buf.buf, (int)key_buf.len);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
 
@@ -475,9 +847,9 @@ ColumnFamily_exists(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_exists(self->cf, key_buf.buf, (int)key_buf.len, &exists);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
 
@@ -492,9 +864,9 @@ ColumnFamily_iterator(ColumnFamilyObject *self, PyObject *Py_UNUSED(ignored))
     int rc;
 
     CF_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_iterator_create(self->cf, &iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return make_iterator(iter, self->store_ref, self->db, /*needs_first=*/1, /*reverse=*/0);
 }
@@ -509,12 +881,12 @@ ColumnFamily_prefix_iterator(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &prefix_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_prefix_iterator_create(self->cf,
                                             prefix_buf.buf,
                                             (int)prefix_buf.len,
                                             &iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&prefix_buf);
 
@@ -529,9 +901,9 @@ ColumnFamily_reverse_iterator(ColumnFamilyObject *self, PyObject *Py_UNUSED(igno
     int rc;
 
     CF_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_reverse_iterator_create(self->cf, &iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return make_iterator(iter, self->store_ref, self->db, /*needs_first=*/1, /*reverse=*/1);
 }
@@ -546,12 +918,12 @@ ColumnFamily_reverse_prefix_iterator(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &prefix_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_reverse_prefix_iterator_create(self->cf,
                                                     prefix_buf.buf,
                                                     (int)prefix_buf.len,
                                                     &iter);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&prefix_buf);
 
@@ -563,10 +935,7 @@ ColumnFamily_reverse_prefix_iterator(ColumnFamilyObject *self, PyObject *args)
 static PyObject *
 ColumnFamily_close(ColumnFamilyObject *self, PyObject *Py_UNUSED(ignored))
 {
-    if (self->cf) {
-        kvstore_cf_close(self->cf);
-        self->cf = NULL;
-    }
+    if (snkv_cf_detach_close(self) < 0) return NULL;
     Py_RETURN_NONE;
 }
 
@@ -581,10 +950,7 @@ static PyObject *
 ColumnFamily_exit(ColumnFamilyObject *self, PyObject *args)
 {
     (void)args;
-    if (self->cf) {
-        kvstore_cf_close(self->cf);
-        self->cf = NULL;
-    }
+    if (snkv_cf_detach_close(self) < 0) return NULL;
     Py_RETURN_FALSE;
 }
 
@@ -600,12 +966,40 @@ ColumnFamily_put_ttl(ColumnFamilyObject *self, PyObject *args)
     if (!PyArg_ParseTuple(args, "y*y*L", &key_buf, &val_buf, &expire_ms))
         return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_put_ttl(self->cf,
                             key_buf.buf, (int)key_buf.len,
                             val_buf.buf, (int)val_buf.len,
                             (int64_t)expire_ms);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
+
+    PyBuffer_Release(&key_buf);
+    PyBuffer_Release(&val_buf);
+
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
+/* ColumnFamily.put_ttl_rel(key, value, ttl_ms) -> None
+**   Like put_ttl, but the expiry is ttl_ms from now on the store's clock.
+*/
+static PyObject *
+ColumnFamily_put_ttl_rel(ColumnFamilyObject *self, PyObject *args)
+{
+    Py_buffer key_buf, val_buf;
+    long long ttl_ms;
+    int       rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*y*L", &key_buf, &val_buf, &ttl_ms))
+        return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_put_ttl(self->cf,
+                            key_buf.buf, (int)key_buf.len,
+                            val_buf.buf, (int)val_buf.len,
+                            snkv_rel_expire_ms(ttl_ms));
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
     PyBuffer_Release(&val_buf);
@@ -631,11 +1025,11 @@ ColumnFamily_get_ttl(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_get_ttl(self->cf,
                             key_buf.buf, (int)key_buf.len,
                             &value, &nValue, &remaining);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
 
@@ -653,6 +1047,40 @@ ColumnFamily_get_ttl(ColumnFamilyObject *self, PyObject *args)
     return result;
 }
 
+/* ColumnFamily.get_checked(key) -> bytes
+**   Same lookup and lazy-expiry check as get_ttl(), without building the
+**   (value, remaining_ms) tuple.  Raises NotFoundError if missing or expired.
+*/
+static PyObject *
+ColumnFamily_get_checked(ColumnFamilyObject *self, PyObject *args)
+{
+    Py_buffer key_buf;
+    void     *value  = NULL;
+    int       nValue = 0, rc;
+    PyObject *result;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_get_ttl(self->cf,
+                            key_buf.buf, (int)key_buf.len,
+                            &value, &nValue, NULL);
+    SNKV_END_USE(self)
+
+    PyBuffer_Release(&key_buf);
+
+    if (rc == KVSTORE_NOTFOUND) {
+        PyErr_SetNone(SnkvNotFoundError);
+        return NULL;
+    }
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+
+    result = PyBytes_FromStringAndSize((const char *)value, nValue);
+    snkv_free(value);
+    return result;
+}
+
 /* ColumnFamily.ttl_remaining(key) -> int */
 static PyObject *
 ColumnFamily_ttl_remaining(ColumnFamilyObject *self, PyObject *args)
@@ -664,11 +1092,11 @@ ColumnFamily_ttl_remaining(ColumnFamilyObject *self, PyObject *args)
     CF_CHECK_OPEN(self);
     if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_ttl_remaining(self->cf,
                                   key_buf.buf, (int)key_buf.len,
                                   &remaining);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
 
@@ -680,16 +1108,30 @@ ColumnFamily_ttl_remaining(ColumnFamilyObject *self, PyObject *args)
     return PyLong_FromLongLong((long long)remaining);
 }
 
-/* ColumnFamily.purge_expired() -> int */
+/* ColumnFamily.purge_expired(reclaim_ratio=0.0) -> int
+**   reclaim_ratio > 0: if the purge deleted anything and the freelist now
+**   holds at least that fraction of the file's pages, run an incremental
+**   vacuum so the freed pages are returned to the filesystem.
+*/
 static PyObject *
-ColumnFamily_purge_expired(ColumnFamilyObject *self, PyObject *Py_UNUSED(ignored))
+ColumnFamily_purge_expired(ColumnFamilyObject *self, PyObject *args)
 {
     int n_deleted = 0, rc;
+    double reclaim_ratio = 0.0;
+    KVStoreStats stats;
 
     CF_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    if (!PyArg_ParseTuple(args, "|d", &reclaim_ratio)) return NULL;
+
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_purge_expired(self->cf, &n_deleted);
-    Py_END_ALLOW_THREADS
+    if (rc == KVSTORE_OK && n_deleted > 0 && reclaim_ratio > 0.0) {
+        rc = kvstore_stats(self->db, &stats);
+        if (rc == KVSTORE_OK && stats.nFreePages > 0 &&
+            (double)stats.nFreePages >= reclaim_ratio * (double)stats.nDbPages)
+            rc = kvstore_incremental_vacuum(self->db, 0);
+    }
+    SNKV_END_USE(self)
 
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return PyLong_FromLong(n_deleted);
@@ -711,12 +1153,12 @@ ColumnFamily_put_if_absent(ColumnFamilyObject *self, PyObject *args)
     if (!PyArg_ParseTuple(args, "y*y*|L", &key_buf, &val_buf, &expire_ms))
         return NULL;
 
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_put_if_absent(self->cf,
                                   key_buf.buf, (int)key_buf.len,
                                   val_buf.buf, (int)val_buf.len,
                                   (int64_t)expire_ms, &inserted);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     PyBuffer_Release(&key_buf);
     PyBuffer_Release(&val_buf);
@@ -724,6 +1166,34 @@ ColumnFamily_put_if_absent(ColumnFamilyObject *self, PyObject *args)
     return PyBool_FromLong(inserted);
 }
 
+/* ColumnFamily.incr_ttl(key, limit, window_ms) -> bool
+** Fixed-window counter: increment the decimal counter at key if it is below
+** limit.  A missing or expired counter starts at 1 and expires window_ms
+** from now.  Returns True if the counter was incremented.
+*/
+static PyObject *
+ColumnFamily_incr_ttl(ColumnFamilyObject *self, PyObject *args)
+{
+    Py_buffer key_buf;
+    long long limit, window_ms;
+    int allowed = 0, rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*LL", &key_buf, &limit, &window_ms))
+        return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_incr_ttl(self->cf,
+                             key_buf.buf, (int)key_buf.len,
+                             (int64_t)limit, (int64_t)window_ms,
+                             NULL, &allowed);
+    SNKV_END_USE(self)
+
+    PyBuffer_Release(&key_buf);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyBool_FromLong(allowed);
+}
+
 /* ColumnFamily.clear() -> None
 ** Remove all key-value pairs from this column family (including TTL entries).
 */
@@ -733,9 +1203,9 @@ ColumnFamily_clear(ColumnFamilyObject *self, PyObject *Py_UNUSED(ignored))
     int rc;
 
     CF_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_clear(self->cf);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     Py_RETURN_NONE;
@@ -752,14 +1222,154 @@ ColumnFamily_count(ColumnFamilyObject *self, PyObject *Py_UNUSED(ignored))
     int rc;
 
     CF_CHECK_OPEN(self);
-    Py_BEGIN_ALLOW_THREADS
+    SNKV_BEGIN_USE(self)
     rc = kvstore_cf_count(self->cf, &n);
-    Py_END_ALLOW_THREADS
+    SNKV_END_USE(self)
 
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
     return PyLong_FromLongLong((long long)n);
 }
 
+/* ColumnFamily.count_prefix(prefix) -> int
+** Count live keys starting with prefix entirely in C; no key or value
+** bytes objects are created.
+*/
+static PyObject *
+ColumnFamily_count_prefix(ColumnFamilyObject *self, PyObject *args)
+{
+    Py_buffer prefix_buf;
+    KVIterator *iter = NULL;
+    int64_t n = 0;
+    int rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*", &prefix_buf)) return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_prefix_iterator_create(self->cf,
+                                            prefix_buf.buf,
+                                            (int)prefix_buf.len,
+                                            &iter);
+    if (rc == KVSTORE_OK)
+        rc = snkv_count_iter(iter, &n);
+    SNKV_END_USE(self)
+
+    PyBuffer_Release(&prefix_buf);
+
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyLong_FromLongLong((long long)n);
+}
+
+/* ColumnFamily.write_batch(pairs) -> None
+** Write an iterable of (key, value) pairs with one C call: a single write
+** transaction when none is open, otherwise joins the caller's transaction.
+*/
+static PyObject *
+ColumnFamily_write_batch(ColumnFamilyObject *self, PyObject *args)
+{
+    PyObject *pairs;
+    SnkvBatch b;
+    int rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &pairs)) return NULL;
+    if (snkv_batch_collect(pairs, &b, SNKV_BATCH_PAIRS) < 0) return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_write_batch(self->cf, (int)b.n,
+                                b.apKey, b.anKey, b.apVal, b.anVal);
+    SNKV_END_USE(self)
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
+/* ColumnFamily.write_batch_ttl(items) -> None
+** items: iterable of (key, value, expire_ms); expire_ms 0 means no TTL.
+*/
+static PyObject *
+ColumnFamily_write_batch_ttl(ColumnFamilyObject *self, PyObject *args)
+{
+    PyObject *items;
+    SnkvBatch b;
+    int rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &items)) return NULL;
+    if (snkv_batch_collect(items, &b, SNKV_BATCH_TTL) < 0) return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_write_batch_ttl(self->cf, (int)b.n,
+                                    b.apKey, b.anKey, b.apVal, b.anVal, b.aExpire);
+    SNKV_END_USE(self)
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
+/* ColumnFamily.get_batch(keys) -> list[bytes | None]
+** Look up every key in one call; missing or expired keys map to None.
+*/
+static PyObject *
+ColumnFamily_get_batch(ColumnFamilyObject *self, PyObject *args)
+{
+    PyObject *keys, *result;
+    SnkvBatch b;
+    void **apValue;
+    int *anValue;
+    int rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &keys)) return NULL;
+    if (snkv_batch_collect(keys, &b, SNKV_BATCH_KEYS) < 0) return NULL;
+
+    apValue = PyMem_Calloc(b.n ? b.n : 1, sizeof(void *));
+    anValue = PyMem_Calloc(b.n ? b.n : 1, sizeof(int));
+    if (!apValue || !anValue) {
+        PyMem_Free(apValue);
+        PyMem_Free(anValue);
+        snkv_batch_release(&b);
+        return PyErr_NoMemory();
+    }
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_get_batch(self->cf, (int)b.n, b.apKey, b.anKey, apValue, anValue);
+    SNKV_END_USE(self)
+
+    result = (rc == KVSTORE_OK) ? snkv_batch_values(b.n, apValue, anValue) : NULL;
+    PyMem_Free(apValue);
+    PyMem_Free(anValue);
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return result;
+}
+
+/* ColumnFamily.delete_batch(keys) -> int
+** Delete every key in one call; missing keys are skipped.  Returns the
+** number of keys removed.
+*/
+static PyObject *
+ColumnFamily_delete_batch(ColumnFamilyObject *self, PyObject *args)
+{
+    PyObject *keys;
+    SnkvBatch b;
+    int nDeleted = 0, rc;
+
+    CF_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &keys)) return NULL;
+    if (snkv_batch_collect(keys, &b, SNKV_BATCH_KEYS) < 0) return NULL;
+
+    SNKV_BEGIN_USE(self)
+    rc = kvstore_cf_delete_batch(self->cf, (int)b.n, b.apKey, b.anKey, &nDeleted);
+    SNKV_END_USE(self)
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyLong_FromLong(nDeleted);
+}
+
 static PyMethodDef ColumnFamily_methods[] = {
     {"put",              (PyCFunction)ColumnFamily_put,              METH_VARARGS, "put(key, value) -> None"},
     {"get",              (PyCFunction)ColumnFamily_get,              METH_VARARGS, "get(key) -> bytes"},
@@ -771,13 +1381,21 @@ static PyMethodDef ColumnFamily_methods[] = {
     {"reverse_prefix_iterator", (PyCFunction)ColumnFamily_reverse_prefix_iterator, METH_VARARGS, "reverse_prefix_iterator(prefix) -> Iterator"},
     /* TTL */
     {"put_ttl",          (PyCFunction)ColumnFamily_put_ttl,          METH_VARARGS, "put_ttl(key, value, expire_ms) -> None"},
+    {"put_ttl_rel",      (PyCFunction)ColumnFamily_put_ttl_rel,      METH_VARARGS, "put_ttl_rel(key, value, ttl_ms) -> None"},
     {"get_ttl",          (PyCFunction)ColumnFamily_get_ttl,          METH_VARARGS, "get_ttl(key) -> (bytes, int)"},
+    {"get_checked",      (PyCFunction)ColumnFamily_get_checked,      METH_VARARGS, "get_checked(key) -> bytes"},
     {"ttl_remaining",    (PyCFunction)ColumnFamily_ttl_remaining,    METH_VARARGS, "ttl_remaining(key) -> int"},
-    {"purge_expired",    (PyCFunction)ColumnFamily_purge_expired,    METH_NOARGS,  "purge_expired() -> int"},
+    {"purge_expired",    (PyCFunction)ColumnFamily_purge_expired,    METH_VARARGS, "purge_expired(reclaim_ratio=0.0) -> int"},
     /* Conditional / Bulk */
     {"put_if_absent",    (PyCFunction)ColumnFamily_put_if_absent,    METH_VARARGS, "put_if_absent(key, value[, expire_ms]) -> bool"},
+    {"incr_ttl",         (PyCFunction)ColumnFamily_incr_ttl,         METH_VARARGS, "incr_ttl(key, limit, window_ms) -> bool"},
     {"clear",            (PyCFunction)ColumnFamily_clear,            METH_NOARGS,  "clear() -> None"},
     {"count",            (PyCFunction)ColumnFamily_count,            METH_NOARGS,  "count() -> int"},
+    {"count_prefix",     (PyCFunction)ColumnFamily_count_prefix,     METH_VARARGS, "count_prefix(prefix) -> int"},
+    {"write_batch",      (PyCFunction)ColumnFamily_write_batch,      METH_VARARGS, "write_batch(pairs) -> None"},
+    {"write_batch_ttl",  (PyCFunction)ColumnFamily_write_batch_ttl,  METH_VARARGS, "write_batch_ttl(items) -> None"},
+    {"get_batch",        (PyCFunction)ColumnFamily_get_batch,        METH_VARARGS, "get_batch(keys) -> list"},
+    {"delete_batch",     (PyCFunction)ColumnFamily_delete_batch,     METH_VARARGS, "delete_batch(keys) -> int"},
     /* Lifecycle */
     {"close",            (PyCFunction)ColumnFamily_close,            METH_NOARGS,  "close() -> None"},
     {"__enter__",        (PyCFunction)ColumnFamily_enter,            METH_NOARGS,  NULL},
@@ -816,6 +1434,7 @@ make_iterator(KVIterator *iter, PyObject *store_ref, KVStore *db,
     obj->needs_first = needs_first;
     obj->started     = 0;
     obj->reverse     = reverse;
+    obj->busy        = 0;
     Py_XINCREF(store_ref);
     return (PyObject *)obj;
 }
@@ -832,6 +1451,7 @@ make_column_family(KVColumnFamily *cf, PyObject *store_ref, KVStore *db)
     obj->cf        = cf;
     obj->store_ref = store_ref;
     obj->db        = db;
+    obj->busy      = 0;
     Py_XINCREF(store_ref);
     return (PyObject *)obj;
 }
@@ -1122,7 +1742,7 @@ KVStore_stats(KVStoreObject *self, PyObject *Py_UNUSED(ignored))
     rc = kvstore_stats(self->db, &stats);
     Py_END_ALLOW_THREADS
     if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
-    return Py_BuildValue("{sKsKsKsKsKsKsKsKsKsKsKsK}",
+    return Py_BuildValue("{sKsKsKsKsKsKsKsKsKsKsKsKsK}",
         "puts",           (unsigned long long)stats.nPuts,
         "gets",           (unsigned long long)stats.nGets,
         "deletes",        (unsigned long long)stats.nDeletes,
@@ -1134,7 +1754,8 @@ KVStore_stats(KVStoreObject *self, PyObject *Py_UNUSED(ignored))
         "checkpoints",    (unsigned long long)stats.nCheckpoints,
         "ttl_expired",    (unsigned long long)stats.nTtlExpired,
         "ttl_purged",     (unsigned long long)stats.nTtlPurged,
-        "db_pages",       (unsigned long long)stats.nDbPages);
+        "db_pages",       (unsigned long long)stats.nDbPages,
+        "free_pages",     (unsigned long long)stats.nFreePages);
 }
 
 /* KVStore.sync() */
@@ -1450,6 +2071,34 @@ KVStore_put_ttl(KVStoreObject *self, PyObject *args)
     Py_RETURN_NONE;
 }
 
+/* KVStore.put_ttl_rel(key, value, ttl_ms) -> None
+**   Like put_ttl, but the expiry is ttl_ms from now on the store's clock.
+*/
+static PyObject *
+KVStore_put_ttl_rel(KVStoreObject *self, PyObject *args)
+{
+    Py_buffer key_buf, val_buf;
+    long long ttl_ms;
+    int       rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*y*L", &key_buf, &val_buf, &ttl_ms))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_put_ttl(self->db,
+                         key_buf.buf, (int)key_buf.len,
+                         val_buf.buf, (int)val_buf.len,
+                         snkv_rel_expire_ms(ttl_ms));
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&key_buf);
+    PyBuffer_Release(&val_buf);
+
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
 /* KVStore.get_ttl(key) -> (bytes, int)
 **   Returns (value_bytes, remaining_ms).
 **   remaining_ms == KVSTORE_NO_TTL (-1) means the key has no expiry.
@@ -1488,6 +2137,39 @@ KVStore_get_ttl(KVStoreObject *self, PyObject *args)
     return result;
 }
 
+/* KVStore.get_checked(key) -> bytes
+**   Same lookup and lazy-expiry check as get_ttl(), without building the
+**   (value, remaining_ms) tuple.  Raises NotFoundError if missing or expired.
+*/
+static PyObject *
+KVStore_get_checked(KVStoreObject *self, PyObject *args)
+{
+    Py_buffer key_buf;
+    void     *value  = NULL;
+    int       nValue = 0, rc;
+    PyObject *result;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*", &key_buf)) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_get_ttl(self->db, key_buf.buf, (int)key_buf.len,
+                         &value, &nValue, NULL);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&key_buf);
+
+    if (rc == KVSTORE_NOTFOUND) {
+        PyErr_SetNone(SnkvNotFoundError);
+        return NULL;
+    }
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+
+    result = PyBytes_FromStringAndSize((const char *)value, nValue);
+    snkv_free(value);
+    return result;
+}
+
 /* KVStore.ttl_remaining(key) -> int
 **   Returns remaining ms. KVSTORE_NO_TTL (-1) if no expiry set.
 **   Raises NotFoundError if the key does not exist.
@@ -1561,6 +2243,34 @@ KVStore_put_if_absent(KVStoreObject *self, PyObject *args)
     return PyBool_FromLong(inserted);
 }
 
+/* KVStore.incr_ttl(key, limit, window_ms) -> bool
+** Fixed-window counter: increment the decimal counter at key if it is below
+** limit.  A missing or expired counter starts at 1 and expires window_ms
+** from now.  Returns True if the counter was incremented.
+*/
+static PyObject *
+KVStore_incr_ttl(KVStoreObject *self, PyObject *args)
+{
+    Py_buffer key_buf;
+    long long limit, window_ms;
+    int allowed = 0, rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*LL", &key_buf, &limit, &window_ms))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_incr_ttl(self->db,
+                          key_buf.buf, (int)key_buf.len,
+                          (int64_t)limit, (int64_t)window_ms,
+                          NULL, &allowed);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&key_buf);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyBool_FromLong(allowed);
+}
+
 /* KVStore.clear() -> None
 ** Remove all key-value pairs from the default column family (including TTL entries).
 */
@@ -1595,6 +2305,144 @@ KVStore_count(KVStoreObject *self, PyObject *Py_UNUSED(ignored))
     return PyLong_FromLongLong((long long)n);
 }
 
+/* KVStore.count_prefix(prefix) -> int
+** Count live keys in the default CF starting with prefix, in C.
+*/
+static PyObject *
+KVStore_count_prefix(KVStoreObject *self, PyObject *args)
+{
+    Py_buffer prefix_buf;
+    KVIterator *iter = NULL;
+    int64_t n = 0;
+    int rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "y*", &prefix_buf)) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_prefix_iterator_create(self->db,
+                                         prefix_buf.buf,
+                                         (int)prefix_buf.len,
+                                         &iter);
+    if (rc == KVSTORE_OK)
+        rc = snkv_count_iter(iter, &n);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&prefix_buf);
+
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyLong_FromLongLong((long long)n);
+}
+
+/* KVStore.write_batch(pairs) -> None
+** Write an iterable of (key, value) pairs to the default CF with one C call.
+*/
+static PyObject *
+KVStore_write_batch(KVStoreObject *self, PyObject *args)
+{
+    PyObject *pairs;
+    SnkvBatch b;
+    int rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &pairs)) return NULL;
+    if (snkv_batch_collect(pairs, &b, SNKV_BATCH_PAIRS) < 0) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_write_batch(self->db, (int)b.n,
+                             b.apKey, b.anKey, b.apVal, b.anVal);
+    Py_END_ALLOW_THREADS
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
+/* KVStore.write_batch_ttl(items) -> None
+** items: iterable of (key, value, expire_ms); expire_ms 0 means no TTL.
+*/
+static PyObject *
+KVStore_write_batch_ttl(KVStoreObject *self, PyObject *args)
+{
+    PyObject *items;
+    SnkvBatch b;
+    int rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &items)) return NULL;
+    if (snkv_batch_collect(items, &b, SNKV_BATCH_TTL) < 0) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_write_batch_ttl(self->db, (int)b.n,
+                                 b.apKey, b.anKey, b.apVal, b.anVal, b.aExpire);
+    Py_END_ALLOW_THREADS
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    Py_RETURN_NONE;
+}
+
+/* KVStore.get_batch(keys) -> list[bytes | None]
+** Look up every key in one call; missing or expired keys map to None.
+*/
+static PyObject *
+KVStore_get_batch(KVStoreObject *self, PyObject *args)
+{
+    PyObject *keys, *result;
+    SnkvBatch b;
+    void **apValue;
+    int *anValue;
+    int rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &keys)) return NULL;
+    if (snkv_batch_collect(keys, &b, SNKV_BATCH_KEYS) < 0) return NULL;
+
+    apValue = PyMem_Calloc(b.n ? b.n : 1, sizeof(void *));
+    anValue = PyMem_Calloc(b.n ? b.n : 1, sizeof(int));
+    if (!apValue || !anValue) {
+        PyMem_Free(apValue);
+        PyMem_Free(anValue);
+        snkv_batch_release(&b);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_get_batch(self->db, (int)b.n, b.apKey, b.anKey, apValue, anValue);
+    Py_END_ALLOW_THREADS
+
+    result = (rc == KVSTORE_OK) ? snkv_batch_values(b.n, apValue, anValue) : NULL;
+    PyMem_Free(apValue);
+    PyMem_Free(anValue);
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return result;
+}
+
+/* KVStore.delete_batch(keys) -> int
+** Delete every key in one call; missing keys are skipped.  Returns the
+** number of keys removed.
+*/
+static PyObject *
+KVStore_delete_batch(KVStoreObject *self, PyObject *args)
+{
+    PyObject *keys;
+    SnkvBatch b;
+    int nDeleted = 0, rc;
+
+    KV_CHECK_OPEN(self);
+    if (!PyArg_ParseTuple(args, "O", &keys)) return NULL;
+    if (snkv_batch_collect(keys, &b, SNKV_BATCH_KEYS) < 0) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = kvstore_delete_batch(self->db, (int)b.n, b.apKey, b.anKey, &nDeleted);
+    Py_END_ALLOW_THREADS
+
+    snkv_batch_release(&b);
+    if (rc != KVSTORE_OK) return snkv_raise_from(self->db, rc);
+    return PyLong_FromLong(nDeleted);
+}
+
 /* KVStore.purge_expired() -> int
 **   Deletes all expired keys. Returns count of deleted keys.
 */
@@ -1737,12 +2585,20 @@ static PyMethodDef KVStore_methods[] = {
 
     /* Conditional / Bulk */
     {"put_if_absent",    (PyCFunction)KVStore_put_if_absent,     METH_VARARGS,  "put_if_absent(key, value[, expire_ms]) -> bool"},
+    {"incr_ttl",         (PyCFunction)KVStore_incr_ttl,          METH_VARARGS,  "incr_ttl(key, limit, window_ms) -> bool"},
     {"clear",            (PyCFunction)KVStore_clear,             METH_NOARGS,   "clear() -> None"},
     {"count",            (PyCFunction)KVStore_count,             METH_NOARGS,   "count() -> int"},
+    {"count_prefix",     (PyCFunction)KVStore_count_prefix,      METH_VARARGS,  "count_prefix(prefix) -> int"},
+    {"write_batch",      (PyCFunction)KVStore_write_batch,       METH_VARARGS,  "write_batch(pairs) -> None"},
+    {"write_batch_ttl",  (PyCFunction)KVStore_write_batch_ttl,   METH_VARARGS,  "write_batch_ttl(items) -> None"},
+    {"get_batch",        (PyCFunction)KVStore_get_batch,         METH_VARARGS,  "get_batch(keys) -> list"},
+    {"delete_batch",     (PyCFunction)KVStore_delete_batch,      METH_VARARGS,  "delete_batch(keys) -> int"},
 
     /* TTL */
     {"put_ttl",          (PyCFunction)KVStore_put_ttl,           METH_VARARGS,  "put_ttl(key, value, expire_ms) -> None"},
+    {"put_ttl_rel",      (PyCFunction)KVStore_put_ttl_rel,       METH_VARARGS,  "put_ttl_rel(key, value, ttl_ms) -> None"},
     {"get_ttl",          (PyCFunction)KVStore_get_ttl,           METH_VARARGS,  "get_ttl(key) -> (bytes, int)"},
+    {"get_checked",      (PyCFunction)KVStore_get_checked,       METH_VARARGS,  "get_checked(key) -> bytes"},
     {"ttl_remaining",    (PyCFunction)KVStore_ttl_remaining,     METH_VARARGS,  "ttl_remaining(key) -> int"},
     {"purge_expired",    (PyCFunction)KVStore_purge_expired,     METH_NOARGS,   "purge_expired() -> int"},
 
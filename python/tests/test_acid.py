@@ -60,11 +60,11 @@ def test_atomicity_commit_makes_all_visible(db):
     """All puts in a committed transaction must be visible."""
     db.begin(write=True)
     for i in range(10):
-        db[f"key{i}".encode()] = f"val{i}".encode()
+        db[b"key%d" % i] = b"val%d" % i
     db.commit()
 
     for i in range(10):
-        assert db.get(f"key{i}".encode()) == f"val{i}".encode()
+        assert db.get(b"key%d" % i) == b"val%d" % i
 
 
 # ---------------------------------------------------------------------------
@@ -78,18 +78,20 @@ def test_consistency_integrity_check_empty(db):
 
 def test_consistency_integrity_check_after_inserts_and_deletes(db):
     """Integrity check must pass after bulk insert + partial delete."""
+    keys = [b"k%04d" % i for i in range(100)]
+    vals = [b"v%d" % i for i in range(100)]
+
     db.begin(write=True)
-    for i in range(100):
-        db[f"k{i:04d}".encode()] = f"v{i}".encode()
+    for k, v in zip(keys, vals):
+        db[k] = v
     db.commit()
 
     db.begin(write=True)
-    for i in range(0, 100, 2):      # delete even-indexed keys
-        db.delete(f"k{i:04d}".encode())
+    for k in keys[0::2]:            # delete even-indexed keys
+        db.delete(k)
     db.commit()
 
-    for i in range(1, 100, 2):      # odd keys must survive
-        assert db.get(f"k{i:04d}".encode()) == f"v{i}".encode()
+    assert db.mget(keys[1::2]) == vals[1::2]    # odd keys must survive
 
     db.integrity_check()
 
@@ -173,14 +175,15 @@ def test_durability_multiple_close_reopen_cycles(db_path):
     close/reopen cycles."""
     path, mode = db_path
 
-    for cycle in range(5):
-        with KVStore(path, journal_mode=mode) as db:
-            db[f"cycle{cycle}".encode()] = f"v{cycle}".encode()
-
-        # verify all previous cycles are still present
+    # Each session first checks what the earlier sessions wrote, then adds
+    # its own key; one extra session at the end checks the last write.
+    for cycle in range(6):
         with KVStore(path, journal_mode=mode) as db:
-            for prev in range(cycle + 1):
-                assert db.get(f"cycle{prev}".encode()) == f"v{prev}".encode()
+            assert db.mget([b"cycle%d" % p for p in range(cycle)]) == [
+                b"v%d" % p for p in range(cycle)
+            ]
+            if cycle < 5:
+                db[b"cycle%d" % cycle] = b"v%d" % cycle
 
 
 def test_durability_uncommitted_lost_on_close(db_path):
@@ -188,9 +191,7 @@ def test_durability_uncommitted_lost_on_close(db_path):
     path, mode = db_path
 
     with KVStore(path, journal_mode=mode) as db:
-        db[b"committed"] = b"safe"
-
-    with KVStore(path, journal_mode=mode) as db:
+        db[b"committed"] = b"safe"          # auto-committed
         db.begin(write=True)
         db[b"lost"] = b"never_committed"
         # close without commit
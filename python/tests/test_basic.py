@@ -106,6 +106,18 @@ def test_empty_value(db):
     assert db.get(b"empty") == b""
 
 
+def test_bytes_like_keys_and_values(db):
+    class B(bytes):
+        pass
+    db.put(bytearray(b"ba"), memoryview(b"mv"))
+    db[B(b"sub")] = bytearray(b"x")
+    assert db.get(memoryview(b"ba")) == b"mv"
+    assert db[bytearray(b"sub")] == b"x"
+    assert B(b"sub") in db
+    with pytest.raises(TypeError):
+        db.put(1, b"v")
+
+
 # ---------------------------------------------------------------------------
 # dict-like interface
 # ---------------------------------------------------------------------------
@@ -212,6 +224,37 @@ def test_iterator_manual_control(db):
     it.close()
 
 
+def test_iterator_fetch_many(db):
+    for i in range(10):
+        db.put(b"k%02d" % i, b"v%02d" % i)
+
+    with db.iterator() as it:
+        first = it.fetch_many(4)
+        rest = it.fetch_many(100)
+        assert it.fetch_many(4) == []
+    assert first == [(b"k%02d" % i, b"v%02d" % i) for i in range(4)]
+    assert [k for k, _ in rest] == [b"k%02d" % i for i in range(4, 10)]
+
+
+def test_iterator_fetch_many_mixed_with_next(db):
+    for k in (b"p:a", b"p:b", b"p:c", b"q:a"):
+        db.put(k, b"1")
+
+    with db.iterator(prefix=b"p:", reverse=True) as it:
+        assert next(it)[0] == b"p:c"
+        assert [k for k, _ in it.fetch_many(10)] == [b"p:b", b"p:a"]
+
+
+def test_iterator_fetch_many_large_batch(db):
+    # More rows and bytes than fetch_many's initial copy buffers hold.
+    pairs = [(b"big%03d" % i, bytes([i]) * (i * 100)) for i in range(200)]
+    db.write_batch(pairs)
+    with db.iterator() as it:
+        assert it.fetch_many(500) == pairs
+    it.close()
+    assert it.fetch_many(10) == []
+
+
 # ---------------------------------------------------------------------------
 # Column families
 # ---------------------------------------------------------------------------
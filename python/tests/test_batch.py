@@ -0,0 +1,209 @@
+"""
+Batch API tests — mirrors tests/test_batch.c.
+
+Covers KVStore/ColumnFamily.write_batch(): bulk insert, single WAL commit,
+all-or-nothing on error, joining an explicit transaction, empty batches,
+duplicate keys, CF isolation, str/bytes inputs, and persistence.
+Also covers mput() (per-item TTL), mget() (missing/expired -> None) and
+mdelete() (missing keys skipped, returns the number removed).
+
+Run with:
+    pytest python/tests/test_batch.py
+"""
+
+import time
+
+import pytest
+import snkv
+from snkv import KVStore
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "batch.db")
+    with KVStore(path) as store:
+        yield store
+
+
+def _pairs(n):
+    return [(b"key%04d" % i, b"val%04d" % i) for i in range(n)]
+
+
+# ===========================================================================
+# write_batch
+# ===========================================================================
+
+def test_write_batch_basic(db):
+    db.write_batch(_pairs(200))
+    assert db.count() == 200
+    assert db[b"key0000"] == b"val0000"
+    assert db[b"key0199"] == b"val0199"
+
+
+def test_write_batch_single_commit(db):
+    db.stats_reset()
+    db.write_batch(_pairs(100))
+    st = db.stats()
+    assert st["wal_commits"] == 1
+    assert st["puts"] == 100
+
+
+def test_write_batch_accepts_generator_and_str(db):
+    db.write_batch((f"k{i}", f"v{i}") for i in range(10))
+    db.write_batch([(bytearray(b"ba"), memoryview(b"mv"))])
+    assert db[b"k9"] == b"v9"
+    assert db[b"ba"] == b"mv"
+
+
+def test_write_batch_invalid_pair_rolls_back(db):
+    db[b"existing"] = b"v"
+    pairs = _pairs(10)
+    pairs[5] = (b"", b"bad")        # zero-length key is rejected by the store
+    with pytest.raises(snkv.Error):
+        db.write_batch(pairs)
+    assert db.count() == 1
+    assert b"key0000" not in db
+    db[b"after"] = b"v"             # store still writable
+
+
+@pytest.mark.parametrize("bad, exc", [
+    ([(b"k", 1)], TypeError),
+    ([(b"k",)], ValueError),
+    ([(b"a", b"b", b"c")], ValueError),
+    (42, TypeError),
+])
+def test_write_batch_bad_arguments(db, bad, exc):
+    with pytest.raises(exc):
+        db.write_batch(bad)
+    assert db.count() == 0
+
+
+def test_write_batch_joins_explicit_transaction(db):
+    db.begin(write=True)
+    db.write_batch(_pairs(20))
+    db.rollback()
+    assert db.count() == 0
+
+    db.begin(write=True)
+    db.write_batch(_pairs(20))
+    db.put(b"extra", b"v")
+    db.commit()
+    assert db.count() == 21
+
+
+def test_write_batch_empty(db):
+    db.stats_reset()
+    db.write_batch([])
+    assert db.stats()["wal_commits"] == 0
+
+
+def test_write_batch_duplicate_key_last_wins(db):
+    db.write_batch([(b"dup", b"first"), (b"other", b"x"), (b"dup", b"second")])
+    assert db[b"dup"] == b"second"
+    assert db.count() == 2
+
+
+def test_write_batch_cf_isolated(db):
+    with db.create_column_family("batchcf") as cf:
+        cf.write_batch(_pairs(50))
+        assert cf.count() == 50
+        assert cf[b"key0049"] == b"val0049"
+    assert db.count() == 0
+
+
+def test_write_batch_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "batch_reopen.db")
+    with KVStore(path) as db:
+        db.write_batch(_pairs(256))
+    with KVStore(path) as db:
+        assert db.count() == 256
+        assert db[b"key0128"] == b"val0128"
+
+
+# ===========================================================================
+# mput / mget
+# ===========================================================================
+
+def test_mput_mget_roundtrip(db):
+    db.mput(_pairs(50))
+    keys = [b"key%04d" % i for i in range(50)]
+    assert db.mget(keys) == [b"val%04d" % i for i in range(50)]
+
+
+def test_mget_missing_and_empty_value(db):
+    db.mput([(b"a", b"1"), (b"e", b"")])
+    assert db.mget([b"a", b"b", "e"]) == [b"1", None, b""]
+    assert db.mget([]) == []
+
+
+def test_mput_per_item_ttl(db):
+    db.stats_reset()
+    db.mput([(b"perm", b"p"), (b"long", b"l", 60), (b"short", b"s", 0.05),
+             (b"none", b"n", None)])
+    assert db.stats()["wal_commits"] == 1
+    assert db.ttl(b"perm") is None
+    assert db.ttl(b"none") is None
+    assert 0 < db.ttl(b"long") <= 60
+    time.sleep(0.1)
+    assert db.mget([b"perm", b"short", b"long"]) == [b"p", None, b"l"]
+
+
+def test_mput_without_ttl_clears_existing_ttl(db):
+    db.put(b"k", b"old", ttl=60)
+    db.mput([(b"k", b"new")])
+    assert db.ttl(b"k") is None
+    assert db[b"k"] == b"new"
+
+
+@pytest.mark.parametrize("bad, exc", [
+    ([(b"k",)], ValueError),
+    ([(b"a", b"b", 1, 2)], ValueError),
+    ([(b"k", 1)], TypeError),
+])
+def test_mput_bad_arguments(db, bad, exc):
+    with pytest.raises(exc):
+        db.mput(bad)
+    assert db.count() == 0
+
+
+def test_mget_bad_key_type(db):
+    with pytest.raises(TypeError):
+        db.mget([1])
+
+
+def test_mput_mget_cf_isolated(db):
+    with db.create_column_family("mcf") as cf:
+        cf.mput([(b"x", b"1"), (b"y", b"2", 60)])
+        assert cf.mget([b"x", b"y", b"z"]) == [b"1", b"2", None]
+    assert db.mget([b"x", b"y"]) == [None, None]
+
+
+# ===========================================================================
+# mdelete
+# ===========================================================================
+
+def test_mdelete_skips_missing_and_counts(db):
+    db.mput(_pairs(10) + [(b"ttl", b"t", 60)])
+    db.stats_reset()
+    assert db.mdelete([b"key0000", "key0005", b"missing", b"ttl"]) == 3
+    assert db.stats()["wal_commits"] == 1
+    assert db.count() == 8
+    assert db.mget([b"key0000", b"key0001", b"ttl"]) == [None, b"val0001", None]
+    assert db.mdelete([]) == 0
+
+
+def test_mdelete_joins_transaction_and_cf_isolated(db):
+    db.write_batch(_pairs(4))
+    db.begin(write=True)
+    assert db.mdelete(b"key%04d" % i for i in range(4)) == 4
+    db.rollback()
+    assert db.count() == 4
+    with db.create_column_family("dcf") as cf:
+        cf.write_batch(_pairs(2))
+        assert cf.mdelete([b"key0000", b"key0001", b"key0002"]) == 2
+        assert cf.count() == 0
+    assert db.count() == 4
@@ -28,40 +28,25 @@ def _wal_path(db_path: str) -> str:
 
 
 def _write_n(db: KVStore, n: int, prefix: str = "k") -> None:
-    db.begin(write=True)
-    for i in range(n):
-        db[f"{prefix}{i:06d}".encode()] = f"v{i}".encode()
-    db.commit()
+    p = prefix.encode()
+    db.write_batch([(b"%s%06d" % (p, i), b"v%d" % i) for i in range(n)])
 
 
 # ---------------------------------------------------------------------------
-# Passive checkpoint
+# Passive / full / restart checkpoint
 # ---------------------------------------------------------------------------
 
-def test_passive_checkpoint_returns_ok(tmp_path):
-    """PASSIVE checkpoint after writes must return non-negative nLog/nCkpt."""
-    path = str(tmp_path / "passive.db")
-    with KVStore(path, journal_mode=JOURNAL_WAL) as db:
-        _write_n(db, 50)
-        nlog, nckpt = db.checkpoint(CHECKPOINT_PASSIVE)
-        assert nlog  >= 0
-        assert nckpt >= 0
-
-
-def test_full_checkpoint(tmp_path):
-    path = str(tmp_path / "full.db")
-    with KVStore(path, journal_mode=JOURNAL_WAL) as db:
-        _write_n(db, 50)
-        nlog, nckpt = db.checkpoint(CHECKPOINT_FULL)
-        assert nlog  >= 0
-        assert nckpt >= 0
-
-
-def test_restart_checkpoint(tmp_path):
-    path = str(tmp_path / "restart.db")
+@pytest.mark.parametrize(
+    "mode",
+    [CHECKPOINT_PASSIVE, CHECKPOINT_FULL, CHECKPOINT_RESTART],
+    ids=["PASSIVE", "FULL", "RESTART"],
+)
+def test_checkpoint_returns_ok(tmp_path, mode):
+    """Checkpoint after writes must return non-negative nLog/nCkpt."""
+    path = str(tmp_path / "ckpt.db")
     with KVStore(path, journal_mode=JOURNAL_WAL) as db:
         _write_n(db, 50)
-        nlog, nckpt = db.checkpoint(CHECKPOINT_RESTART)
+        nlog, nckpt = db.checkpoint(mode)
         assert nlog  >= 0
         assert nckpt >= 0
 
@@ -157,8 +142,8 @@ def test_data_readable_after_checkpoint(tmp_path):
         _write_n(db, 100)
         db.checkpoint(CHECKPOINT_TRUNCATE)
 
-        for i in range(100):
-            assert db.get(f"k{i:06d}".encode()) == f"v{i}".encode()
+        with db.iterator() as it:
+            assert dict(it) == {b"k%06d" % i: b"v%d" % i for i in range(100)}
 
 
 def test_data_readable_after_reopen_post_checkpoint(tmp_path):
@@ -169,5 +154,6 @@ def test_data_readable_after_reopen_post_checkpoint(tmp_path):
         db.checkpoint(CHECKPOINT_TRUNCATE)
 
     with KVStore(path, journal_mode=JOURNAL_WAL) as db:
-        for i in range(50):
-            assert db.get(f"k{i:06d}".encode()) == f"v{i}".encode()
+        assert db.mget([b"k%06d" % i for i in range(50)]) == [
+            b"v%d" % i for i in range(50)
+        ]
@@ -219,13 +219,12 @@ def test_cf_data_persists_across_sessions(db_path):
     """Data written to a CF in session 1 must be readable in session 2."""
     with KVStore(db_path) as db:
         with db.create_column_family("users") as cf:
-            for i in range(50):
-                cf[f"user:{i}".encode()] = f"data{i}".encode()
+            cf.write_batch((b"user:%d" % i, b"data%d" % i) for i in range(50))
 
     with KVStore(db_path) as db:
         with db.open_column_family("users") as cf:
             for i in range(50):
-                assert cf.get(f"user:{i}".encode()) == f"data{i}".encode()
+                assert cf.get(b"user:%d" % i) == b"data%d" % i
 
 
 def test_cf_wal_mode(tmp_path):
@@ -7,6 +7,7 @@ reads alongside a single active writer, so readers always make progress.
 """
 
 import threading
+import time
 import pytest
 from snkv import KVStore, JOURNAL_WAL
 
@@ -23,7 +24,19 @@ BATCH           = 50       # records per transaction
 
 
 def _expected_value(writer_id: int, key_idx: int) -> bytes:
-    return f"writer{writer_id}_key{key_idx:06d}".encode()
+    return b"writer%d_key%06d" % (writer_id, key_idx)
+
+
+# Every writer's keys and expected values, built once at import and shared
+# read-only by all threads: _KEYS[wid][kid] / _EXPECTED[wid][kid].
+_KEYS = [
+    [b"w%02d_%06d" % (wid, kid) for kid in range(KEYS_PER_WRITER)]
+    for wid in range(NUM_WRITERS)
+]
+_EXPECTED = [
+    [_expected_value(wid, kid) for kid in range(KEYS_PER_WRITER)]
+    for wid in range(NUM_WRITERS)
+]
 
 
 # ---------------------------------------------------------------------------
@@ -31,31 +44,28 @@ def _expected_value(writer_id: int, key_idx: int) -> bytes:
 # ---------------------------------------------------------------------------
 
 def _writer(db_path: str, writer_id: int, errors: list, lock: threading.Lock) -> None:
-    """Write KEYS_PER_WRITER keys in auto-committed batches."""
+    """Write KEYS_PER_WRITER keys in batches of BATCH, one commit per batch."""
     try:
         with KVStore(db_path, journal_mode=JOURNAL_WAL, busy_timeout=15_000) as db:
             for batch_start in range(0, KEYS_PER_WRITER, BATCH):
-                db.begin(write=True)
-                for i in range(batch_start, min(batch_start + BATCH, KEYS_PER_WRITER)):
-                    db[f"w{writer_id:02d}_{i:06d}".encode()] = (
-                        _expected_value(writer_id, i)
-                    )
-                db.commit()
+                end = batch_start + BATCH
+                db.write_batch(zip(_KEYS[writer_id][batch_start:end],
+                                   _EXPECTED[writer_id][batch_start:end]))
     except Exception as exc:
         with lock:
             errors.append(f"writer {writer_id}: {exc}")
 
 
 def _reader(db_path: str, reader_id: int, errors: list, lock: threading.Lock) -> None:
-    """Scan all possible keys READER_ROUNDS times; flag any value corruption."""
+    """Read all possible keys READER_ROUNDS times, one mget() per writer's
+    key range; flag any value corruption."""
     try:
         with KVStore(db_path, journal_mode=JOURNAL_WAL, busy_timeout=15_000) as db:
             for _ in range(READER_ROUNDS):
                 for wid in range(NUM_WRITERS):
-                    for kid in range(KEYS_PER_WRITER):
-                        key = f"w{wid:02d}_{kid:06d}".encode()
-                        val = db.get(key)
-                        if val is not None and val != _expected_value(wid, kid):
+                    vals = db.mget(_KEYS[wid])
+                    for key, val, exp in zip(_KEYS[wid], vals, _EXPECTED[wid]):
+                        if val is not None and val != exp:
                             with lock:
                                 errors.append(
                                     f"reader {reader_id}: corrupt key={key!r}"
@@ -95,9 +105,7 @@ def test_concurrent_write_read(tmp_path):
 
     with KVStore(path, journal_mode=JOURNAL_WAL) as db:
         for wid in range(NUM_WRITERS):
-            for kid in range(KEYS_PER_WRITER):
-                key = f"w{wid:02d}_{kid:06d}".encode()
-                assert db[key] == _expected_value(wid, kid)
+            assert db.mget(_KEYS[wid]) == _EXPECTED[wid]
         db.integrity_check()
 
 
@@ -122,12 +130,10 @@ def test_concurrent_writes_only(tmp_path):
     assert not errors, "\n".join(errors)
 
     with KVStore(path, journal_mode=JOURNAL_WAL) as db:
-        total = sum(
-            1 for wid in range(NUM_WRITERS)
-            for kid in range(KEYS_PER_WRITER)
-            if db.exists(f"w{wid:02d}_{kid:06d}".encode())
-        )
-        assert total == NUM_WRITERS * KEYS_PER_WRITER
+        # count_prefix() steps a prefix cursor in C: one range scan per
+        # writer instead of a point lookup per key.
+        counts = [db.count_prefix(b"w%02d_" % wid) for wid in range(NUM_WRITERS)]
+        assert counts == [KEYS_PER_WRITER] * NUM_WRITERS
 
 
 def test_concurrent_integrity_after_writes(tmp_path):
@@ -152,3 +158,103 @@ def test_concurrent_integrity_after_writes(tmp_path):
 
     with KVStore(path, journal_mode=JOURNAL_WAL) as db:
         db.integrity_check()
+
+
+RL_LIMIT          = 100
+RL_CALLS_PER_CONN = 60     # NUM_WRITERS * 60 = 300 attempts for 100 slots
+
+
+def _rate_limited(db_path: str, allowed: list, errors: list, lock: threading.Lock) -> None:
+    """Hit one shared incr_with_ttl counter RL_CALLS_PER_CONN times."""
+    try:
+        with KVStore(db_path, journal_mode=JOURNAL_WAL, busy_timeout=15_000) as db:
+            n = sum(db.incr_with_ttl(b"rl:shared", RL_LIMIT, 60)
+                    for _ in range(RL_CALLS_PER_CONN))
+        with lock:
+            allowed.append(n)
+    except Exception as exc:
+        with lock:
+            errors.append(f"rate limiter: {exc}")
+
+
+def test_concurrent_incr_with_ttl_never_over_limit(tmp_path):
+    """incr_with_ttl is atomic across connections: exactly `limit` calls pass."""
+    path = str(tmp_path / "ratelimit.db")
+    with KVStore(path, journal_mode=JOURNAL_WAL):
+        pass
+
+    allowed: list = []
+    errors: list = []
+    lock = threading.Lock()
+
+    threads = [
+        threading.Thread(target=_rate_limited, args=(path, allowed, errors, lock))
+        for _ in range(NUM_WRITERS)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, "\n".join(errors)
+    assert sum(allowed) == RL_LIMIT
+
+    with KVStore(path, journal_mode=JOURNAL_WAL) as db:
+        assert db[b"rl:shared"] == str(RL_LIMIT).encode()
+
+
+def test_cf_close_refused_while_in_use(tmp_path):
+    """close() from another thread raises while a CF call runs without the GIL."""
+    path = str(tmp_path / "cfbusy.db")
+    with KVStore(path, journal_mode=JOURNAL_WAL, busy_timeout=15_000) as db, \
+         KVStore(path, journal_mode=JOURNAL_WAL) as blocker:
+        cf = db.create_column_family("busy")
+        blocker.begin(write=True)       # park cf.put() in the busy handler
+        blocker.put(b"hold", b"1")
+        errors: list = []
+
+        def _put():
+            try:
+                cf.put(b"k", b"v")
+            except Exception as exc:
+                errors.append(exc)
+
+        t = threading.Thread(target=_put)
+        t.start()
+        time.sleep(0.2)
+        with pytest.raises(RuntimeError):
+            cf.close()
+        blocker.commit()
+        t.join()
+        assert not errors
+        assert cf[b"k"] == b"v"
+        cf.close()
+
+
+def test_iterator_close_during_fetch_many(tmp_path):
+    """Closing an iterator mid fetch_many() is refused, never a crash."""
+    path = str(tmp_path / "itbusy.db")
+    n = 200_000
+    with KVStore(path, journal_mode=JOURNAL_WAL) as db:
+        db.write_batch((b"k%07d" % i, b"v" * 64) for i in range(n))
+        it = db.iterator()
+        result: list = []
+        t = threading.Thread(target=lambda: result.append(it.fetch_many(n)))
+        t.start()
+        refused = 0
+        while True:
+            try:
+                it.close()
+                break
+            except RuntimeError:
+                refused += 1
+        t.join()
+        # Either close() won the race before the scan began (empty batch),
+        # or it was refused until the whole batch had been copied out.
+        rows = result[0]
+        if refused:
+            assert len(rows) == n
+            assert rows[-1] == (b"k%07d" % (n - 1), b"v" * 64)
+        else:
+            assert rows == []
+        assert it.fetch_many(10) == []
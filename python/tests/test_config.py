@@ -239,6 +239,36 @@ def test_in_memory_store():
     # data is gone — nothing to assert about files
 
 
+def _open_file_fds():
+    """Map fd -> target for this process's file-backed descriptors (Linux)."""
+    fds = {}
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            target = os.readlink(f"/proc/self/fd/{fd}")
+        except OSError:
+            continue            # fd closed while listing (e.g. the dir itself)
+        if target.startswith("/"):
+            fds[fd] = target
+    return fds
+
+
+def test_in_memory_store_beyond_cache():
+    """An in-memory store keeps pages past cache_size without a temp file."""
+    check_fds = os.path.isdir("/proc/self/fd")
+    with KVStore(None, cache_size=10) as db:
+        before = _open_file_fds() if check_fds else {}
+        db.write_batch((b"k%05d" % i, b"v" * 200) for i in range(2000))
+        db.begin(write=True)
+        db[b"gone"] = b"x"
+        db.rollback()
+        assert db.count() == 2000
+        assert db.mget([b"k00000", b"k01999", b"gone"]) == [b"v" * 200] * 2 + [None]
+        if check_fds:
+            after = _open_file_fds()
+            new = {fd: t for fd, t in after.items() if before.get(fd) != t}
+            assert new == {}, f"in-memory store opened files: {new}"
+
+
 # ---------------------------------------------------------------------------
 # Backward compatibility (positional journal_mode)
 # ---------------------------------------------------------------------------
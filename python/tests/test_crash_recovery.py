@@ -33,14 +33,14 @@ def test_committed_survives(tmp_path, mode):
 
     with _open(path, mode) as db:
         db.begin(write=True)
-        for i in range(500):
-            db[f"ok{i:06d}".encode()] = f"val{i}".encode()
+        db.write_batch((b"ok%06d" % i, b"val%d" % i) for i in range(500))
         db.commit()
 
     with _open(path, mode) as db:
         db.integrity_check()
-        for i in range(500):
-            assert db.get(f"ok{i:06d}".encode()) == f"val{i}".encode()
+        assert db.mget([b"ok%06d" % i for i in range(500)]) == [
+            b"val%d" % i for i in range(500)
+        ]
 
 
 # ---------------------------------------------------------------------------
@@ -56,21 +56,21 @@ def test_uncommitted_rolled_back(tmp_path, mode):
     with _open(path, mode) as db:
         db.begin(write=True)
         for i in range(200):
-            db[f"batch1_{i:06d}".encode()] = f"v{i}".encode()
+            db[b"batch1_%06d" % i] = b"v%d" % i
         db.commit()
 
     # batch2 — no commit (simulated crash)
     with _open(path, mode) as db:
         db.begin(write=True)
         for i in range(300):
-            db[f"batch2_{i:06d}".encode()] = f"x{i}".encode()
+            db[b"batch2_%06d" % i] = b"x%d" % i
         # intentionally NOT calling commit
 
     with _open(path, mode) as db:
         for i in range(200):
-            assert db.get(f"batch1_{i:06d}".encode()) == f"v{i}".encode()
+            assert db.get(b"batch1_%06d" % i) == b"v%d" % i
         for i in range(300):
-            assert db.get(f"batch2_{i:06d}".encode()) is None
+            assert db.get(b"batch2_%06d" % i) is None
 
 
 # ---------------------------------------------------------------------------
@@ -85,18 +85,18 @@ def test_explicit_rollback(tmp_path, mode):
     with _open(path, mode) as db:
         db.begin(write=True)
         for i in range(100):
-            db[f"keep{i:05d}".encode()] = f"kv{i}".encode()
+            db[b"keep%05d" % i] = b"kv%d" % i
         db.commit()
 
         db.begin(write=True)
         for i in range(200):
-            db[f"discard{i:05d}".encode()] = f"dv{i}".encode()
+            db[b"discard%05d" % i] = b"dv%d" % i
         db.rollback()
 
         for i in range(100):
-            assert db.get(f"keep{i:05d}".encode()) == f"kv{i}".encode()
+            assert db.get(b"keep%05d" % i) == b"kv%d" % i
         for i in range(200):
-            assert db.get(f"discard{i:05d}".encode()) is None
+            assert db.get(b"discard%05d" % i) is None
 
 
 # ---------------------------------------------------------------------------
@@ -113,29 +113,29 @@ def test_multiple_crash_cycles_wal(tmp_path):
             # verify previous cycles
             for prev in range(cycle):
                 for i in range(100):
-                    key = f"c{prev}_{i:04d}".encode()
-                    assert db.get(key) == f"v{prev}_{i}".encode(), \
+                    key = b"c%d_%04d" % (prev, i)
+                    assert db.get(key) == b"v%d_%d" % (prev, i), \
                         f"missing from cycle {prev}: {key}"
 
             # commit this cycle's batch
             db.begin(write=True)
             for i in range(100):
-                db[f"c{cycle}_{i:04d}".encode()] = f"v{cycle}_{i}".encode()
+                db[b"c%d_%04d" % (cycle, i)] = b"v%d_%d" % (cycle, i)
             db.commit()
 
             # start uncommitted batch (simulate crash)
             db.begin(write=True)
             for i in range(50):
-                db[f"ghost{cycle}_{i:04d}".encode()] = b"lost"
+                db[b"ghost%d_%04d" % (cycle, i)] = b"lost"
             # no commit
 
     with _open(path, JOURNAL_WAL) as db:
         for cycle in range(5):
             for i in range(100):
-                assert db.get(f"c{cycle}_{i:04d}".encode()) == \
-                    f"v{cycle}_{i}".encode()
+                assert db.get(b"c%d_%04d" % (cycle, i)) == \
+                    b"v%d_%d" % (cycle, i)
             for i in range(50):
-                assert db.get(f"ghost{cycle}_{i:04d}".encode()) is None
+                assert db.get(b"ghost%d_%04d" % (cycle, i)) is None
 
 
 # ---------------------------------------------------------------------------
@@ -146,24 +146,23 @@ def test_multiple_crash_cycles_wal(tmp_path):
 def test_large_txn_recovery(tmp_path, mode):
     """5 000 'ok' keys (committed) must survive; 5 000 'lost' keys (no commit) absent."""
     path = str(tmp_path / f"large_{mode}.db")
+    ok_keys   = [b"large_ok_%07d" % i for i in range(5_000)]
+    ok_vals   = [b"vok%d" % i for i in range(5_000)]
+    lost_keys = [b"large_lost_%07d" % i for i in range(5_000)]
 
     with _open(path, mode) as db:
         db.begin(write=True)
-        for i in range(5_000):
-            db[f"large_ok_{i:07d}".encode()] = f"vok{i}".encode()
+        db.write_batch(zip(ok_keys, ok_vals))
         db.commit()
 
     with _open(path, mode) as db:
         db.begin(write=True)
-        for i in range(5_000):
-            db[f"large_lost_{i:07d}".encode()] = f"vx{i}".encode()
+        db.write_batch((k, b"vx%d" % i) for i, k in enumerate(lost_keys))
         # no commit
 
     with _open(path, mode) as db:
-        for i in range(5_000):
-            assert db.get(f"large_ok_{i:07d}".encode()) == f"vok{i}".encode()
-        for i in range(5_000):
-            assert db.get(f"large_lost_{i:07d}".encode()) is None
+        assert db.mget(ok_keys) == ok_vals
+        assert db.mget(lost_keys) == [None] * len(lost_keys)
 
 
 # ---------------------------------------------------------------------------
@@ -177,24 +176,24 @@ def test_overwrite_recovery(tmp_path):
     with _open(path, JOURNAL_WAL) as db:
         db.begin(write=True)
         for i in range(200):
-            db[f"ov{i:05d}".encode()] = f"v1_{i}".encode()
+            db[b"ov%05d" % i] = b"v1_%d" % i
         db.commit()
 
     with _open(path, JOURNAL_WAL) as db:
         db.begin(write=True)
         for i in range(200):
-            db[f"ov{i:05d}".encode()] = f"v2_{i}".encode()
+            db[b"ov%05d" % i] = b"v2_%d" % i
         db.commit()
 
     with _open(path, JOURNAL_WAL) as db:
         db.begin(write=True)
         for i in range(200):
-            db[f"ov{i:05d}".encode()] = f"v3_{i}".encode()
+            db[b"ov%05d" % i] = b"v3_%d" % i
         # no commit
 
     with _open(path, JOURNAL_WAL) as db:
         for i in range(200):
-            assert db.get(f"ov{i:05d}".encode()) == f"v2_{i}".encode()
+            assert db.get(b"ov%05d" % i) == b"v2_%d" % i
 
 
 # ---------------------------------------------------------------------------
@@ -209,31 +208,31 @@ def test_delete_recovery(tmp_path):
     with _open(path, JOURNAL_WAL) as db:
         db.begin(write=True)
         for i in range(300):
-            db[f"dr{i:05d}".encode()] = f"val{i}".encode()
+            db[b"dr%05d" % i] = b"val%d" % i
         db.commit()
 
     with _open(path, JOURNAL_WAL) as db:
         # commit deletes of 0-99
         db.begin(write=True)
         for i in range(100):
-            db.delete(f"dr{i:05d}".encode())
+            db.delete(b"dr%05d" % i)
         db.commit()
 
         # uncommitted deletes of 100-199
         db.begin(write=True)
         for i in range(100, 200):
-            db.delete(f"dr{i:05d}".encode())
+            db.delete(b"dr%05d" % i)
         # no commit
 
     with _open(path, JOURNAL_WAL) as db:
         # 0-99: committed deletion → must be gone
         for i in range(100):
-            assert db.get(f"dr{i:05d}".encode()) is None
+            assert db.get(b"dr%05d" % i) is None
 
         # 100-199: uncommitted deletion → must be restored
         for i in range(100, 200):
-            assert db.get(f"dr{i:05d}".encode()) == f"val{i}".encode()
+            assert db.get(b"dr%05d" % i) == b"val%d" % i
 
         # 200-299: untouched → must be present
         for i in range(200, 300):
-            assert db.get(f"dr{i:05d}".encode()) == f"val{i}".encode()
+            assert db.get(b"dr%05d" % i) == b"val%d" % i
@@ -426,6 +426,16 @@ def test_stats_db_pages(db):
     assert st["db_pages"] > 0
 
 
+def test_stats_free_pages(db):
+    """free_pages counts freelist pages; vacuum() drains them."""
+    db.write_batch((b"k%05d" % i, b"x" * 200) for i in range(2000))
+    assert db.stats()["free_pages"] == 0
+    db.clear()
+    assert db.stats()["free_pages"] > 0
+    db.vacuum()
+    assert db.stats()["free_pages"] == 0
+
+
 def test_stats_reset(db):
     """stats_reset() zeros cumulative counters; db_pages remains > 0."""
     db.put(b"k", b"v")
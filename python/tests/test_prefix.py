@@ -6,6 +6,8 @@ prefixes, exact-key-as-prefix, CF prefix isolation, binary keys,
 large-scale prefix, post-mutation iteration, and iterator re-seek.
 """
 
+import time
+
 import pytest
 from snkv import KVStore, JOURNAL_WAL
 
@@ -296,3 +298,39 @@ def test_prefix_iterator_reseek_with_first(db):
     it.close()
     assert first_pass == second_pass
     assert len(first_pass) == 3
+
+
+# ---------------------------------------------------------------------------
+# count_prefix
+# ---------------------------------------------------------------------------
+
+def test_count_prefix_matches_iterator(db):
+    """count_prefix returns the same number of keys as a prefix scan."""
+    for i in range(50):
+        db[b"user:%03d" % i] = b"u"
+    for i in range(20):
+        db[b"sess:%03d" % i] = b"s"
+
+    assert db.count_prefix(b"user:") == 50
+    assert db.count_prefix("sess:") == 20
+    assert db.count_prefix(b"nope:") == 0
+    assert db.count_prefix(b"user:") == len(list(db.prefix_iterator(b"user:")))
+
+
+def test_count_prefix_cf_isolated(db):
+    """CF count_prefix only sees keys in that column family."""
+    db[b"tag:default"] = b"v"
+    with db.create_column_family("ns") as cf:
+        for k in (b"tag:a", b"tag:b", b"tag:c"):
+            cf[k] = b"v"
+        cf.delete(b"tag:b")
+        assert cf.count_prefix(b"tag:") == 2
+    assert db.count_prefix(b"tag:") == 1
+
+
+def test_count_prefix_skips_expired(db):
+    """Expired keys are not counted."""
+    db.put(b"ttl:live", b"v")
+    db.put(b"ttl:dead", b"v", ttl=0.001)
+    time.sleep(0.01)
+    assert db.count_prefix(b"ttl:") == 1
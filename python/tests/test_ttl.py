@@ -144,6 +144,44 @@ def test_ttl_returns_float_seconds(db):
     assert remaining < 10
 
 
+def test_ttl_large_int_and_fractional_float(db):
+    """Integer TTLs stay exact at large magnitudes; float TTLs round to whole ms."""
+    db.put(b"big", b"v", ttl=10**9)
+    assert 10**9 - 1 < db.ttl(b"big") <= 10**9
+    db.put(b"frac", b"v", ttl=2.5)
+    assert 2.4 < db.ttl(b"frac") <= 2.5
+
+
+def test_put_ttl_rel_binding(db):
+    """put_ttl_rel() takes a relative TTL in ms; <= 0 stores an expired key."""
+    db._db.put_ttl_rel(b"rel", b"v", 5000)
+    assert 4.9 < db.ttl(b"rel") <= 5.0
+    with db.create_column_family("relcf") as cf:
+        cf._cf.put_ttl_rel(b"gone", b"v", -1)
+        assert cf.get(b"gone") is None
+        cf._cf.put_ttl_rel(b"far", b"v", 2**63 - 1)   # saturates, no overflow
+        assert cf.get(b"far") == b"v"
+        assert cf.ttl(b"far") > 10**15
+    db._db.put_ttl_rel(b"past", b"v", -(2**63))
+    assert db.get(b"past") is None
+
+
+def test_get_checked_binding(db):
+    """get_checked() returns bare value bytes and raises for expired keys."""
+    db.put(b"plain", b"p")
+    db.put(b"live", b"l", ttl=60)
+    db._db.put_ttl_rel(b"gone", b"g", -1)
+    assert db._db.get_checked(b"plain") == b"p"
+    assert db._db.get_checked(b"live") == b"l"
+    with pytest.raises(NotFoundError):
+        db._db.get_checked(b"gone")
+    with db.create_column_family("chkcf") as cf:
+        cf[b"k"] = b"v"
+        assert cf._cf.get_checked(b"k") == b"v"
+        with pytest.raises(NotFoundError):
+            cf._cf.get_checked(b"missing")
+
+
 # ---------------------------------------------------------------------------
 # purge_expired()
 # ---------------------------------------------------------------------------
@@ -323,3 +361,148 @@ def test_cf_dict_style_ttl_expiry(db):
 
         with pytest.raises((NotFoundError, KeyError)):
             _ = cf[b"user:42"]
+
+
+# ---------------------------------------------------------------------------
+# incr_with_ttl()  — fixed-window counter
+# ---------------------------------------------------------------------------
+
+def test_incr_with_ttl_limit_and_window(db):
+    """Counter allows `limit` calls per window, then resets after expiry."""
+    results = [db.incr_with_ttl(b"rl:alice", 3, 0.3) for _ in range(5)]
+    assert results == [True, True, True, False, False]
+    assert db[b"rl:alice"] == b"3"
+    assert 0 < db.ttl(b"rl:alice") <= 0.3
+
+    time.sleep(0.35)
+    assert db.incr_with_ttl(b"rl:alice", 3, 0.3) is True
+    assert db[b"rl:alice"] == b"1"
+
+
+def test_incr_with_ttl_errors(db):
+    db[b"txt"] = b"abc"
+    with pytest.raises(snkv.Error):
+        db.incr_with_ttl(b"txt", 10, 1)
+    with pytest.raises(ValueError):
+        db.incr_with_ttl(b"k", 10, 0)
+    with pytest.raises(ValueError):
+        db.incr_with_ttl(b"k", 10, -1)
+
+
+def test_incr_with_ttl_window_rounds_like_put(db):
+    """window is rounded to whole ms like put(..., ttl=...), not truncated."""
+    assert db.incr_with_ttl(b"w", 10, 0.0006) is True     # rounds up to 1 ms
+    with pytest.raises(ValueError):
+        db.incr_with_ttl(b"w", 10, 0.0004)                 # rounds down to 0
+
+
+def test_cf_incr_with_ttl(db):
+    with db.create_column_family("rl") as cf:
+        assert cf.incr_with_ttl("bob", 1, 60) is True
+        assert cf.incr_with_ttl("bob", 1, 60) is False
+        assert cf[b"bob"] == b"1"
+    assert db.get(b"bob") is None
+
+
+def test_purge_expired_nothing_due_no_commit(db):
+    """purge_expired() with no due keys does not open a write transaction."""
+    for i in range(10):
+        db.put(b"f%d" % i, b"v", ttl=60)
+    db.stats_reset()
+    assert db.purge_expired() == 0
+    assert db.stats()["wal_commits"] == 0
+
+
+# ---------------------------------------------------------------------------
+# wait_expiry
+# ---------------------------------------------------------------------------
+
+def test_wait_expiry_returns_at_deadline(db):
+    db.put(b"k", b"v", ttl=0.05)
+    t0 = time.monotonic()
+    assert db.wait_expiry(b"k") is True
+    assert 0.04 <= time.monotonic() - t0 < 1.0
+    assert db.get(b"k") is None
+
+
+def test_wait_expiry_missing_and_permanent(db):
+    assert db.wait_expiry(b"nope") is True
+    db.put(b"perm", b"v")
+    assert db.wait_expiry(b"perm", timeout=5) is False
+
+
+def test_wait_expiry_timeout(db):
+    db.put(b"k", b"v", ttl=60)
+    assert db.wait_expiry(b"k", timeout=0.02) is False
+    assert db.get(b"k") == b"v"
+
+
+def test_wait_expiry_cf(db):
+    with db.create_column_family("wcf") as cf:
+        cf.put(b"k", b"v", ttl=0.02)
+        assert cf.wait_expiry(b"k", timeout=5) is True
+        assert cf.get(b"k") is None
+
+
+# ---------------------------------------------------------------------------
+# get_with_ttl
+# ---------------------------------------------------------------------------
+
+def test_get_with_ttl(db):
+    db.put(b"t", b"v", ttl=60)
+    db.put(b"p", b"perm")
+    value, remaining = db.get_with_ttl(b"t")
+    assert value == b"v" and 59 < remaining <= 60
+    assert db.get_with_ttl(b"p") == (b"perm", None)
+    assert db.get_with_ttl(b"missing") == (None, None)
+
+
+def test_get_with_ttl_expired_and_cf(db):
+    with db.create_column_family("gwt") as cf:
+        cf.put(b"k", b"v", ttl=0.01)
+        time.sleep(0.02)
+        assert cf.get_with_ttl(b"k") == (None, None)
+        cf.put(b"k", b"v2", ttl=30)
+        value, remaining = cf.get_with_ttl(b"k")
+        assert value == b"v2" and 0 < remaining <= 30
+
+
+# ---------------------------------------------------------------------------
+# reclaim_ratio — vacuum after purge_expired()
+# ---------------------------------------------------------------------------
+
+def _fill_short_ttl(cf, n=3000):
+    cf.mput((b"k%05d" % i, b"x" * 200, 0.01) for i in range(n))
+    time.sleep(0.02)
+
+
+def test_cf_reclaim_ratio_vacuums_after_purge(db):
+    with db.create_column_family("rl", reclaim_ratio=0.2) as cf:
+        _fill_short_ttl(cf)
+        pages_before = db.stats()["db_pages"]
+        assert cf.purge_expired() == 3000
+    st = db.stats()
+    assert st["free_pages"] == 0
+    assert st["db_pages"] < pages_before
+
+
+def test_cf_without_reclaim_ratio_keeps_free_pages(db):
+    with db.create_column_family("rl") as cf:
+        _fill_short_ttl(cf)
+        assert cf.purge_expired() == 3000
+    assert db.stats()["free_pages"] > 0
+
+
+def test_cf_reclaim_ratio_below_threshold(db):
+    db.write_batch((b"perm%05d" % i, b"y" * 200) for i in range(3000))
+    with db.create_column_family("rl", reclaim_ratio=0.9) as cf:
+        _fill_short_ttl(cf, 300)
+        assert cf.purge_expired() == 300
+    assert db.stats()["free_pages"] > 0
+
+
+@pytest.mark.parametrize("ratio", [0, -0.1, 1.5])
+def test_reclaim_ratio_validation(db, ratio):
+    with pytest.raises(ValueError):
+        db.create_column_family("bad", reclaim_ratio=ratio)
+    assert "bad" not in db.list_column_families()
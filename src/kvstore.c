@@ -1002,6 +1002,13 @@ int kvstore_open_v2(
     ? (SQLITE_OPEN_READONLY  | SQLITE_OPEN_MAIN_DB)
     : (SQLITE_OPEN_READWRITE | SQLITE_OPEN_CREATE | SQLITE_OPEN_MAIN_DB);
 
+  /* A NULL or empty filename would otherwise open an anonymous temp-file
+  ** database (SQLITE_TEMP_STORE defaults to file-backed).  Request a pure
+  ** in-memory pager instead so nothing ever spills to disk. */
+  if( !zFilename || !zFilename[0] ){
+    vfsFlags |= SQLITE_OPEN_MEMORY;
+  }
+
   /* sqlite3BtreeOpen's pager scans one byte past the filename's null
   ** terminator looking for URI key=value params (SQLite internal double-null
   ** convention).  For real file paths, provide a copy with an extra trailing
@@ -1741,6 +1748,84 @@ static int kvstoreRawBtreeGetPlain(
   return rc;
 }
 
+/*
+** Expiry-index key helpers.  Expiry CF keys are [8-byte BE expireMs][user_key];
+** keys that fit in KVSTORE_EXPKEY_STACK bytes are assembled on the stack so
+** the TTL put/delete/expire paths do not malloc for typical short keys.
+** The caller MUST hold pKV->pMutex and be in a write transaction.
+*/
+#define KVSTORE_EXPKEY_STACK 128
+
+static unsigned char *kvstoreExpKeyBuild(
+  unsigned char *aStack,
+  const void *pExp, const void *pKey, int nKey
+){
+  unsigned char *p = aStack;
+  if( 8 + nKey > KVSTORE_EXPKEY_STACK ){
+    p = (unsigned char*)sqlite3Malloc(8 + nKey);
+    if( !p ) return NULL;
+  }
+  memcpy(p, pExp, 8);
+  memcpy(p + 8, pKey, nKey);
+  return p;
+}
+
+static int kvstoreExpKeyPut(
+  KVStore *pKV, int iTable,
+  const void *pExp, const void *pKey, int nKey
+){
+  unsigned char aStack[KVSTORE_EXPKEY_STACK];
+  unsigned char *pExpKey = kvstoreExpKeyBuild(aStack, pExp, pKey, nKey);
+  if( !pExpKey ) return KVSTORE_NOMEM;
+  int rc = kvstoreRawBtreePutPlain(pKV, iTable, pExpKey, 8 + nKey, NULL, 0);
+  if( pExpKey != aStack ) sqlite3_free(pExpKey);
+  return rc;
+}
+
+static void kvstoreExpKeyDelete(
+  KVStore *pKV, int iTable,
+  const void *pExp, const void *pKey, int nKey
+){
+  unsigned char aStack[KVSTORE_EXPKEY_STACK];
+  unsigned char *pExpKey = kvstoreExpKeyBuild(aStack, pExp, pKey, nKey);
+  if( pExpKey ){
+    kvstoreRawBtreeDelete(pKV, iTable, pExpKey, 8 + nKey);
+    if( pExpKey != aStack ) sqlite3_free(pExpKey);
+  }
+}
+
+/*
+** Remove pKey's entry from the TTL key index iTable, copying its 8-byte
+** expiry into aExp.  Sets *pFound to 1 only when an entry was removed.
+** One cursor seek and no heap copy of the value, so a plain put on a
+** TTL-enabled CF pays a single probe when the key has no TTL.
+** The caller MUST hold pKV->pMutex and be in a write transaction.
+*/
+static int kvstoreTtlKeyTake(
+  KVStore *pKV, int iTable,
+  const void *pKey, int nKey,
+  unsigned char aExp[8], int *pFound
+){
+  *pFound = 0;
+  BtCursor *pCur = kvstoreAllocCursor();
+  if( !pCur ) return SQLITE_NOMEM;
+
+  int rc = sqlite3BtreeCursor(pKV->pBt, iTable, 1, pKV->pKeyInfo, pCur);
+  if( rc != SQLITE_OK ){ kvstoreFreeCursor(pCur); return rc; }
+
+  int found = 0;
+  rc = kvstoreSeekKey(pCur, pKV->pKeyInfo, pKey, nKey, &found);
+  if( rc == SQLITE_OK && found
+   && sqlite3BtreePayloadSize(pCur) == (u32)(4 + nKey + 8) ){
+    rc = sqlite3BtreePayload(pCur, 4 + nKey, 8, aExp);
+    if( rc == SQLITE_OK ) rc = sqlite3BtreeDelete(pCur, 0);
+    if( rc == SQLITE_OK ) *pFound = 1;
+  }
+
+  kvstoreFreeCursor(pCur);
+  return rc;
+}
+
 /* ======================================================================
 ** Internal CF open: open an existing CF by name without public-API
 ** restrictions (accepts names starting with "__").
@@ -2721,21 +2806,13 @@ static int kvstore_cf_put_internal(
   ** put_ttl on the same key cannot cause a future expiry on the new value.
   */
   if( rc == SQLITE_OK && pCF->hasTtl && pCF->nTtlActive > 0 && pCF->pTtlKeyCF ){
-    void *pOldTtl = NULL; int nOldTtl = 0;
-    int rck = kvstoreRawBtreeGetPlain(pKV, pCF->pTtlKeyCF->iTable,
-                                  pKey, nKey, &pOldTtl, &nOldTtl);
-    if( rck == SQLITE_OK && nOldTtl == 8 ){
-      unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-      if( pExpKey ){
-        memcpy(pExpKey, pOldTtl, 8);
-        memcpy(pExpKey + 8, pKey, nKey);
-        kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-        sqlite3_free(pExpKey);
-      }
-      kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
+    unsigned char aOldTtl[8];
+    int hadTtl = 0;
+    kvstoreTtlKeyTake(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey, aOldTtl, &hadTtl);
+    if( hadTtl ){
+      kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, aOldTtl, pKey, nKey);
       if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
     }
-    if( pOldTtl ) sqlite3_free(pOldTtl);
   }
 
   if( rc == SQLITE_OK ){
@@ -2861,13 +2938,7 @@ static int kvstore_cf_get_internal(
           kvstoreRawBtreeDelete(pKV, pCF->iTable, pKey, nKey);
           kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
           unsigned char expBuf[8]; kvstoreEncodeBE64(expBuf, expireMs);
-          unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-          if( pExpKey ){
-            memcpy(pExpKey, expBuf, 8);
-            memcpy(pExpKey + 8, pKey, nKey);
-            kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-            sqlite3_free(pExpKey);
-          }
+          kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pKey, nKey);
           if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
           pKV->stats.nTtlExpired++;
           sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0;
@@ -3041,13 +3112,7 @@ static int kvstore_cf_delete_internal(
 
   /* TTL cleanup — runs only when the data delete succeeded. */
   if( rc == SQLITE_OK && pOldTtl && nOldTtl == 8 ){
-    unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-    if( pExpKey ){
-      memcpy(pExpKey, pOldTtl, 8);
-      memcpy(pExpKey + 8, pKey, nKey);
-      kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-      sqlite3_free(pExpKey);
-    }
+    kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, pOldTtl, pKey, nKey);
     kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
     if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
   }
@@ -3171,13 +3236,7 @@ static int kvstore_cf_exists_internal(
           kvstoreRawBtreeDelete(pKV, pCF->iTable, pKey, nKey);
           kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
           unsigned char expBuf[8]; kvstoreEncodeBE64(expBuf, expireMs);
-          unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-          if( pExpKey ){
-            memcpy(pExpKey, expBuf, 8);
-            memcpy(pExpKey + 8, pKey, nKey);
-            kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-            sqlite3_free(pExpKey);
-          }
+          kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pKey, nKey);
           if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
           pKV->stats.nTtlExpired++;
           sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0;
@@ -3567,13 +3626,7 @@ static int kvstoreIterSkipExpired(KVIterator *pIter){
       kvstoreRawBtreeDelete(pKV, pCF->iTable, pDeletedKey, nDeletedKey);
       kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pDeletedKey, nDeletedKey);
       unsigned char expBuf[8]; kvstoreEncodeBE64(expBuf, expireMs);
-      unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nDeletedKey);
-      if( pExpKey ){
-        memcpy(pExpKey, expBuf, 8);
-        memcpy(pExpKey + 8, pDeletedKey, nDeletedKey);
-        kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nDeletedKey);
-        sqlite3_free(pExpKey);
-      }
+      kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pDeletedKey, nDeletedKey);
       if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
       sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0;
       kvstoreAutoCheckpoint(pKV);
@@ -3683,13 +3736,7 @@ static int kvstoreIterSkipExpiredReverse(KVIterator *pIter){
       kvstoreRawBtreeDelete(pKV, pCF->iTable, pDeletedKey, nDeletedKey);
       kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pDeletedKey, nDeletedKey);
       unsigned char expBuf[8]; kvstoreEncodeBE64(expBuf, expireMs);
-      unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nDeletedKey);
-      if( pExpKey ){
-        memcpy(pExpKey, expBuf, 8);
-        memcpy(pExpKey + 8, pDeletedKey, nDeletedKey);
-        kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nDeletedKey);
-        sqlite3_free(pExpKey);
-      }
+      kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pDeletedKey, nDeletedKey);
       if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
       sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0;
       kvstoreAutoCheckpoint(pKV);
@@ -4193,6 +4240,20 @@ int kvstore_stats(KVStore *pKV, KVStoreStats *pStats){
   /* sqlite3BtreeLastPage returns the number of pages in the database file. */
   pStats->nDbPages    = (uint64_t)sqlite3BtreeLastPage(pKV->pBt);
 
+  /* The freelist count lives in the header of page 1, which is only
+  ** readable inside a transaction.  Best effort: 0 if one can't be opened. */
+  pStats->nFreePages = 0;
+  {
+    u32 nFree = 0;
+    if( pKV->inTrans ){
+      sqlite3BtreeGetMeta(pKV->pBt, BTREE_FREE_PAGE_COUNT, &nFree);
+    }else if( sqlite3BtreeBeginTrans(pKV->pBt, 0, 0) == SQLITE_OK ){
+      sqlite3BtreeGetMeta(pKV->pBt, BTREE_FREE_PAGE_COUNT, &nFree);
+      sqlite3BtreeCommit(pKV->pBt);
+    }
+    pStats->nFreePages = (uint64_t)nFree;
+  }
+
   KV_LEAVE(pKV);
 
   return KVSTORE_OK;
@@ -4980,6 +5041,11 @@ int kvstore_cf_drop(KVStore *pKV, const char *zName){
 **
 ** The expiry CF's sort order (8-byte BE expire_ms prefix) lets
 ** kvstore_cf_purge_expired stop at the first unexpired entry — O(expired).
+**
+** expire_ms is absolute wall-clock time, not an offset from some epoch
+** captured at open: entries must stay valid across close/reopen and when
+** several processes share the file.  The 8-byte prefix is also small next
+** to the user key and per-cell B-tree overhead it sits beside.
 ** ====================================================================== */
 
 /*
@@ -5050,13 +5116,7 @@ int kvstore_cf_put_ttl(
     kvstoreRawBtreeGetPlain(pKV, pCF->pTtlKeyCF->iTable,
                        pKey, nKey, &pOldTtl, &nOldTtl);
     if( pOldTtl && nOldTtl == 8 ){
-      unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-      if( pExpKey ){
-        memcpy(pExpKey, pOldTtl, 8);
-        memcpy(pExpKey + 8, pKey, nKey);
-        kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-        sqlite3_free(pExpKey);
-      }
+      kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, pOldTtl, pKey, nKey);
     }
     int hadOldTtl = (pOldTtl != NULL && nOldTtl == 8);
     if( pOldTtl ) sqlite3_free(pOldTtl);
@@ -5076,17 +5136,7 @@ int kvstore_cf_put_ttl(
       rc = kvstoreRawBtreePutPlain(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey, ttlBuf, 8);
       if( rc == SQLITE_OK ){
         /* Write new expiry CF entry: key=[8-byte expireMs][user_key], value=empty. */
-        int nExpKey = 8 + nKey;
-        unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(nExpKey);
-        if( !pExpKey ){
-          rc = KVSTORE_NOMEM;
-        } else {
-          memcpy(pExpKey, ttlBuf, 8);
-          memcpy(pExpKey + 8, pKey, nKey);
-          rc = kvstoreRawBtreePutPlain(pKV, pCF->pTtlExpiryCF->iTable,
-                                  pExpKey, nExpKey, NULL, 0);
-          sqlite3_free(pExpKey);
-        }
+        rc = kvstoreExpKeyPut(pKV, pCF->pTtlExpiryCF->iTable, ttlBuf, pKey, nKey);
       }
     }
     /* expire_ms == 0: TTL entries already cleared above — nothing more needed. */
@@ -5186,13 +5236,7 @@ int kvstore_cf_get_ttl(
           kvstoreRawBtreeDelete(pKV, pCF->iTable, pKey, nKey);
           kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
           unsigned char expBuf[8]; kvstoreEncodeBE64(expBuf, expireMs);
-          unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-          if( pExpKey ){
-            memcpy(pExpKey, expBuf, 8);
-            memcpy(pExpKey + 8, pKey, nKey);
-            kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable, pExpKey, 8 + nKey);
-            sqlite3_free(pExpKey);
-          }
+          kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pKey, nKey);
           sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0;
           kvstoreAutoCheckpoint(pKV);
           if( sqlite3BtreeBeginTrans(pKV->pBt, 0, 0) == SQLITE_OK ) pKV->inTrans = 1;
@@ -5274,6 +5318,8 @@ int kvstore_ttl_remaining(
 ** kvstore_cf_purge_expired — scan the expiry index CF and delete all
 ** expired entries.  Uses the 8-byte BE expire_ms prefix sort order to
 ** stop at the first unexpired entry — O(expired keys), not O(all TTL keys).
+** When the earliest entry is not yet due the call returns after a single
+** read — no write lock, no commit.
 ** *pnDeleted (may be NULL) — set to number of data keys deleted.
 */
 /*
@@ -5282,6 +5328,45 @@ int kvstore_ttl_remaining(
 */
 #define KVSTORE_PURGE_BATCH 256
 
+/*
+** kvstoreTtlFirstExpiry — read the earliest expire_ms in pCF's expiry index.
+** The index is sorted by that 8-byte BE prefix, so this is the first entry.
+** *pHas is 0 if the index is empty.  A malformed first entry reports
+** expire_ms 0 (i.e. due) so the caller falls through to the full purge.
+** Caller holds pCF->pMutex + pKV->pMutex; opens a read transaction if none.
+*/
+static int kvstoreTtlFirstExpiry(
+  KVColumnFamily *pCF,
+  int64_t *pExpireMs,
+  int *pHas
+){
+  KVStore *pKV = pCF->pKV;
+  BtCursor *pCur;
+  int rc, res = 0;
+  *pHas = 0;
+  *pExpireMs = 0;
+  if( !pKV->inTrans ){
+    rc = sqlite3BtreeBeginTrans(pKV->pBt, 0, 0);
+    if( rc != SQLITE_OK ) return rc;
+    pKV->inTrans = 1;
+  }
+  pCur = kvstoreAllocCursor();
+  if( !pCur ) return SQLITE_NOMEM;
+  rc = sqlite3BtreeCursor(pKV->pBt, pCF->pTtlExpiryCF->iTable,
+                          0, pKV->pKeyInfo, pCur);
+  if( rc == SQLITE_OK ) rc = sqlite3BtreeFirst(pCur, &res);
+  if( rc == SQLITE_OK && !res ){
+    *pHas = 1;
+    if( sqlite3BtreePayloadSize(pCur) >= 4 + 8 ){
+      unsigned char timeBuf[8];
+      rc = sqlite3BtreePayload(pCur, 4, 8, timeBuf);
+      if( rc == SQLITE_OK ) *pExpireMs = kvstoreDecodeBE64(timeBuf);
+    }
+  }
+  kvstoreFreeCursor(pCur);
+  return rc;
+}
+
 int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
   int nDeleted = 0;
 
@@ -5290,8 +5375,12 @@ int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
   KVStore *pKV = pCF->pKV;
 
   for(;;){
-    /* Stack-allocated batch arrays — avoids heap allocation per batch. */
-    void *apExpKeys[KVSTORE_PURGE_BATCH];
+    /* Composite keys of one batch are packed back to back into a single
+    ** buffer (aExpBuf), located by the parallel aiExpOff/anExpKeys arrays.
+    ** One allocation per batch instead of one per expired key. */
+    unsigned char *aExpBuf = NULL;
+    i64   nExpBuf = 0, nExpAlloc = 0;
+    i64   aiExpOff[KVSTORE_PURGE_BATCH];
     int   anExpKeys[KVSTORE_PURGE_BATCH];
     int   nExpired = 0;
     int   i, rc = SQLITE_OK;
@@ -5311,6 +5400,19 @@ int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
       return KVSTORE_CORRUPT;
     }
 
+    /* Peek at the earliest expiry first: if nothing is due yet there is no
+    ** need to take the write lock or issue an empty commit. */
+    {
+      int64_t firstMs = 0;
+      int hasFirst = 0;
+      if( kvstoreTtlFirstExpiry(pCF, &firstMs, &hasFirst) == SQLITE_OK
+          && (!hasFirst || kvstore_now_ms() < firstMs) ){
+        KV_LEAVE(pKV);
+        sqlite3_mutex_leave(pCF->pMutex);
+        break;
+      }
+    }
+
     /* Upgrade to a write transaction so the scan and delete are atomic
     ** per batch.  Opening a read cursor inside a write transaction is safe. */
     if( pKV->inTrans == 1 ){ sqlite3BtreeCommit(pKV->pBt); pKV->inTrans = 0; }
@@ -5338,22 +5440,28 @@ int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
           while( rc == SQLITE_OK && !res && nExpired < KVSTORE_PURGE_BATCH ){
             u32 payloadSz = sqlite3BtreePayloadSize(pCur);
             if( (int)payloadSz >= 4 + 8 ){
-              unsigned char hdr[4];
-              rc = sqlite3BtreePayload(pCur, 0, 4, hdr);
+              /* Key-length header and expire_ms prefix in one payload read. */
+              unsigned char hdr[4 + 8];
+              rc = sqlite3BtreePayload(pCur, 0, 4 + 8, hdr);
               if( rc != SQLITE_OK ) break;
               int storedKeyLen = (hdr[0]<<24)|(hdr[1]<<16)|(hdr[2]<<8)|hdr[3];
               if( storedKeyLen >= 8 ){
-                unsigned char timeBuf[8];
-                rc = sqlite3BtreePayload(pCur, 4, 8, timeBuf);
-                if( rc != SQLITE_OK ) break;
-                int64_t expireMs = kvstoreDecodeBE64(timeBuf);
+                int64_t expireMs = kvstoreDecodeBE64(hdr + 4);
                 if( nowMs < expireMs ) break; /* stop at first unexpired */
-                void *pExpKey = sqlite3Malloc(storedKeyLen);
-                if( !pExpKey ){ rc = SQLITE_NOMEM; break; }
-                rc = sqlite3BtreePayload(pCur, 4, storedKeyLen, pExpKey);
-                if( rc != SQLITE_OK ){ sqlite3_free(pExpKey); break; }
-                apExpKeys[nExpired] = pExpKey;
+                if( nExpBuf + storedKeyLen > nExpAlloc ){
+                  i64 nNew = nExpAlloc ? nExpAlloc * 2 : 4096;
+                  while( nNew < nExpBuf + storedKeyLen ) nNew *= 2;
+                  unsigned char *aNew = sqlite3Realloc(aExpBuf, nNew);
+                  if( !aNew ){ rc = SQLITE_NOMEM; break; }
+                  aExpBuf = aNew;
+                  nExpAlloc = nNew;
+                }
+                rc = sqlite3BtreePayload(pCur, 4, storedKeyLen,
+                                         aExpBuf + nExpBuf);
+                if( rc != SQLITE_OK ) break;
+                aiExpOff[nExpired]  = nExpBuf;
                 anExpKeys[nExpired] = storedKeyLen;
+                nExpBuf += storedKeyLen;
                 nExpired++;
               }
             }
@@ -5369,8 +5477,9 @@ int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
     if( rc == SQLITE_OK && nExpired > 0 ){
       if( pCF->pReadCur ){ kvstoreFreeCursor(pCF->pReadCur); pCF->pReadCur = NULL; }
       for( i = 0; i < nExpired; i++ ){
+        const unsigned char *pExpKey = aExpBuf + aiExpOff[i];
         int nUserKey        = anExpKeys[i] - 8;
-        const void *pUserKey = (const char*)apExpKeys[i] + 8;
+        const void *pUserKey = pExpKey + 8;
         int rcd = kvstoreRawBtreeDelete(pKV, pCF->iTable, pUserKey, nUserKey);
         if( rcd == SQLITE_OK ){
           nDeleted++;
@@ -5379,12 +5488,12 @@ int kvstore_cf_purge_expired(KVColumnFamily *pCF, int *pnDeleted){
         }
         kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pUserKey, nUserKey);
         kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable,
-                              apExpKeys[i], anExpKeys[i]);
+                              pExpKey, anExpKeys[i]);
       }
     }
 
     /* Free collected composite keys. */
-    for( i = 0; i < nExpired; i++ ) sqlite3_free(apExpKeys[i]);
+    sqlite3_free(aExpBuf);
 
     /* Commit or rollback this batch. */
     if( rc == SQLITE_OK ){
@@ -5505,14 +5614,7 @@ int kvstore_cf_put_if_absent(
           {
             unsigned char expBuf[8];
             kvstoreEncodeBE64(expBuf, expireAt);
-            unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(8 + nKey);
-            if( pExpKey ){
-              memcpy(pExpKey, expBuf, 8);
-              memcpy(pExpKey + 8, pKey, nKey);
-              kvstoreRawBtreeDelete(pKV, pCF->pTtlExpiryCF->iTable,
-                                    pExpKey, 8 + nKey);
-              sqlite3_free(pExpKey);
-            }
+            kvstoreExpKeyDelete(pKV, pCF->pTtlExpiryCF->iTable, expBuf, pKey, nKey);
           }
           kvstoreRawBtreeDelete(pKV, pCF->pTtlKeyCF->iTable, pKey, nKey);
           if( pCF->nTtlActive > 0 ) pCF->nTtlActive--;
@@ -5546,17 +5648,7 @@ int kvstore_cf_put_if_absent(
       rc = kvstoreRawBtreePutPlain(pKV, pCF->pTtlKeyCF->iTable,
                               pKey, nKey, ttlBuf, 8);
       if( rc == SQLITE_OK ){
-        int nExpKey = 8 + nKey;
-        unsigned char *pExpKey = (unsigned char*)sqlite3Malloc(nExpKey);
-        if( !pExpKey ){
-          rc = KVSTORE_NOMEM;
-        } else {
-          memcpy(pExpKey, ttlBuf, 8);
-          memcpy(pExpKey + 8, pKey, nKey);
-          rc = kvstoreRawBtreePutPlain(pKV, pCF->pTtlExpiryCF->iTable,
-                                  pExpKey, nExpKey, NULL, 0);
-          sqlite3_free(pExpKey);
-        }
+        rc = kvstoreExpKeyPut(pKV, pCF->pTtlExpiryCF->iTable, ttlBuf, pKey, nKey);
       }
       if( rc == SQLITE_OK ) pCF->nTtlActive++;
     }
@@ -5596,6 +5688,459 @@ int kvstore_put_if_absent(
                                   pValue, nValue, expire_ms, pInserted);
 }
 
+/* ========== INCREMENT WITH TTL ========== */
+
+/*
+** kvstore_cf_incr_ttl — fixed-window counter: read, compare against limit
+** and increment key in one write transaction.
+**
+** The value is stored as an ASCII decimal integer.
+**   absent / expired  — write "1" expiring at now + window_ms (if limit >= 1).
+**   count >= limit    — store unchanged, *pAllowed = 0.
+**   count <  limit    — write count+1, keeping the key's current expiry
+**                       (now + window_ms if the key has no TTL).
+**
+** pnCount (may be NULL) receives the counter value after the call.
+** Joins the caller's write transaction if one is open.
+** Returns KVSTORE_ERROR if the stored value is not a decimal integer.
+*/
+int kvstore_cf_incr_ttl(
+  KVColumnFamily *pCF,
+  const void *pKey, int nKey,
+  int64_t limit,
+  int64_t window_ms,
+  int64_t *pnCount,
+  int *pAllowed
+){
+  int rc = KVSTORE_OK;
+  int autoTrans = 0;
+  int allowed = 0;
+  int64_t count = 0;
+  int64_t nowMs;
+  int64_t expireMs = 0;
+  int keepTtl = 0;
+  void *pOld = NULL; int nOld = 0;
+
+  if( pAllowed ) *pAllowed = 0;
+  if( pnCount ) *pnCount = 0;
+  if( !pCF || !pCF->pKV || window_ms <= 0 ) return KVSTORE_ERROR;
+  KVStore *pKV = pCF->pKV;
+
+  sqlite3_mutex_enter(pCF->pMutex);
+  KV_ENTER(pKV);
+
+  if( pKV->closing ){
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_ERROR;
+  }
+  if( pKV->isCorrupted ){
+    kvstoreSetError(pKV, "cannot incr_ttl: database is corrupted");
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_CORRUPT;
+  }
+  if( !pKey || nKey <= 0 ){
+    kvstoreSetError(pKV, "invalid key");
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_ERROR;
+  }
+
+  if( pKV->inTrans != 2 ){
+    rc = kvstore_begin(pKV, 1);
+    if( rc != KVSTORE_OK ){
+      KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+      return rc;
+    }
+    autoTrans = 1;
+  }
+
+  /* TTL index CFs are needed both to read the current expiry and to write
+  ** the new one; create them now if this CF has never used TTL. */
+  rc = kvstoreGetOrCreateTtlCFs(pCF);
+  if( rc != KVSTORE_OK ) goto incr_done;
+
+  nowMs = kvstore_now_ms();
+  {
+    void *pTtl = NULL; int nTtl = 0;
+    if( kvstoreRawBtreeGetPlain(pKV, pCF->pTtlKeyCF->iTable,
+                                pKey, nKey, &pTtl, &nTtl) == SQLITE_OK
+        && pTtl && nTtl == 8 ){
+      expireMs = kvstoreDecodeBE64((const unsigned char*)pTtl);
+    }
+    if( pTtl ) sqlite3_free(pTtl);
+  }
+
+  rc = kvstoreRawBtreeGet(pKV, pCF->iTable, pKey, nKey, &pOld, &nOld);
+  if( rc == KVSTORE_NOTFOUND || (rc == SQLITE_OK && expireMs > 0
+                                 && nowMs >= expireMs) ){
+    /* New window.  An expired key is simply overwritten below; put_ttl
+    ** replaces its stale TTL index entries. */
+    if( rc == SQLITE_OK ) pKV->stats.nTtlExpired++;
+    rc = KVSTORE_OK;
+    count = 0;
+    expireMs = nowMs + window_ms;
+  }else if( rc == SQLITE_OK ){
+    i64 v = 0;
+    pKV->stats.nGets++;
+    pKV->stats.nBytesRead += (u64)nOld;
+    if( nOld <= 0 || sqlite3Atoi64((const char*)pOld, &v, nOld, SQLITE_UTF8) != 0 ){
+      kvstoreSetError(pKV, "incr_ttl: value is not a decimal integer");
+      rc = KVSTORE_ERROR;
+      goto incr_done;
+    }
+    count = (int64_t)v;
+    if( expireMs == 0 ) expireMs = nowMs + window_ms;
+    else keepTtl = 1;
+  }else{
+    goto incr_done;
+  }
+
+  if( count < limit ){
+    char zNew[24];
+    int nNew;
+    count++;
+    nNew = snprintf(zNew, sizeof(zNew), "%lld", (long long)count);
+    if( keepTtl ){
+      /* Same window: the TTL index entries are already right, so only the
+      ** data cell changes — skip put_ttl's rewrite of both index entries. */
+      rc = kvstoreRawBtreePut(pKV, pCF->iTable, pKey, nKey, zNew, nNew);
+      if( rc == SQLITE_OK ){
+        pKV->stats.nPuts++;
+        pKV->stats.nBytesWritten += (u64)nKey + (u64)nNew;
+      }
+    }else{
+      rc = kvstore_cf_put_ttl(pCF, pKey, nKey, zNew, nNew, expireMs);
+    }
+    if( rc == KVSTORE_OK ) allowed = 1;
+  }
+
+incr_done:
+  if( pOld ) sqlite3_free(pOld);
+  if( autoTrans ){
+    if( rc == KVSTORE_OK ){
+      rc = kvstore_commit(pKV);
+      if( rc != KVSTORE_OK ) kvstore_rollback(pKV);
+    }else{
+      kvstore_rollback(pKV);
+    }
+  }
+  if( rc == KVSTORE_OK ){
+    if( pAllowed ) *pAllowed = allowed;
+    if( pnCount ) *pnCount = count;
+  }
+
+  KV_LEAVE(pKV);
+  sqlite3_mutex_leave(pCF->pMutex);
+  return rc;
+}
+
+/*
+** kvstore_incr_ttl — kvstore_cf_incr_ttl on the default column family.
+*/
+int kvstore_incr_ttl(
+  KVStore *pKV,
+  const void *pKey, int nKey,
+  int64_t limit,
+  int64_t window_ms,
+  int64_t *pnCount,
+  int *pAllowed
+){
+  if( !pKV || !pKV->pDefaultCF ) return KVSTORE_ERROR;
+  return kvstore_cf_incr_ttl(pKV->pDefaultCF, pKey, nKey,
+                             limit, window_ms, pnCount, pAllowed);
+}
+
+/* ========== BATCH WRITE ========== */
+
+/*
+** kvstore_cf_write_batch_ttl — insert or update nPairs key-value pairs in
+** pCF, each with an optional absolute expiry.
+**
+** aExpireMs may be NULL (no TTL on any pair); otherwise aExpireMs[i] > 0
+** writes pair i through kvstore_cf_put_ttl and 0 writes it as a plain put
+** (which also clears any TTL the key had).
+**
+** Outside a write transaction the whole batch runs in a single write
+** transaction: one WAL commit (and one auto-checkpoint tick) for all pairs,
+** and either every pair is written or none is.  If the caller already holds
+** an explicit write transaction (kvstore_begin with wrflag=1), the pairs join
+** it and nothing is committed here; on error the caller decides whether to
+** roll back the pairs written so far.
+**
+** Returns KVSTORE_OK, or the error code of the first put that failed.
+*/
+int kvstore_cf_write_batch_ttl(
+  KVColumnFamily *pCF,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue,
+  const int64_t *aExpireMs
+){
+  int rc = KVSTORE_OK;
+  int autoTrans = 0;
+  int i;
+  if( !pCF || !pCF->pKV || nPairs < 0 ) return KVSTORE_ERROR;
+  if( nPairs == 0 ) return KVSTORE_OK;
+  if( !apKey || !anKey || !apValue || !anValue ) return KVSTORE_ERROR;
+  KVStore *pKV = pCF->pKV;
+
+  /* Same lock order as kvstore_cf_put_internal: CF mutex, then store. */
+  sqlite3_mutex_enter(pCF->pMutex);
+  KV_ENTER(pKV);
+
+  if( pKV->closing ){
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_ERROR;
+  }
+  if( pKV->isCorrupted ){
+    kvstoreSetError(pKV, "cannot write batch: database is corrupted");
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_CORRUPT;
+  }
+
+  if( pKV->inTrans != 2 ){
+    rc = kvstore_begin(pKV, 1);
+    if( rc != KVSTORE_OK ){
+      KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+      return rc;
+    }
+    autoTrans = 1;
+  }
+
+  for( i = 0; i < nPairs; i++ ){
+    if( aExpireMs && aExpireMs[i] > 0 ){
+      rc = kvstore_cf_put_ttl(pCF, apKey[i], anKey[i],
+                              apValue[i], anValue[i], aExpireMs[i]);
+    }else{
+      rc = kvstore_cf_put_internal(pCF, apKey[i], anKey[i],
+                                   apValue[i], anValue[i]);
+    }
+    if( rc != KVSTORE_OK ) break;
+  }
+
+  if( autoTrans ){
+    if( rc == KVSTORE_OK ){
+      rc = kvstore_commit(pKV);
+      if( rc != KVSTORE_OK ) kvstore_rollback(pKV);
+    }else{
+      kvstore_rollback(pKV);
+    }
+  }
+
+  KV_LEAVE(pKV);
+  sqlite3_mutex_leave(pCF->pMutex);
+  return rc;
+}
+
+/*
+** kvstore_cf_write_batch — kvstore_cf_write_batch_ttl with no expiry.
+*/
+int kvstore_cf_write_batch(
+  KVColumnFamily *pCF,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue
+){
+  return kvstore_cf_write_batch_ttl(pCF, nPairs, apKey, anKey,
+                                    apValue, anValue, NULL);
+}
+
+/*
+** kvstore_write_batch — kvstore_cf_write_batch on the default column family.
+*/
+int kvstore_write_batch(
+  KVStore *pKV,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue
+){
+  if( !pKV || !pKV->pDefaultCF ) return KVSTORE_ERROR;
+  return kvstore_cf_write_batch_ttl(pKV->pDefaultCF, nPairs,
+                                    apKey, anKey, apValue, anValue, NULL);
+}
+
+/*
+** kvstore_write_batch_ttl — kvstore_cf_write_batch_ttl on the default CF.
+*/
+int kvstore_write_batch_ttl(
+  KVStore *pKV,
+  int nPairs,
+  const void *const *apKey,   const int *anKey,
+  const void *const *apValue, const int *anValue,
+  const int64_t *aExpireMs
+){
+  if( !pKV || !pKV->pDefaultCF ) return KVSTORE_ERROR;
+  return kvstore_cf_write_batch_ttl(pKV->pDefaultCF, nPairs,
+                                    apKey, anKey, apValue, anValue, aExpireMs);
+}
+
+/* ========== BATCH READ ========== */
+
+/*
+** kvstore_cf_get_batch — look up nKeys keys in pCF with one lock acquisition.
+**
+** For each i, apValue[i] / anValue[i] receive the value (caller must
+** snkv_free each non-NULL apValue[i]).  Missing or expired keys give
+** apValue[i] = NULL and anValue[i] = -1.  Expired keys are lazily deleted
+** exactly as by kvstore_cf_get().
+**
+** Returns KVSTORE_OK if every lookup either found the key or reported it
+** missing.  On any other error all values fetched so far are freed, every
+** apValue[i] is NULL, and the error code is returned.
+*/
+int kvstore_cf_get_batch(
+  KVColumnFamily *pCF,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  void **apValue, int *anValue
+){
+  int rc = KVSTORE_OK;
+  int i;
+  if( !pCF || !pCF->pKV || nKeys < 0 ) return KVSTORE_ERROR;
+  if( nKeys == 0 ) return KVSTORE_OK;
+  if( !apKey || !anKey || !apValue || !anValue ) return KVSTORE_ERROR;
+  KVStore *pKV = pCF->pKV;
+
+  for( i = 0; i < nKeys; i++ ){ apValue[i] = NULL; anValue[i] = -1; }
+
+  /* Hold both locks across the batch so no writer interleaves between keys
+  ** on a shared handle; kvstore_cf_get_internal re-enters them. */
+  sqlite3_mutex_enter(pCF->pMutex);
+  KV_ENTER(pKV);
+
+  for( i = 0; i < nKeys; i++ ){
+    rc = kvstore_cf_get_internal(pCF, apKey[i], anKey[i],
+                                 &apValue[i], &anValue[i]);
+    if( rc == KVSTORE_NOTFOUND ){
+      apValue[i] = NULL; anValue[i] = -1;
+      rc = KVSTORE_OK;
+    }else if( rc != KVSTORE_OK ){
+      break;
+    }
+  }
+
+  if( rc != KVSTORE_OK ){
+    for( i = 0; i < nKeys; i++ ){
+      if( apValue[i] ) sqlite3_free(apValue[i]);
+      apValue[i] = NULL; anValue[i] = -1;
+    }
+  }
+
+  KV_LEAVE(pKV);
+  sqlite3_mutex_leave(pCF->pMutex);
+  return rc;
+}
+
+/*
+** kvstore_get_batch — kvstore_cf_get_batch on the default column family.
+*/
+int kvstore_get_batch(
+  KVStore *pKV,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  void **apValue, int *anValue
+){
+  if( !pKV || !pKV->pDefaultCF ) return KVSTORE_ERROR;
+  return kvstore_cf_get_batch(pKV->pDefaultCF, nKeys,
+                              apKey, anKey, apValue, anValue);
+}
+
+/* ========== BATCH DELETE ========== */
+
+/*
+** kvstore_cf_delete_batch — delete nKeys keys from pCF with one call.
+**
+** Keys that do not exist are skipped rather than treated as errors; if
+** pnDeleted is not NULL it receives the number of keys actually removed.
+** TTL index entries are removed along with their keys, as by
+** kvstore_cf_delete().
+**
+** Same transaction semantics as kvstore_cf_write_batch_ttl(): outside a
+** write transaction the batch is one atomic write transaction (one WAL
+** commit); inside kvstore_begin(wrflag=1) the deletes join the caller's
+** transaction.
+**
+** Returns KVSTORE_OK, or the error code of the first delete that failed.
+*/
+int kvstore_cf_delete_batch(
+  KVColumnFamily *pCF,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  int *pnDeleted
+){
+  int rc = KVSTORE_OK;
+  int autoTrans = 0;
+  int nDeleted = 0;
+  int i;
+  if( pnDeleted ) *pnDeleted = 0;
+  if( !pCF || !pCF->pKV || nKeys < 0 ) return KVSTORE_ERROR;
+  if( nKeys == 0 ) return KVSTORE_OK;
+  if( !apKey || !anKey ) return KVSTORE_ERROR;
+  KVStore *pKV = pCF->pKV;
+
+  /* Same lock order as kvstore_cf_delete_internal: CF mutex, then store. */
+  sqlite3_mutex_enter(pCF->pMutex);
+  KV_ENTER(pKV);
+
+  if( pKV->closing ){
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_ERROR;
+  }
+  if( pKV->isCorrupted ){
+    kvstoreSetError(pKV, "cannot delete batch: database is corrupted");
+    KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+    return KVSTORE_CORRUPT;
+  }
+
+  if( pKV->inTrans != 2 ){
+    rc = kvstore_begin(pKV, 1);
+    if( rc != KVSTORE_OK ){
+      KV_LEAVE(pKV); sqlite3_mutex_leave(pCF->pMutex);
+      return rc;
+    }
+    autoTrans = 1;
+  }
+
+  for( i = 0; i < nKeys; i++ ){
+    rc = kvstore_cf_delete_internal(pCF, apKey[i], anKey[i]);
+    if( rc == KVSTORE_OK ){
+      nDeleted++;
+    }else if( rc == KVSTORE_NOTFOUND ){
+      rc = KVSTORE_OK;
+    }else{
+      break;
+    }
+  }
+
+  if( autoTrans ){
+    if( rc == KVSTORE_OK ){
+      rc = kvstore_commit(pKV);
+      if( rc != KVSTORE_OK ) kvstore_rollback(pKV);
+    }else{
+      kvstore_rollback(pKV);
+    }
+  }
+  if( rc == KVSTORE_OK && pnDeleted ) *pnDeleted = nDeleted;
+
+  KV_LEAVE(pKV);
+  sqlite3_mutex_leave(pCF->pMutex);
+  return rc;
+}
+
+/*
+** kvstore_delete_batch — kvstore_cf_delete_batch on the default column family.
+*/
+int kvstore_delete_batch(
+  KVStore *pKV,
+  int nKeys,
+  const void *const *apKey, const int *anKey,
+  int *pnDeleted
+){
+  if( pnDeleted ) *pnDeleted = 0;
+  if( !pKV || !pKV->pDefaultCF ) return KVSTORE_ERROR;
+  return kvstore_cf_delete_batch(pKV->pDefaultCF, nKeys,
+                                 apKey, anKey, pnDeleted);
+}
+
 /* ========== BULK CLEAR ========== */
 
 /*
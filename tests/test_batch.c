@@ -0,0 +1,534 @@
+/* SPDX-License-Identifier: Apache-2.0 */
+/*
+** tests/test_batch.c — Test suite for batch APIs:
+**   kvstore_write_batch / kvstore_cf_write_batch
+**   kvstore_write_batch_ttl / kvstore_cf_write_batch_ttl
+**   kvstore_get_batch / kvstore_cf_get_batch
+**   kvstore_delete_batch / kvstore_cf_delete_batch
+**
+** Tests:
+**   --- kvstore_write_batch ---
+**   1.  Batch of N pairs → all readable, count == N
+**   2.  Batch outside a transaction → exactly one WAL commit
+**   3.  Invalid pair mid-batch → error, no pair from the batch persisted
+**   4.  Inside explicit write transaction → joins, rollback discards batch
+**   5.  nPairs == 0 → KVSTORE_OK, no-op
+**   6.  Duplicate key in batch → last value wins
+**   7.  CF variant: pairs land only in that CF
+**   8.  Batch survives close/reopen
+**
+**   --- kvstore_write_batch_ttl ---
+**   9.  Per-pair expiry: expired pairs vanish, 0 means no TTL, one commit
+**  10.  expire 0 clears a TTL the key already had
+**
+**   --- kvstore_get_batch ---
+**  11.  Mixed hits/misses: values in order, misses NULL/-1, empty value 0
+**  12.  Expired key reported missing; CF variant reads only its CF
+**
+**   --- kvstore_delete_batch ---
+**  13.  Deletes present keys, skips missing ones, one commit, TTL cleaned
+**  14.  Inside explicit write transaction → rollback restores keys; CF variant
+*/
+
+#include "kvstore.h"
+#include <stdio.h>
+#include <string.h>
+#include <stdlib.h>
+#include <time.h>
+
+/* ---- helpers ---- */
+
+static int passed = 0;
+static int failed = 0;
+
+static void check(const char *name, int ok){
+  if( ok ){
+    printf("  PASS: %s\n", name);
+    passed++;
+  } else {
+    printf("  FAIL: %s\n", name);
+    failed++;
+  }
+}
+
+#define ASSERT(name, expr) check(name, (int)(expr))
+
+static void removeDb(const char *path){
+  remove(path);
+  char walPath[512]; snprintf(walPath, sizeof(walPath), "%s-wal", path); remove(walPath);
+  char shmPath[512]; snprintf(shmPath, sizeof(shmPath), "%s-shm", path); remove(shmPath);
+}
+
+static KVStore *openFresh(const char *path){
+  removeDb(path);
+  KVStore *pKV = NULL;
+  int rc = kvstore_open(path, &pKV, KVSTORE_JOURNAL_WAL);
+  if( rc != KVSTORE_OK ){ fprintf(stderr, "openFresh: open failed %d\n", rc); return NULL; }
+  return pKV;
+}
+
+static void cleanup(KVStore **ppKV, const char *path){
+  if( *ppKV ){ kvstore_close(*ppKV); *ppKV = NULL; }
+  removeDb(path);
+}
+
+/* Fixed-size batch of "key%04d" -> "val%04d" pairs. */
+#define BATCH_MAX 256
+typedef struct {
+  char aKeyBuf[BATCH_MAX][16];
+  char aValBuf[BATCH_MAX][16];
+  const void *apKey[BATCH_MAX];
+  const void *apVal[BATCH_MAX];
+  int anKey[BATCH_MAX];
+  int anVal[BATCH_MAX];
+} Batch;
+
+static void batchFill(Batch *b, int n){
+  int i;
+  for( i = 0; i < n; i++ ){
+    b->anKey[i] = snprintf(b->aKeyBuf[i], sizeof(b->aKeyBuf[i]), "key%04d", i);
+    b->anVal[i] = snprintf(b->aValBuf[i], sizeof(b->aValBuf[i]), "val%04d", i);
+    b->apKey[i] = b->aKeyBuf[i];
+    b->apVal[i] = b->aValBuf[i];
+  }
+}
+
+static int valueIs(KVStore *pKV, const char *zKey, const char *zExpect){
+  void *pVal = NULL; int nVal = 0;
+  int rc = kvstore_get(pKV, zKey, (int)strlen(zKey), &pVal, &nVal);
+  int ok = rc == KVSTORE_OK && nVal == (int)strlen(zExpect)
+        && memcmp(pVal, zExpect, nVal) == 0;
+  if( pVal ) snkv_free(pVal);
+  return ok;
+}
+
+static Batch g_batch;
+
+static void sleep_ms(int ms){
+  struct timespec ts;
+  ts.tv_sec  = ms / 1000;
+  ts.tv_nsec = (ms % 1000) * 1000000L;
+  nanosleep(&ts, NULL);
+}
+
+/* ====================================================================== */
+/* --- kvstore_write_batch --- */
+/* ====================================================================== */
+
+static void test1_batch_basic(void){
+  printf("\nTest 1: batch of N pairs → all readable\n");
+  const char *path = "test_batch_1.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  batchFill(&g_batch, 200);
+  int rc = kvstore_write_batch(pKV, 200, g_batch.apKey, g_batch.anKey,
+                               g_batch.apVal, g_batch.anVal);
+  ASSERT("write_batch returns OK", rc == KVSTORE_OK);
+
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("count == 200", n == 200);
+  ASSERT("first pair readable", valueIs(pKV, "key0000", "val0000"));
+  ASSERT("last pair readable", valueIs(pKV, "key0199", "val0199"));
+
+  cleanup(&pKV, path);
+}
+
+static void test2_single_commit(void){
+  printf("\nTest 2: batch outside a transaction → one WAL commit\n");
+  const char *path = "test_batch_2.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  kvstore_stats_reset(pKV);
+  batchFill(&g_batch, 100);
+  kvstore_write_batch(pKV, 100, g_batch.apKey, g_batch.anKey,
+                      g_batch.apVal, g_batch.anVal);
+
+  KVStoreStats st = {0};
+  kvstore_stats(pKV, &st);
+  ASSERT("nWalCommits == 1", st.nWalCommits == 1);
+  ASSERT("nPuts == 100", st.nPuts == 100);
+
+  cleanup(&pKV, path);
+}
+
+static void test3_invalid_pair_rolls_back(void){
+  printf("\nTest 3: invalid pair mid-batch → whole batch rolled back\n");
+  const char *path = "test_batch_3.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  kvstore_put(pKV, "existing", 8, "v", 1);
+
+  batchFill(&g_batch, 10);
+  g_batch.anKey[5] = 0;  /* zero-length key is rejected */
+  int rc = kvstore_write_batch(pKV, 10, g_batch.apKey, g_batch.anKey,
+                               g_batch.apVal, g_batch.anVal);
+  ASSERT("write_batch returns error", rc != KVSTORE_OK);
+
+  int exists = 1;
+  kvstore_exists(pKV, "key0000", 7, &exists);
+  ASSERT("pair before the bad one not persisted", exists == 0);
+
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("count unchanged (1)", n == 1);
+
+  /* Store still writable afterwards */
+  rc = kvstore_put(pKV, "after", 5, "v", 1);
+  ASSERT("put after failed batch OK", rc == KVSTORE_OK);
+
+  cleanup(&pKV, path);
+}
+
+static void test4_joins_explicit_transaction(void){
+  printf("\nTest 4: inside explicit write transaction → joins it\n");
+  const char *path = "test_batch_4.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  batchFill(&g_batch, 20);
+
+  kvstore_begin(pKV, 1);
+  int rc = kvstore_write_batch(pKV, 20, g_batch.apKey, g_batch.anKey,
+                               g_batch.apVal, g_batch.anVal);
+  ASSERT("write_batch in txn returns OK", rc == KVSTORE_OK);
+  rc = kvstore_rollback(pKV);
+  ASSERT("rollback OK (no nested commit happened)", rc == KVSTORE_OK);
+
+  int64_t n = -1;
+  kvstore_count(pKV, &n);
+  ASSERT("rolled-back batch not visible", n == 0);
+
+  kvstore_begin(pKV, 1);
+  kvstore_write_batch(pKV, 20, g_batch.apKey, g_batch.anKey,
+                      g_batch.apVal, g_batch.anVal);
+  rc = kvstore_commit(pKV);
+  ASSERT("commit OK", rc == KVSTORE_OK);
+  kvstore_count(pKV, &n);
+  ASSERT("committed batch visible", n == 20);
+
+  cleanup(&pKV, path);
+}
+
+static void test5_empty_batch(void){
+  printf("\nTest 5: nPairs == 0 → no-op\n");
+  const char *path = "test_batch_5.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  kvstore_stats_reset(pKV);
+  int rc = kvstore_write_batch(pKV, 0, NULL, NULL, NULL, NULL);
+  ASSERT("returns OK", rc == KVSTORE_OK);
+
+  KVStoreStats st = {0};
+  kvstore_stats(pKV, &st);
+  ASSERT("no commit issued", st.nWalCommits == 0);
+  ASSERT("negative nPairs rejected",
+         kvstore_write_batch(pKV, -1, NULL, NULL, NULL, NULL) == KVSTORE_ERROR);
+
+  cleanup(&pKV, path);
+}
+
+static void test6_duplicate_key_last_wins(void){
+  printf("\nTest 6: duplicate key in batch → last value wins\n");
+  const char *path = "test_batch_6.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  const void *apKey[3] = { "dup", "other", "dup" };
+  int anKey[3] = { 3, 5, 3 };
+  const void *apVal[3] = { "first", "x", "second" };
+  int anVal[3] = { 5, 1, 6 };
+  int rc = kvstore_write_batch(pKV, 3, apKey, anKey, apVal, anVal);
+  ASSERT("write_batch OK", rc == KVSTORE_OK);
+  ASSERT("dup == second", valueIs(pKV, "dup", "second"));
+
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("count == 2", n == 2);
+
+  cleanup(&pKV, path);
+}
+
+static void test7_cf_variant(void){
+  printf("\nTest 7: CF variant writes only to that CF\n");
+  const char *path = "test_batch_7.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  KVColumnFamily *pCF = NULL;
+  kvstore_cf_create(pKV, "batchcf", &pCF);
+  ASSERT("CF created", pCF != NULL);
+
+  batchFill(&g_batch, 50);
+  int rc = kvstore_cf_write_batch(pCF, 50, g_batch.apKey, g_batch.anKey,
+                                  g_batch.apVal, g_batch.anVal);
+  ASSERT("cf_write_batch OK", rc == KVSTORE_OK);
+
+  int64_t nCF = 0, nDefault = -1;
+  kvstore_cf_count(pCF, &nCF);
+  kvstore_count(pKV, &nDefault);
+  ASSERT("CF count == 50", nCF == 50);
+  ASSERT("default CF untouched", nDefault == 0);
+
+  kvstore_cf_close(pCF);
+  cleanup(&pKV, path);
+}
+
+static void test8_persists_across_reopen(void){
+  printf("\nTest 8: batch survives close/reopen\n");
+  const char *path = "test_batch_8.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  batchFill(&g_batch, BATCH_MAX);
+  kvstore_write_batch(pKV, BATCH_MAX, g_batch.apKey, g_batch.anKey,
+                      g_batch.apVal, g_batch.anVal);
+  kvstore_close(pKV);
+  pKV = NULL;
+
+  int rc = kvstore_open(path, &pKV, KVSTORE_JOURNAL_WAL);
+  ASSERT("reopen OK", rc == KVSTORE_OK && pKV);
+  if( !pKV ) return;
+
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("all pairs present after reopen", n == BATCH_MAX);
+  ASSERT("middle pair intact", valueIs(pKV, "key0128", "val0128"));
+
+  cleanup(&pKV, path);
+}
+
+/* ====================================================================== */
+/* --- kvstore_write_batch_ttl --- */
+/* ====================================================================== */
+
+static void test9_batch_ttl(void){
+  printf("\nTest 9: write_batch_ttl per-pair expiry\n");
+  const char *path = "test_batch_9.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  int64_t aExpire[4];
+  int64_t now = kvstore_now_ms();
+  batchFill(&g_batch, 4);
+  aExpire[0] = 0;             /* permanent */
+  aExpire[1] = now + 60000;   /* live */
+  aExpire[2] = now + 50;      /* short */
+  aExpire[3] = now + 50;
+
+  kvstore_stats_reset(pKV);
+  int rc = kvstore_write_batch_ttl(pKV, 4, g_batch.apKey, g_batch.anKey,
+                                   g_batch.apVal, g_batch.anVal, aExpire);
+  ASSERT("write_batch_ttl OK", rc == KVSTORE_OK);
+  KVStoreStats st = {0};
+  kvstore_stats(pKV, &st);
+  ASSERT("one WAL commit", st.nWalCommits == 1);
+
+  int64_t rem = 0;
+  kvstore_ttl_remaining(pKV, "key0000", 7, &rem);
+  ASSERT("expire 0 -> no TTL", rem == KVSTORE_NO_TTL);
+  kvstore_ttl_remaining(pKV, "key0001", 7, &rem);
+  ASSERT("long TTL set", rem > 0 && rem <= 60000);
+
+  sleep_ms(80);
+  int exists = 1;
+  kvstore_exists(pKV, "key0002", 7, &exists);
+  ASSERT("short-TTL pair expired", exists == 0);
+  ASSERT("permanent pair still there", valueIs(pKV, "key0000", "val0000"));
+
+  cleanup(&pKV, path);
+}
+
+static void test10_batch_ttl_clears_ttl(void){
+  printf("\nTest 10: write_batch_ttl with expire 0 clears an existing TTL\n");
+  const char *path = "test_batch_10.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  kvstore_put_ttl(pKV, "key0000", 7, "old", 3, kvstore_now_ms() + 60000);
+  int64_t aExpire[1] = { 0 };
+  batchFill(&g_batch, 1);
+  int rc = kvstore_write_batch_ttl(pKV, 1, g_batch.apKey, g_batch.anKey,
+                                   g_batch.apVal, g_batch.anVal, aExpire);
+  ASSERT("write_batch_ttl OK", rc == KVSTORE_OK);
+  int64_t rem = 0;
+  kvstore_ttl_remaining(pKV, "key0000", 7, &rem);
+  ASSERT("TTL cleared", rem == KVSTORE_NO_TTL);
+  ASSERT("value replaced", valueIs(pKV, "key0000", "val0000"));
+
+  cleanup(&pKV, path);
+}
+
+/* ====================================================================== */
+/* --- kvstore_get_batch --- */
+/* ====================================================================== */
+
+static void test11_get_batch(void){
+  printf("\nTest 11: get_batch with hits, misses and an empty value\n");
+  const char *path = "test_batch_11.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  kvstore_put(pKV, "a", 1, "1", 1);
+  kvstore_put(pKV, "c", 1, "333", 3);
+  kvstore_put(pKV, "e", 1, "", 0);
+
+  const void *apKey[4] = { "a", "b", "c", "e" };
+  int anKey[4] = { 1, 1, 1, 1 };
+  void *apVal[4]; int anVal[4];
+  int rc = kvstore_get_batch(pKV, 4, apKey, anKey, apVal, anVal);
+  ASSERT("get_batch OK", rc == KVSTORE_OK);
+  ASSERT("a found", anVal[0] == 1 && memcmp(apVal[0], "1", 1) == 0);
+  ASSERT("b missing", apVal[1] == NULL && anVal[1] == -1);
+  ASSERT("c found", anVal[2] == 3 && memcmp(apVal[2], "333", 3) == 0);
+  ASSERT("e empty value", anVal[3] == 0);
+  int i;
+  for( i = 0; i < 4; i++ ) if( apVal[i] ) snkv_free(apVal[i]);
+
+  ASSERT("nKeys == 0 OK",
+         kvstore_get_batch(pKV, 0, NULL, NULL, NULL, NULL) == KVSTORE_OK);
+
+  cleanup(&pKV, path);
+}
+
+static void test12_get_batch_expired_and_cf(void){
+  printf("\nTest 12: get_batch skips expired keys; CF variant\n");
+  const char *path = "test_batch_12.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  KVColumnFamily *pCF = NULL;
+  kvstore_cf_create(pKV, "gb", &pCF);
+  ASSERT("CF created", pCF != NULL);
+  if( !pCF ){ cleanup(&pKV, path); return; }
+
+  kvstore_cf_put(pCF, "live", 4, "L", 1);
+  kvstore_cf_put_ttl(pCF, "dead", 4, "D", 1, kvstore_now_ms() - 1);
+  kvstore_put(pKV, "other", 5, "O", 1);
+
+  const void *apKey[3] = { "live", "dead", "other" };
+  int anKey[3] = { 4, 4, 5 };
+  void *apVal[3]; int anVal[3];
+  int rc = kvstore_cf_get_batch(pCF, 3, apKey, anKey, apVal, anVal);
+  ASSERT("cf_get_batch OK", rc == KVSTORE_OK);
+  ASSERT("live found", anVal[0] == 1);
+  ASSERT("expired key missing", apVal[1] == NULL && anVal[1] == -1);
+  ASSERT("default-CF key not visible", apVal[2] == NULL && anVal[2] == -1);
+  int i;
+  for( i = 0; i < 3; i++ ) if( apVal[i] ) snkv_free(apVal[i]);
+
+  kvstore_cf_close(pCF);
+  cleanup(&pKV, path);
+}
+
+/* ====================================================================== */
+/* --- kvstore_delete_batch --- */
+/* ====================================================================== */
+
+static void test13_delete_batch(void){
+  printf("\nTest 13: delete_batch removes present keys, skips missing\n");
+  const char *path = "test_batch_13.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  batchFill(&g_batch, 10);
+  kvstore_write_batch(pKV, 10, g_batch.apKey, g_batch.anKey,
+                      g_batch.apVal, g_batch.anVal);
+  kvstore_put_ttl(pKV, "ttlkey", 6, "v", 1, kvstore_now_ms() + 60000);
+
+  const void *apKey[4] = { "key0000", "key0005", "missing", "ttlkey" };
+  int anKey[4] = { 7, 7, 7, 6 };
+  int nDeleted = -1;
+  kvstore_stats_reset(pKV);
+  int rc = kvstore_delete_batch(pKV, 4, apKey, anKey, &nDeleted);
+  ASSERT("delete_batch OK", rc == KVSTORE_OK);
+  ASSERT("three keys deleted", nDeleted == 3);
+  KVStoreStats st = {0};
+  kvstore_stats(pKV, &st);
+  ASSERT("one WAL commit", st.nWalCommits == 1);
+
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("count == 8", n == 8);
+  int exists = 1;
+  kvstore_exists(pKV, "key0005", 7, &exists);
+  ASSERT("deleted key gone", exists == 0);
+  int64_t rem = 0;
+  rc = kvstore_ttl_remaining(pKV, "ttlkey", 6, &rem);
+  ASSERT("TTL entry removed with key", rc == KVSTORE_NOTFOUND);
+  ASSERT("other keys intact", valueIs(pKV, "key0009", "val0009"));
+
+  rc = kvstore_delete_batch(pKV, 0, NULL, NULL, &nDeleted);
+  ASSERT("nKeys == 0 is a no-op", rc == KVSTORE_OK && nDeleted == 0);
+
+  cleanup(&pKV, path);
+}
+
+static void test14_delete_batch_txn_and_cf(void){
+  printf("\nTest 14: delete_batch joins a transaction; CF variant\n");
+  const char *path = "test_batch_14.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ) return;
+
+  batchFill(&g_batch, 4);
+  kvstore_write_batch(pKV, 4, g_batch.apKey, g_batch.anKey,
+                      g_batch.apVal, g_batch.anVal);
+
+  int nDeleted = 0;
+  kvstore_begin(pKV, 1);
+  int rc = kvstore_delete_batch(pKV, 4, g_batch.apKey, g_batch.anKey,
+                                &nDeleted);
+  ASSERT("delete_batch in txn OK", rc == KVSTORE_OK && nDeleted == 4);
+  kvstore_rollback(pKV);
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("rollback restores keys", n == 4);
+
+  KVColumnFamily *pCF = NULL;
+  kvstore_cf_create(pKV, "delcf", &pCF);
+  kvstore_cf_write_batch(pCF, 2, g_batch.apKey, g_batch.anKey,
+                         g_batch.apVal, g_batch.anVal);
+  rc = kvstore_cf_delete_batch(pCF, 4, g_batch.apKey, g_batch.anKey,
+                               &nDeleted);
+  ASSERT("cf_delete_batch OK", rc == KVSTORE_OK && nDeleted == 2);
+  kvstore_cf_count(pCF, &n);
+  ASSERT("CF empty", n == 0);
+  kvstore_count(pKV, &n);
+  ASSERT("default CF untouched", n == 4);
+
+  kvstore_cf_close(pCF);
+  cleanup(&pKV, path);
+}
+
+int main(void){
+  printf("=== test_batch: write_batch / write_batch_ttl / get_batch / delete_batch ===\n");
+
+  /* write_batch */
+  test1_batch_basic();
+  test2_single_commit();
+  test3_invalid_pair_rolls_back();
+  test4_joins_explicit_transaction();
+  test5_empty_batch();
+  test6_duplicate_key_last_wins();
+  test7_cf_variant();
+  test8_persists_across_reopen();
+
+  /* write_batch_ttl */
+  test9_batch_ttl();
+  test10_batch_ttl_clears_ttl();
+
+  /* get_batch */
+  test11_get_batch();
+  test12_get_batch_expired_and_cf();
+
+  /* delete_batch */
+  test13_delete_batch();
+  test14_delete_batch_txn_and_cf();
+
+  printf("\n=== Results: %d passed, %d failed ===\n", passed, failed);
+  return (failed > 0) ? 1 : 0;
+}
@@ -57,7 +57,8 @@
 **  40.  kvstore_count delegates to default CF correctly
 **
 **   --- clear reduces page count ---
-**  41.  Fill store with many keys, clear, checkpoint TRUNCATE → nDbPages decreases
+**  41.  Fill store with many keys, clear, checkpoint TRUNCATE → nDbPages decreases;
+**       nFreePages > 0 after clear and 0 again after vacuum
 */
 
 #include "kvstore.h"
@@ -1081,6 +1082,11 @@ static void test41_clear_reduces_pages(void){
   int rc = kvstore_clear(pKV);
   ASSERT("clear OK", rc == KVSTORE_OK);
 
+  KVStoreStats st_cleared = {0};
+  kvstore_stats(pKV, &st_cleared);
+  ASSERT("nFreePages == 0 before clear", st_before.nFreePages == 0);
+  ASSERT("nFreePages > 0 after clear", st_cleared.nFreePages > 0);
+
   /* Incremental vacuum reclaims the freed pages back to the OS,
      shrinking nDbPages. 0 = drain the entire free list. */
   kvstore_incremental_vacuum(pKV, 0);
@@ -1091,6 +1097,7 @@ static void test41_clear_reduces_pages(void){
   ASSERT("nDbPages before clear > 0", st_before.nDbPages > 0);
   ASSERT("nDbPages after clear+vacuum < before",
          st_after.nDbPages < st_before.nDbPages);
+  ASSERT("nFreePages == 0 after vacuum", st_after.nFreePages == 0);
 
   /* Close so the pager flushes and truncates the file, then check size. */
   kvstore_close(pKV);
@@ -32,6 +32,17 @@
 **  21.  purge_expired handles more than KVSTORE_PURGE_BATCH (256) expired keys (gap 3)
 **  22.  Real wall-clock expiry: 499 ms TTL, sleep 500 ms, key must be NOTFOUND
 **  23.  exists() returns 0 for an expired key (lazy delete performed)
+**  24.  nTtlExpired stat incremented by get lazy expiry
+**  25.  nTtlActive decremented on delete; TTL index clean after
+**
+** Counter:
+**  26.  incr_ttl counts up to limit, keeps expiry, resets after the window
+**  27.  incr_ttl rejects non-integer values; CF variant is independent
+**
+**  28.  purge_expired with nothing due issues no write transaction
+**  29.  purge_expired with long keys spanning several batches
+**  30.  incr_ttl within a window keeps one consistent TTL index entry
+**  31.  Re-put with a new TTL drops the old expiry entry (short and long keys)
 */
 
 #include "kvstore.h"
@@ -961,6 +972,205 @@ static void test25_nttlactive_decremented_on_delete(void){
   cleanup(&pKV, path);
 }
 
+/* ---- Test 26: incr_ttl fixed-window counter ---- */
+static void test26_incr_ttl_window(void){
+  printf("\nTest 26: incr_ttl counts to limit, keeps expiry, resets after window\n");
+  const char *path = "tests/ttl26.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  int allowed = -1, i, nAllowed = 0;
+  int64_t count = -1;
+  for( i = 0; i < 5; i++ ){
+    int rc = kvstore_incr_ttl(pKV, "rl", 2, 3, 300, &count, &allowed);
+    if( rc == KVSTORE_OK && allowed ) nAllowed++;
+  }
+  ASSERT("exactly 3 of 5 allowed", nAllowed == 3);
+  ASSERT("last call denied", allowed == 0);
+  ASSERT("count stays at limit", count == 3);
+
+  void *pVal = NULL; int nVal = 0; int64_t rem = 0;
+  int rc = kvstore_get_ttl(pKV, "rl", 2, &pVal, &nVal, &rem);
+  ASSERT("stored as decimal \"3\"", rc == KVSTORE_OK && nVal == 1
+         && memcmp(pVal, "3", 1) == 0);
+  ASSERT("window expiry kept (0 < rem <= 300)", rem > 0 && rem <= 300);
+  if( pVal ) snkv_free(pVal);
+
+  snkv_sleep_ms(350);
+  rc = kvstore_incr_ttl(pKV, "rl", 2, 3, 300, &count, &allowed);
+  ASSERT("new window allowed", rc == KVSTORE_OK && allowed == 1);
+  ASSERT("count reset to 1", count == 1);
+
+  /* Inside an explicit transaction the increment is rolled back with it. */
+  kvstore_begin(pKV, 1);
+  kvstore_incr_ttl(pKV, "rl", 2, 3, 300, &count, &allowed);
+  ASSERT("count 2 inside txn", count == 2);
+  kvstore_rollback(pKV);
+  kvstore_incr_ttl(pKV, "rl", 2, 3, 300, &count, &allowed);
+  ASSERT("rolled back increment not kept", count == 2);
+
+  cleanup(&pKV, path);
+}
+
+/* ---- Test 27: incr_ttl on non-integer value; CF variant ---- */
+static void test27_incr_ttl_errors_and_cf(void){
+  printf("\nTest 27: incr_ttl rejects non-integer values; CF variant\n");
+  const char *path = "tests/ttl27.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  int allowed = -1;
+  kvstore_put(pKV, "txt", 3, "abc", 3);
+  int rc = kvstore_incr_ttl(pKV, "txt", 3, 10, 1000, NULL, &allowed);
+  ASSERT("non-integer value -> KVSTORE_ERROR", rc == KVSTORE_ERROR);
+  ASSERT("window_ms <= 0 rejected",
+         kvstore_incr_ttl(pKV, "x", 1, 10, 0, NULL, &allowed) == KVSTORE_ERROR);
+
+  KVColumnFamily *pCF = NULL;
+  kvstore_cf_create(pKV, "rl", &pCF);
+  ASSERT("CF created", pCF != NULL);
+  if( pCF ){
+    int64_t count = 0;
+    rc = kvstore_cf_incr_ttl(pCF, "u", 1, 1, 60000, &count, &allowed);
+    ASSERT("cf incr allowed", rc == KVSTORE_OK && allowed == 1 && count == 1);
+    rc = kvstore_cf_incr_ttl(pCF, "u", 1, 1, 60000, &count, &allowed);
+    ASSERT("cf limit 1 reached", rc == KVSTORE_OK && allowed == 0);
+    int exists = 1;
+    kvstore_exists(pKV, "u", 1, &exists);
+    ASSERT("default CF untouched", exists == 0);
+    kvstore_cf_close(pCF);
+  }
+
+  cleanup(&pKV, path);
+}
+
+/* ---- Test 28: purge_expired with nothing due is read-only ---- */
+static void test28_purge_nothing_due_no_commit(void){
+  printf("\nTest 28: purge_expired with nothing due issues no commit\n");
+  const char *path = "tests/ttl28.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  int64_t future = kvstore_now_ms() + 60000;
+  int i;
+  for( i = 0; i < 10; i++ ){
+    char k[16]; int nk = snprintf(k, sizeof(k), "f%d", i);
+    kvstore_put_ttl(pKV, k, nk, "v", 1, future);
+  }
+
+  KVStoreStats st;
+  kvstore_stats_reset(pKV);
+  int nDeleted = -1;
+  int rc = kvstore_purge_expired(pKV, &nDeleted);
+  kvstore_stats(pKV, &st);
+  ASSERT("purge ok, 0 deleted", rc == KVSTORE_OK && nDeleted == 0);
+  ASSERT("no WAL commit when nothing is due", st.nWalCommits == 0);
+
+  /* Once one key is due, the purge runs and removes only that key. */
+  kvstore_put_ttl(pKV, "due", 3, "v", 1, kvstore_now_ms() - 1);
+  rc = kvstore_purge_expired(pKV, &nDeleted);
+  ASSERT("due key purged", rc == KVSTORE_OK && nDeleted == 1);
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("future keys kept", n == 10);
+
+  cleanup(&pKV, path);
+}
+
+static void test29_purge_long_keys(void){
+  printf("\nTest 29: purge_expired with long keys across several batches\n");
+  const char *path = "tests/ttl29.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  /* 600 keys x ~500 bytes: > 2 purge batches, each well past the
+  ** initial key-buffer size, so the buffer has to grow mid-batch. */
+  char k[512];
+  int64_t past = kvstore_now_ms() - 1;
+  int i;
+  memset(k, 'x', sizeof(k));
+  kvstore_begin(pKV, 1);
+  for( i = 0; i < 600; i++ ){
+    snprintf(k, 8, "%06d", i);
+    k[6] = 'x';
+    kvstore_put_ttl(pKV, k, 500, "v", 1, past);
+  }
+  kvstore_put_ttl(pKV, "live", 4, "v", 1, kvstore_now_ms() + 60000);
+  kvstore_commit(pKV);
+
+  int nDeleted = 0;
+  int rc = kvstore_purge_expired(pKV, &nDeleted);
+  ASSERT("purge ok, all 600 deleted", rc == KVSTORE_OK && nDeleted == 600);
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("only the live key remains", n == 1);
+  snprintf(k, 8, "%06d", 599);
+  k[6] = 'x';
+  int exists = 1;
+  kvstore_exists(pKV, k, 500, &exists);
+  ASSERT("last long key gone", exists == 0);
+
+  cleanup(&pKV, path);
+}
+
+static void test30_incr_ttl_index_consistent(void){
+  printf("\nTest 30: incr_ttl in one window keeps a single TTL index entry\n");
+  const char *path = "tests/ttl30.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  int64_t n = 0; int allowed = 0, i;
+  for( i = 0; i < 5; i++ ){
+    kvstore_incr_ttl(pKV, "rl", 2, 10, 100, &n, &allowed);
+  }
+  ASSERT("counter at 5", n == 5 && allowed == 1);
+
+  int64_t rem = 0;
+  kvstore_ttl_remaining(pKV, "rl", 2, &rem);
+  ASSERT("window TTL kept", rem > 0 && rem <= 100);
+
+  /* One data key and exactly one expiry index entry: purge removes 1. */
+  snkv_sleep_ms(120);
+  int nDeleted = 0;
+  int rc = kvstore_purge_expired(pKV, &nDeleted);
+  ASSERT("purge removes the counter once", rc == KVSTORE_OK && nDeleted == 1);
+  kvstore_count(pKV, &n);
+  ASSERT("store empty", n == 0);
+
+  cleanup(&pKV, path);
+}
+
+static void test31_reput_ttl_drops_old_entry(void){
+  printf("\nTest 31: re-put with a new TTL drops the old expiry entry\n");
+  const char *path = "tests/ttl31.db";
+  KVStore *pKV = openFresh(path);
+  if( !pKV ){ ASSERT("open", 0); return; }
+
+  /* 4-byte key uses the on-stack expiry key, 300-byte key the heap one. */
+  char k[300];
+  int aLen[2] = { 4, 300 };
+  int i;
+  memset(k, 'k', sizeof(k));
+  for( i = 0; i < 2; i++ ){
+    kvstore_put_ttl(pKV, k, aLen[i], "old", 3, kvstore_now_ms() - 1);
+    kvstore_put_ttl(pKV, k, aLen[i], "new", 3, kvstore_now_ms() + 60000);
+  }
+
+  /* A stale past-due expiry entry would make purge delete the live keys. */
+  int nDeleted = -1;
+  int rc = kvstore_purge_expired(pKV, &nDeleted);
+  ASSERT("purge finds nothing due", rc == KVSTORE_OK && nDeleted == 0);
+  int64_t n = 0;
+  kvstore_count(pKV, &n);
+  ASSERT("both keys live", n == 2);
+
+  for( i = 0; i < 2; i++ ) kvstore_delete(pKV, k, aLen[i]);
+  kvstore_count(pKV, &n);
+  ASSERT("deletes clear both keys", n == 0);
+
+  cleanup(&pKV, path);
+}
+
 /* ========== main ========== */
 int main(void){
   printf("=== TTL tests ===\n");
@@ -990,6 +1200,12 @@ int main(void){
   test23_exists_expired_key();
   test24_nttlexpired_via_get();
   test25_nttlactive_decremented_on_delete();
+  test26_incr_ttl_window();
+  test27_incr_ttl_errors_and_cf();
+  test28_purge_nothing_due_no_commit();
+  test29_purge_long_keys();
+  test30_incr_ttl_index_consistent();
+  test31_reput_ttl_drops_old_entry();
 
   printf("\n=== Results: %d passed, %d failed ===\n", passed, failed);
   return failed > 0 ? 1 : 0;